@@ -0,0 +1,58 @@
+"""
+Benchmark: memory held by a list of clippings, with the previous dict-based
+dataclass vs. the slotted Clipping with interned strings and tuple tags.
+
+Usage: python benchmarks/bench_clipping_memory.py [clippings]
+"""
+
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List
+
+import synthetic
+
+
+@dataclass
+class LegacyClipping:
+    """The previous Clipping definition, kept here for comparison."""
+
+    content: str
+    book_title: str
+    author: str
+    date_time: datetime
+    location: str = ""
+    page: str = ""
+    entry_type: str = "highlight"
+    tags: List[str] = field(default_factory=list)
+    is_duplicate: bool = False
+    uid: str = ""
+
+
+def measure(count: int, factory) -> int:
+    gc.collect()
+    tracemalloc.start()
+    clippings = synthetic.make_clippings(count, factory=factory)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del clippings
+    return size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    legacy = measure(count, LegacyClipping)
+    compact = measure(count, synthetic.Clipping)
+
+    print(f"{count} clippings")
+    print(f"  dataclass with __dict__: {legacy / 2**20:7.1f} MiB  ({legacy / count:.0f} B each)")
+    print(f"  slotted + interned:      {compact / 2**20:7.1f} MiB  ({compact / count:.0f} B each)")
+    print(f"  saved: {1 - compact / legacy:.0%}")
+
+
+if __name__ == "__main__":
+    main()
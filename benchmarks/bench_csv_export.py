@@ -0,0 +1,73 @@
+"""
+Benchmark: CSV export throughput and peak memory, building the whole CSV in a StringIO
+first (legacy) versus streaming row batches straight to the file.
+Peak memory is measured in a second, traced run so the timings are not skewed.
+
+Usage: python benchmarks/bench_csv_export.py [clippings]
+"""
+
+import csv
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import synthetic
+from exporters.csv_exporter import CsvExporter
+
+
+def legacy_export(clippings, output_file):
+    """The previous implementation: DictWriter rows into a StringIO, then one write."""
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=CsvExporter.FIELDNAMES)
+    writer.writeheader()
+    for clip in clippings:
+        writer.writerow(
+            {
+                "book_title": clip.book_title,
+                "author": clip.author,
+                "content": clip.content,
+                "type": clip.entry_type,
+                "date_time": clip.date_time.isoformat() if clip.date_time else "",
+                "page": clip.page,
+                "location": clip.location,
+                "tags": ", ".join(clip.tags),
+                "is_duplicate": clip.is_duplicate,
+                "source": "kindle",
+            }
+        )
+    with open(output_file, "w", newline="", encoding="utf-8-sig") as f:
+        f.write(output.getvalue())
+
+
+def streaming_export(clippings, output_file):
+    CsvExporter().export(clippings, output_file)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    clippings = synthetic.make_clippings(count)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = os.path.join(tmp_dir, "export.csv")
+        for label, export in (("legacy StringIO", legacy_export), ("streaming", streaming_export)):
+            start = time.perf_counter()
+            export(clippings, output)
+            elapsed = time.perf_counter() - start
+            size = os.path.getsize(output)
+
+            tracemalloc.start()
+            export(clippings, output)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(
+                f"{label:>16}: {count / elapsed:9,.0f} rows/s, {size / 2**20 / elapsed:6.1f} MiB/s, "
+                f"peak {peak / 2**20:7.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Benchmark: highlight deduplication with the previous per-highlight dicts and plain
+substring checks (legacy) versus the sort-and-sweep over precomputed locations.
+Re-selected passages (extended or trimmed selections at the same location) are mixed
+in, as in a long-lived My Clippings.txt. The last row runs the per-book passes in
+a process pool (SmartDeduplicator(workers=N)). All must flag the same clippings.
+As with timeit, the garbage collector is paused while timing and the best of a few
+runs is reported.
+
+Usage: python benchmarks/bench_deduplication.py [highlights] [runs] [workers]
+"""
+
+import copy
+import functools
+import gc
+import os
+import random
+import sys
+import time
+from typing import List, Tuple
+
+import synthetic
+from domain.models import Clipping
+from services.deduplication_service import SmartDeduplicator
+
+
+class LegacyDeduplicator(SmartDeduplicator):
+    """The previous highlight pass: a dict per highlight and a nested location parser."""
+
+    def _flag_duplicates_highlights(self, highlights: List[Clipping]):
+        def parse_loc(loc_str: str) -> Tuple[int, int]:
+            try:
+                parts = loc_str.split("-")
+                start = int(parts[0])
+                end = int(parts[1]) if len(parts) > 1 else start
+                return start, end
+            except (ValueError, IndexError):
+                return 0, 0
+
+        enhanced = []
+        for h in highlights:
+            if not h.tags:
+                text = h.content.strip()
+                length = len(text)
+                is_garbage = length < 5
+                is_fragment = length < 75 and (text and text[0].islower())
+                is_incomplete = length < 75 and (
+                    text and text[-1] not in {".", "!", "?", '"', "”", ")"}
+                )
+                if is_garbage or is_fragment or is_incomplete:
+                    h.is_duplicate = True
+            s, e = parse_loc(h.location)
+            enhanced.append({"clip": h, "start": s, "end": e, "len": len(h.content)})
+
+        enhanced.sort(key=lambda x: int(x["start"]))
+        if not enhanced:
+            return
+
+        survivor = enhanced[0]
+        for current in enhanced[1:]:
+            is_overlapping = (current["start"] >= survivor["start"]) and (
+                current["start"] <= survivor["end"] + self.OVERLAP_TOLERANCE_CHARS
+            )
+            if is_overlapping:
+                if survivor["clip"].content in current["clip"].content:
+                    self._merge_tags(survivor["clip"], current["clip"])
+                    survivor["clip"].is_duplicate = True
+                    survivor = current
+                elif current["clip"].content in survivor["clip"].content:
+                    self._merge_tags(current["clip"], survivor["clip"])
+                    current["clip"].is_duplicate = True
+                else:
+                    overlap_amount = min(survivor["end"], current["end"]) - max(
+                        survivor["start"], current["start"]
+                    )
+                    span = max(survivor["end"], current["end"]) - min(
+                        survivor["start"], current["start"]
+                    )
+                    if span > 0 and (overlap_amount / span) > 0.5:
+                        if current["len"] > survivor["len"]:
+                            self._merge_tags(survivor["clip"], current["clip"])
+                            survivor["clip"].is_duplicate = True
+                            survivor = current
+                        else:
+                            self._merge_tags(current["clip"], survivor["clip"])
+                            current["clip"].is_duplicate = True
+            else:
+                survivor = current
+
+
+def make_highlights(count: int, books: int = 5, seed: int = 42) -> List[Clipping]:
+    """Synthetic highlights where about a third re-select a nearby passage."""
+    rng = random.Random(seed)
+    clippings = synthetic.make_clippings(count, books=books, seed=seed)
+    for i, clip in enumerate(clippings):
+        if i and rng.random() < 0.3:
+            other = clippings[rng.randrange(i)]
+            words = other.content.split()
+            cut = rng.randint(1, len(words))
+            # Extended (prefix of the new one) or trimmed (prefix of the old one)
+            clip.content = (
+                other.content + " " + synthetic.make_text(rng, rng.randint(5, 40))
+                if rng.random() < 0.5
+                else " ".join(words[:cut])
+            )
+            clip.book_title, clip.author = other.book_title, other.author
+            clip.location = other.location
+    return clippings
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else max(os.cpu_count() or 1, 2)
+    clippings = make_highlights(count)
+
+    flags = {}
+    for label, factory in (
+        ("legacy", LegacyDeduplicator),
+        ("sort-and-sweep", SmartDeduplicator),
+        (f"{workers} workers", functools.partial(SmartDeduplicator, workers=workers)),
+    ):
+        elapsed = float("inf")
+        for _ in range(runs):
+            batch = copy.deepcopy(clippings)
+            gc.collect()
+            gc.disable()
+            start = time.perf_counter()
+            result = factory().deduplicate(batch)
+            elapsed = min(elapsed, time.perf_counter() - start)
+            gc.enable()
+        flags[label] = [(c.is_duplicate, c.tags) for c in result]
+        duplicates = sum(c.is_duplicate for c in result)
+        print(
+            f"{label:>14}: {elapsed * 1000:8.1f} ms, {count / elapsed:10,.0f} highlights/s, "
+            f"{duplicates:,} flagged"
+        )
+
+    expected = flags["legacy"]
+    print(f"Identical flags: {all(result == expected for result in flags.values())}")
+
+
+if __name__ == "__main__":
+    main()
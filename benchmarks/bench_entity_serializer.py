@@ -0,0 +1,69 @@
+"""
+Benchmark: Joplin raw text serialization with the previous asdict() + generic
+property loop vs. the per-type compiled templates.
+
+Usage: python benchmarks/bench_entity_serializer.py [entities]
+"""
+
+import sys
+import time
+from dataclasses import asdict
+
+import synthetic  # noqa: F401  (sets up sys.path)
+from exporters.joplin_exporter import JoplinEntityBuilder
+from exporters.joplin_serializer import serialize_entity
+
+
+def legacy_render(entity_obj) -> str:
+    """The previous to_dict() + _create_entity_content() path, kept here for comparison."""
+    entity = {k: v for k, v in asdict(entity_obj).items() if v is not None}
+    parts = [entity.get("title", ""), ""]
+    if entity.get("body"):
+        parts.append(entity["body"])
+        parts.append("")
+
+    def normalize_val(v):
+        return v.value if hasattr(v, "value") else v
+
+    for key, value in entity.items():
+        if key not in {"title", "body", "type_"}:
+            parts.append(f"{key}: {normalize_val(value)}")
+    if "type_" in entity:
+        parts.append(f"type_: {normalize_val(entity['type_'])}")
+    return "\n".join(parts)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    # Typical JEX mix: mostly notes, then tag associations, tags and notebooks
+    samples = [
+        JoplinEntityBuilder.create_note(f"[0012] Note {i}", f"Body {i}\n\n-----\n", "p")
+        for i in range(6)
+    ] + [
+        JoplinEntityBuilder.create_tag_association("tag", "note"),
+        JoplinEntityBuilder.create_tag_association("tag2", "note"),
+        JoplinEntityBuilder.create_tag("tag"),
+        JoplinEntityBuilder.create_notebook("Book", parent_id="author"),
+    ]
+    entities = [samples[i % len(samples)] for i in range(count)]
+
+    assert all(legacy_render(e) == serialize_entity(e) for e in samples)
+
+    start = time.perf_counter()
+    for entity in entities:
+        legacy_render(entity)
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for entity in entities:
+        serialize_entity(entity)
+    compiled = time.perf_counter() - start
+
+    print(f"{count} entities")
+    print(f"  asdict + property loop: {legacy:.2f}s")
+    print(f"  compiled templates:     {compiled:.2f}s  ({legacy / compiled:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: identity hashing with and without the IdentityService caches.
+
+- is_duplicate over every consecutive pair of notes (no uid), three times over,
+  hashing both sides on every call (legacy) versus current_id() (the same fields are
+  hashed once).
+- The notebook ID of every clipping's book: MD5 per call (legacy) versus entity_id().
+  Note IDs are not cached: each seed comes back at most twice, and a cache lookup
+  costs about as much as the MD5 of a short seed.
+- assign_ids() on a JSON import, serial versus a process pool.
+
+Usage: python benchmarks/bench_identity.py [clippings] [workers]
+"""
+
+import gc
+import hashlib
+import sys
+import time
+
+import synthetic
+from services.identity_service import IdentityService
+
+
+def timed(function):
+    gc.collect()
+    gc.disable()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    gc.enable()
+    return result, elapsed
+
+
+def legacy_is_duplicate(clip1, clip2) -> bool:
+    return IdentityService.generate_id(clip1) == IdentityService.generate_id(clip2)
+
+
+def cached_is_duplicate(clip1, clip2) -> bool:
+    return IdentityService.current_id(clip1) == IdentityService.current_id(clip2)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    clippings = synthetic.make_clippings(count)
+    for clip in clippings:
+        clip.uid = ""
+
+    def pairs(is_duplicate):
+        compared = list(zip(clippings, clippings[1:])) * 3
+        return sum(is_duplicate(a, b) for a, b in compared)
+
+    IdentityService.clear_cache()
+    _, legacy = timed(lambda: pairs(legacy_is_duplicate))
+    _, cached = timed(lambda: pairs(cached_is_duplicate))
+    print(f"{'is_duplicate':>14}: legacy {legacy * 1000:8.1f} ms, cached {cached * 1000:8.1f} ms")
+
+    def notebook_ids(entity_id):
+        return [entity_id(f"notebook:{clip.book_title}") for clip in clippings]
+
+    _, legacy = timed(lambda: notebook_ids(lambda seed: hashlib.md5(seed.encode()).hexdigest()))
+    _, cached = timed(lambda: notebook_ids(IdentityService.entity_id))
+    print(f"{'notebook ids':>14}: legacy {legacy * 1000:8.1f} ms, cached {cached * 1000:8.1f} ms")
+
+    _, serial = timed(lambda: IdentityService.assign_ids(clippings))
+    for clip in clippings:
+        clip.uid = ""
+    _, parallel = timed(lambda: IdentityService.assign_ids(clippings, workers=workers))
+    print(
+        f"{'assign_ids':>14}: serial {serial * 1000:8.1f} ms, "
+        f"{workers} workers {parallel * 1000:8.1f} ms"
+    )
+
+    rates = IdentityService.hit_rates()
+    print("Hit rates: " + ", ".join(f"{name} {rate:.0%}" for name, rate in rates.items()))
+
+
+if __name__ == "__main__":
+    main()
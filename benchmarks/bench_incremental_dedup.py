@@ -0,0 +1,55 @@
+"""
+Benchmark: deduplicating a library again after a reading session appended a few
+clippings, with deduplicate() over everything versus deduplicate_incremental() on
+the new clippings only. Both must give the same flags. The library spreads over 500
+books, so highlights are about as sparse within a book as on a real Kindle; in one
+book dense enough for every highlight to overlap the next, the whole book is one
+cluster and is evaluated again.
+
+Usage: python benchmarks/bench_incremental_dedup.py [library] [new clippings]
+"""
+
+import copy
+import gc
+import sys
+import time
+
+from bench_deduplication import make_highlights
+from services.deduplication_service import SmartDeduplicator
+
+
+def timed(function):
+    gc.collect()
+    gc.disable()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    gc.enable()
+    return result, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    new = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    clippings = make_highlights(count + new, books=500)
+    library, session = clippings[:count], clippings[count:]
+
+    full_input = copy.deepcopy(clippings)
+    full, full_time = timed(lambda: SmartDeduplicator().deduplicate(full_input))
+
+    deduplicator = SmartDeduplicator()
+    state, build_time = timed(lambda: deduplicator.deduplicate_incremental(None, library))
+    state, delta_time = timed(lambda: deduplicator.deduplicate_incremental(state, session))
+
+    print(f"{'full':>14}: {full_time * 1000:8.1f} ms for {count + new:,} clippings")
+    print(f"{'initial state':>14}: {build_time * 1000:8.1f} ms for {count:,} clippings")
+    print(f"{'incremental':>14}: {delta_time * 1000:8.1f} ms for {new:,} new clippings")
+
+    def summary(items):
+        return [(c.content, c.location, c.is_duplicate, c.tags) for c in items]
+
+    print(f"Identical flags: {summary(full) == summary(state.clippings)}")
+
+
+if __name__ == "__main__":
+    main()
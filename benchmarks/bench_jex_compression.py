@@ -0,0 +1,62 @@
+"""
+Benchmark: JEX archive size and export throughput per compression codec and level.
+Every archive is read back with verify so the numbers include only valid output.
+
+Usage: python benchmarks/bench_jex_compression.py [clippings] [workers]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import synthetic
+from exporters import jex_compression
+from exporters.joplin_exporter import JoplinExporter
+
+SETTINGS = [
+    ("none", None),
+    ("gzip", "fast"),
+    ("gzip", None),
+    ("gzip", 9),
+    ("xz", "fast"),
+    ("xz", None),
+    ("zstd", "fast"),
+    ("zstd", None),
+    ("zstd", 19),
+]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    clippings = synthetic.make_clippings(count)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = os.path.join(tmp_dir, "export")
+        for codec, level in SETTINGS:
+            if codec == "zstd" and jex_compression.zstandard is None:
+                print(f"{codec:>5} {str(level or 'default'):>8}: skipped (zstandard not installed)")
+                continue
+
+            exporter = JoplinExporter()
+            start = time.perf_counter()
+            exporter.export(
+                clippings,
+                output,
+                {"compression": codec, "compression_level": level, "workers": workers},
+            )
+            elapsed = time.perf_counter() - start
+            jex_compression.verify_archive(jex_compression.archive_path(output, codec), codec)
+
+            stats = exporter.archive_stats
+            ratio = stats["archive_bytes"] / stats["raw_bytes"]
+            print(
+                f"{codec:>5} {str(level or 'default'):>8}: "
+                f"{stats['archive_bytes'] / 2**20:7.1f} MiB ({ratio:4.0%}), "
+                f"export {elapsed:6.2f}s, {stats['raw_bytes'] / 2**20 / elapsed:6.1f} MiB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark: JEX export time and peak memory for growing numbers of notes.
+The archive is streamed entry by entry, so peak memory should stay flat.
+With workers > 1, note payloads are rendered in a process pool
+(peak memory then only covers the main process).
+
+Usage: python benchmarks/bench_jex_export.py [max_clippings] [workers]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import synthetic
+from exporters.joplin_exporter import JoplinExporter
+
+
+def main():
+    max_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        count = max_count // 100
+        while count <= max_count:
+            clippings = synthetic.make_clippings(count)
+            output = os.path.join(tmp_dir, f"export_{count}")
+
+            tracemalloc.start()
+            start = time.perf_counter()
+            JoplinExporter().export(clippings, output, {"workers": workers})
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            size = os.path.getsize(output + ".jex")
+            print(
+                f"{count:>8} notes: {elapsed:6.2f}s, peak {peak / 2**20:6.1f} MiB, "
+                f"archive {size / 2**20:7.1f} MiB"
+            )
+            count *= 10
+
+
+if __name__ == "__main__":
+    main()
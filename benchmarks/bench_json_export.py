@@ -0,0 +1,60 @@
+"""
+Benchmark: peak memory and time of the JSON export, building the whole document with
+json.dumps (legacy) versus streaming it clipping by clipping, plus the JSON Lines mode
+and reading the export back with the streaming reader.
+
+Usage: python benchmarks/bench_json_export.py [clippings]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import synthetic
+from exporters.json_exporter import JsonExporter
+from parsers.json_parser import JsonClippingsReader
+
+
+def legacy_export(clippings, output_file):
+    exporter = JsonExporter()
+    data = {
+        "meta": {"count": len(clippings)},
+        "clippings": [exporter.clipping_to_dict(clip) for clip in clippings],
+    }
+    content = json.dumps(data, indent=2, ensure_ascii=False)
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def measure(label, func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:>22}: {elapsed:6.2f}s, peak {peak / 2**20:7.1f} MiB")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    clippings = synthetic.make_clippings(count)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = os.path.join(tmp_dir, "export")
+        measure("legacy json.dumps", lambda: legacy_export(clippings, output + ".json"))
+        measure("streaming JSON", lambda: JsonExporter().export(clippings, output))
+        measure("JSON Lines", lambda: JsonExporter(lines=True).export(clippings, output))
+
+        def read(path):
+            return lambda: sum(1 for _ in JsonClippingsReader(path))
+
+        measure("read JSON (stream)", read(output + ".json"))
+        measure("read JSON Lines", read(output + ".jsonl"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: Markdown ZIP export throughput. The legacy path sanitizes every folder name
+and compresses each member inside ZipFile.writestr(); the new path caches folder names,
+deflates members up front (in a process pool with workers > 1) and appends them in order.
+
+Usage: python benchmarks/bench_markdown_export.py [clippings] [workers]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+import synthetic
+from exporters.markdown_exporter import MarkdownExporter
+
+
+def legacy_export(clippings, output_file):
+    exporter = MarkdownExporter()
+    with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zipf:
+        for clip in clippings:
+            author_folder = exporter._sanitize_filename(clip.author.upper())
+            book_folder = exporter._sanitize_filename(clip.book_title)
+            full_path = f"{author_folder}/{book_folder}/{exporter._generate_filename(clip)}"
+            zipf.writestr(full_path, exporter._generate_markdown_content(clip))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    clippings = synthetic.make_clippings(count)
+
+    runs = [
+        ("legacy writestr", lambda out: legacy_export(clippings, out + ".zip")),
+        ("precompressed", lambda out: MarkdownExporter().export(clippings, out)),
+    ]
+    if workers > 1:
+        runs.append(
+            (
+                f"{workers} workers",
+                lambda out: MarkdownExporter().export(clippings, out, {"workers": workers}),
+            )
+        )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = os.path.join(tmp_dir, "export")
+        baseline = None
+        for label, run in runs:
+            start = time.perf_counter()
+            run(output)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(
+                f"{label:>16}: {elapsed:6.2f}s, {count / elapsed:8,.0f} notes/s "
+                f"(x{baseline / elapsed:.2f})"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: library-wide near-duplicate detection, comparing every pair of highlights
+with IdentityService.calculate_similarity (legacy, quadratic) versus the MinHash/LSH
+pass of SmartDeduplicator(fuzzy=True). About a tenth of the highlights are
+re-imports of earlier ones under a renamed title, with a word or two changed.
+
+The pairwise scan only runs on the first `pairwise` highlights, where both are
+checked to find the same near-duplicates.
+
+Usage: python benchmarks/bench_near_duplicates.py [highlights] [pairwise]
+"""
+
+import random
+import sys
+import time
+from typing import List
+
+import synthetic
+from domain.models import Clipping
+from services.deduplication_service import SmartDeduplicator
+from services.identity_service import IdentityService
+
+
+def make_library(count: int, seed: int = 42) -> List[Clipping]:
+    """
+    The shared synthetic vocabulary is too small for word-set similarity (any two
+    long highlights look alike), so texts here draw from 20k words, Zipf-distributed.
+    """
+    rng = random.Random(seed)
+    vocabulary = [f"w{rank}" for rank in range(20_000)]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    clippings = synthetic.make_clippings(count, books=50, seed=seed)
+    for i, clip in enumerate(clippings):
+        clip.tags = ()
+        if i and rng.random() < 0.1:
+            other = clippings[rng.randrange(i)]
+            words = other.content.split()
+            words[rng.randrange(len(words))] = rng.choice(vocabulary)
+            clip.content = " ".join(words)
+            clip.book_title = f"{other.book_title} (Revised Edition)"
+            clip.author = other.author
+        else:
+            words = rng.choices(vocabulary, weights, k=rng.randint(8, 60))
+            clip.content = " ".join(words).capitalize() + "."
+    return clippings
+
+
+def pairwise(clippings: List[Clipping], threshold: float = 0.8) -> int:
+    """The legacy building block, applied to every pair."""
+    flagged = set()
+    for i, clip in enumerate(clippings):
+        for other in clippings[:i]:
+            if IdentityService.calculate_similarity(other.content, clip.content) >= threshold:
+                flagged.add(i)
+                break
+    return len(flagged)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    pairwise_count = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+
+    sample = make_library(pairwise_count)
+    start = time.perf_counter()
+    found = pairwise(sample)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{'pairwise':>9}: {pairwise_count:>7,} highlights in {elapsed:7.2f} s, "
+        f"{found:,} near-duplicates"
+    )
+
+    for label, clippings in (("LSH", sample), ("LSH", make_library(count))):
+        IdentityService.clear_cache()
+        start = time.perf_counter()
+        SmartDeduplicator(fuzzy=True)._flag_near_duplicates(clippings)
+        elapsed = time.perf_counter() - start
+        flagged = sum(c.is_duplicate for c in clippings)
+        print(
+            f"{label:>9}: {len(clippings):>7,} highlights in {elapsed:7.2f} s, "
+            f"{flagged:,} near-duplicates"
+        )
+
+
+if __name__ == "__main__":
+    main()
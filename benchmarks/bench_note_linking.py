@@ -0,0 +1,64 @@
+"""
+Benchmark: note-to-highlight linking with the previous per-note scan over every
+highlight of the book vs. the location index used by the parser.
+
+Usage: python benchmarks/bench_note_linking.py [highlights_per_book] [books]
+"""
+
+import copy
+import random
+import sys
+import timeit
+
+import synthetic
+from domain.models import Clipping
+from parsers.kindle_parser import KindleClippingsParser
+
+
+def legacy_link(parser, highlights, notes):
+    """The previous implementation, kept here for comparison."""
+    by_book = {}
+    for clip in highlights:
+        by_book.setdefault(clip.book_title, []).append(clip)
+
+    for note in notes:
+        note_start, _ = parser._parse_loc_range(note.location)
+        for h in by_book.get(note.book_title, []):
+            h_start, h_end = parser._parse_loc_range(h.location)
+            if h_start <= note_start <= h_end:
+                if note.content not in h.tags:
+                    h.tags += (note.content,)
+                break
+
+
+def main():
+    per_book = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    books = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    rng = random.Random(1)
+    highlights = synthetic.make_clippings(per_book * books, books=books)
+    notes = [
+        Clipping(
+            content=f"tag{i}",
+            book_title=f"Book {rng.randrange(books)}",
+            author="",
+            date_time=None,
+            location=str(rng.randint(1, 20000)),
+            entry_type="note",
+        )
+        for i in range(per_book * books // 4)
+    ]
+    parser = KindleClippingsParser(language_code="en")
+
+    legacy_input = copy.deepcopy(highlights)
+    legacy = timeit.timeit(lambda: legacy_link(parser, legacy_input, notes), number=1)
+    fast = timeit.timeit(lambda: parser._link_notes_to_highlights(highlights, notes), number=1)
+    assert [h.tags for h in highlights] == [h.tags for h in legacy_input]
+
+    print(f"{len(highlights)} highlights, {len(notes)} notes, {books} books")
+    print(f"  per-note scan:  {legacy:.3f}s")
+    print(f"  location index: {fast:.3f}s  ({legacy / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Benchmark: serial vs. multiprocess parsing of a synthetic 'My Clippings.txt'.
+
+Usage: python benchmarks/bench_parallel_parse.py [blocks] [workers]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from synthetic import write_clippings_file
+from parsers.kindle_parser import KindleClippingsParser
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 2)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "My Clippings.txt")
+        write_clippings_file(path, count)
+
+        for jobs in (1, workers):
+            parser = KindleClippingsParser(language_code="en")
+            start = time.perf_counter()
+            highlights = parser.parse_file(path, workers=jobs)
+            elapsed = time.perf_counter() - start
+            print(f"workers={jobs:<3} {len(highlights)} highlights in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
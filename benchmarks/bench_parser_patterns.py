@@ -0,0 +1,63 @@
+"""
+Micro-benchmark: metadata line extraction with per-block regex strings
+(previous parser code) vs. the precompiled CompiledPatterns bundle.
+
+Usage: python benchmarks/bench_parser_patterns.py [lines]
+"""
+
+import re
+import sys
+import timeit
+
+import synthetic  # noqa: F401  (sets up sys.path)
+from parsers.kindle_parser import KindleClippingsParser
+from parsers.patterns import CompiledPatterns
+
+
+def legacy_extract(patterns, line):
+    """The previous per-block code path, kept here for comparison."""
+    if re.search(patterns["highlight"], line):
+        c_type = "highlight"
+    elif re.search(patterns["note"], line):
+        c_type = "note"
+    else:
+        return None
+    loc = re.search(r"(" + patterns["location"] + r") (?P<location>[0-9,-]+)", line)
+    page = re.search(r"(" + patterns["page"] + r") (?P<page>[0-9,-]+)", line)
+    date = re.search(r"(" + patterns["added"] + r") (?P<date_str>.*)$", line)
+    return {
+        "type": c_type,
+        "page": page.group("page") if page else "",
+        "location": loc.group("location") if loc else "",
+        "date_str": date.group("date_str") if date else None,
+    }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    patterns = KindleClippingsParser(language_code="en").available_languages["en"]
+    compiled = CompiledPatterns(patterns)
+
+    lines = [
+        f"- Your Highlight on page {i % 400} | Loc. {i}-{i + 7} | "
+        "Added on Monday, March 4, 2024 10:15:22 PM"
+        for i in range(count // 2)
+    ] + [
+        f"- Your Note on Loc. {i} | Added on Monday, March 4, 2024 10:15:22 PM"
+        for i in range(count // 2)
+    ]
+
+    assert [legacy_extract(patterns, line) for line in lines[:1000]] == [
+        compiled.parse_metadata(line) for line in lines[:1000]
+    ]
+
+    legacy = timeit.timeit(lambda: [legacy_extract(patterns, line) for line in lines], number=1)
+    fast = timeit.timeit(lambda: [compiled.parse_metadata(line) for line in lines], number=1)
+
+    print(f"{count} metadata lines")
+    print(f"  legacy regex strings: {legacy:.3f}s")
+    print(f"  CompiledPatterns:     {fast:.3f}s  ({legacy / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
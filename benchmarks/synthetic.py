@@ -0,0 +1,69 @@
+"""
+Synthetic data shared by the benchmark scripts.
+"""
+
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+# Allow running the scripts directly: python benchmarks/bench_xxx.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domain.models import Clipping  # noqa: E402
+
+WORDS = (
+    "the of and to in is that it was for on are with as his they be at one have this from "
+    "or had by word but what some we can out other were all there when up use your how said"
+).split()
+
+
+def make_text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def make_clippings(
+    count: int, books: int = 20, seed: int = 42, factory: Callable[..., Clipping] = Clipping
+) -> List[Clipping]:
+    """
+    Highlights spread over a few books, with realistic locations and dates.
+    Strings are built per clipping, as the parser does.
+    """
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1)
+    clippings = []
+    for i in range(count):
+        book = rng.randrange(books)
+        loc = rng.randint(1, 20000)
+        clippings.append(
+            factory(
+                content=make_text(rng, rng.randint(8, 60)),
+                book_title=f"Book {book}",
+                author=f"Author {book % 7}",
+                date_time=start + timedelta(seconds=i * 37),
+                location=f"{loc}-{loc + rng.randint(0, 12)}",
+                page=str(loc // 16),
+                tags=["tag"] if rng.random() < 0.1 else [],
+            )
+        )
+    return clippings
+
+
+def write_clippings_file(path: str, count: int, seed: int = 42):
+    """Writes an English 'My Clippings.txt' with highlights and a few notes."""
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1)
+    with open(path, "w", encoding="utf-8-sig") as f:
+        for i in range(count):
+            book = rng.randrange(50)
+            loc = rng.randint(1, 20000)
+            when = start + timedelta(seconds=i * 37)
+            date_str = when.strftime("%A, %B %d, %Y %I:%M:%S %p").replace(" 0", " ")
+            if rng.random() < 0.9:
+                meta = f"- Your Highlight on page {loc // 16} | Loc. {loc}-{loc + 5} | Added on {date_str}"
+                body = make_text(rng, rng.randint(8, 60))
+            else:
+                meta = f"- Your Note on Loc. {loc} | Added on {date_str}"
+                body = rng.choice(WORDS)
+            f.write(f"Book {book} (Author {book % 7})\n{meta}\n\n{body}\n==========\n")
@@ -1,6 +1,8 @@
 import sys
 import os
 import argparse
+import multiprocessing
+from exporters.jex_compression import check_codec, resolve_level
 from services.clippings_service import ClippingsService
 from utils.logging_config import setup_logging
 from utils.config_manager import get_config_manager
@@ -9,6 +11,16 @@ from utils.config_manager import get_config_manager
 logger = setup_logging()
 
 
+def compression_level_arg(value: str):
+    """--compress-level: a number or "fast" (the range per codec is checked later)."""
+    if value == "fast":
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number or 'fast', got '{value}'")
+
+
 def parse_args():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description="Convert Kindle Clippings to Joplin JEX format.")
@@ -20,12 +32,77 @@ def parse_args():
     parser.add_argument(
         "--no-clean", action="store_true", help="Disable smart deduplication and cleaning"
     )
+    parser.add_argument(
+        "--fuzzy-dedup",
+        action="store_true",
+        help="Also flag near-duplicate highlights across the whole library (e.g. renamed books)",
+    )
     parser.add_argument(
         "--format",
         "-f",
-        choices=["jex", "csv", "md", "json"],
+        choices=["jex", "csv", "md", "md-dir", "json", "jsonl"],
         default="jex",
-        help="Output format: 'jex' (default), 'csv', 'md', or 'json'",
+        help="Output format: 'jex' (default), 'csv', 'md', 'md-dir' (Markdown synced into "
+        "the --output directory), 'json' or 'jsonl' (JSON Lines)",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        help="Worker processes used to parse, deduplicate, render JEX notes and compress Markdown "
+        "(default: 1)",
+    )
+    parser.add_argument(
+        "--incremental-parse",
+        action="store_true",
+        help="Only parse what was appended to the file since the last run (keeps a checkpoint)",
+    )
+    parser.add_argument(
+        "--full-parse",
+        action="store_true",
+        help="Parse the whole file instead of resuming from the last checkpoint",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Do not use or store cached parse results"
+    )
+    parser.add_argument(
+        "--reproducible",
+        action="store_true",
+        help="Write byte-identical output for identical clippings, with a .sha256 digest file",
+    )
+    parser.add_argument(
+        "--since-last",
+        action="store_true",
+        help="JEX only: export just the notes that are new or changed since the last export",
+    )
+    parser.add_argument(
+        "--compress",
+        choices=["none", "gzip", "xz", "zstd"],
+        help="Compress the JEX archive (gzip stays importable; xz/zstd must be unpacked first)",
+    )
+    parser.add_argument(
+        "--compress-level",
+        type=compression_level_arg,
+        help="Compression level (e.g. 1-9 for gzip), or 'fast' for the quickest multi-threaded mode",
+    )
+    parser.add_argument(
+        "--verify", action="store_true", help="Read the JEX archive back and check every entry"
+    )
+    parser.add_argument(
+        "--fsync-batch",
+        type=int,
+        default=0,
+        help="md-dir only: flush written notes to disk this many at a time (default: off)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="md-dir only: overwrite or remove notes that were edited since the last sync",
+    )
+    parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="Delete cached parse results and checkpoints, then exit",
     )
     return parser.parse_args()
 
@@ -47,6 +124,38 @@ def main():
     notebook_title = args.notebook or config.get("notebook_title") or "Kindle Imports"
     creator = args.creator or config.get("creator") or "System"
     location = tuple(config.get("location", [0, 0, 0]))  # Geo-location
+    workers = args.jobs or config.get("workers") or 1
+    incremental = (
+        args.incremental_parse or config.get("incremental_parse", False)
+    ) and not args.full_parse
+    use_cache = config.get("parse_cache", True) and not args.no_cache and not args.full_parse
+    cache_dir = config.get_cache_dir()
+    reproducible = args.reproducible or config.get("reproducible_export", False)
+    fuzzy_deduplication = args.fuzzy_dedup or config.get("fuzzy_deduplication", False)
+    compression = args.compress or config.get("jex_compression") or "none"
+    compression_level = args.compress_level
+    if compression_level is None:
+        compression_level = config.get("jex_compression_level")
+    try:
+        check_codec(compression)
+        resolve_level(compression, compression_level)
+    except ValueError as e:
+        logger.error(str(e))
+        sys.exit(1)
+    export_options = {
+        "compression": compression,
+        "compression_level": compression_level,
+        "verify": args.verify,
+        "fsync_batch": args.fsync_batch,
+        "force": args.force,
+    }
+
+    if args.clear_cache:
+        ClippingsService(
+            language_code=language, checkpoint_dir=cache_dir, cache_dir=cache_dir
+        ).clear_caches()
+        logger.info(f"Cache cleared: {cache_dir}")
+        return
 
     logger.info(f"Input: {input_file}")
     logger.info(f"Output Target: {output_file}")
@@ -60,7 +169,11 @@ def main():
 
     try:
         # Pass language to Service
-        service = ClippingsService(language_code=language)
+        service = ClippingsService(
+            language_code=language,
+            checkpoint_dir=cache_dir if incremental else None,
+            cache_dir=cache_dir if use_cache else None,
+        )
         service.process_clippings(
             input_file=input_file,
             output_file=output_file,
@@ -69,6 +182,11 @@ def main():
             creator_name=creator,
             enable_deduplication=not args.no_clean,
             export_format=args.format,
+            workers=workers,
+            reproducible=reproducible,
+            since_last=args.since_last,
+            export_options=export_options,
+            fuzzy_deduplication=fuzzy_deduplication,
         )
 
     except Exception as e:
@@ -77,4 +195,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Frozen (PyInstaller) Windows builds: worker processes run their task, not the app
+    multiprocessing.freeze_support()
     main()
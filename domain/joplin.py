@@ -1,4 +1,4 @@
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from enum import IntEnum
 
 
@@ -32,7 +32,10 @@ class JoplinEntity:
     is_shared: int = 0
 
     def to_dict(self):
-        return {k: v for k, v in asdict(self).items() if v is not None}
+        # Shallow: every field is a scalar, so asdict()'s recursive deep copy is not needed
+        return {
+            f.name: getattr(self, f.name) for f in fields(self) if getattr(self, f.name) is not None
+        }
 
 
 @dataclass
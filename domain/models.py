@@ -1,13 +1,24 @@
-from dataclasses import dataclass, field
+import sys
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List
+from typing import Any, Iterable, Tuple
 
 
-@dataclass
+def _intern(value: Any) -> Any:
+    """Interns exact str values; anything else (None, numbers from loose callers) is kept."""
+    return sys.intern(value) if type(value) is str else value
+
+
+@dataclass(slots=True)
 class Clipping:
     """
     Represents a single highlight or note extracted from the Kindle clippings file.
 
+    Instances are slotted (no per-instance __dict__) because large libraries keep
+    hundreds of thousands of them in memory. Book, author, location, page and tag
+    strings repeat a lot and are interned; tags are stored as a tuple, so they are
+    replaced (or extended with add_tags) rather than mutated in place.
+
     Attributes:
         content (str): The actual text highlighted or the note content.
         book_title (str): Title of the book.
@@ -16,7 +27,7 @@ class Clipping:
         location (str): Kindle location reference (e.g., "100-200").
         page (str): Page number (if available).
         type (str): 'highlight' or 'note'.
-        tags (List[str]): List of tags associated with this clipping.
+        tags (Tuple[str, ...]): Tags associated with this clipping (any iterable is accepted).
         is_duplicate (bool): Flag indicating if this is a duplicate/redundant entry.
         uid (str): Deterministic unique ID (SHA-256) based on content/metadata (no date).
     """
@@ -28,10 +39,24 @@ class Clipping:
     location: str = ""
     page: str = ""
     entry_type: str = "highlight"
-    tags: List[str] = field(default_factory=list)
+    tags: Tuple[str, ...] = ()
     is_duplicate: bool = False  # Used for UI flagging
     uid: str = ""  # Deterministic ID
 
+    def __post_init__(self):
+        self.book_title = _intern(self.book_title)
+        self.author = _intern(self.author)
+        self.location = _intern(self.location)
+        self.page = _intern(self.page)
+        self.entry_type = _intern(self.entry_type)
+        self.tags = tuple(_intern(tag) for tag in self.tags)
+
+    def add_tags(self, tags: Iterable[str]):
+        """Appends the tags not already present, keeping their order."""
+        new_tags = [tag for tag in dict.fromkeys(tags) if tag not in self.tags]
+        if new_tags:
+            self.tags = self.tags + tuple(_intern(tag) for tag in new_tags)
+
     @property
     def title_hash(self):
         """Helper to identify unique books/authors."""
@@ -1,24 +1,116 @@
+import hashlib
+import logging
+import os
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from datetime import datetime, timezone
+from typing import Sequence, Dict, Any, List, Optional, Tuple
 from domain.models import Clipping
 
+logger = logging.getLogger("KindleToJex.Exporter")
+
+# Zip entries cannot store dates before 1980
+REPRODUCIBLE_MIN_TIME = datetime(1980, 1, 1, tzinfo=timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Naive datetimes (as parsed from the clippings file) are taken as UTC."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def reproducible_timestamp(
+    clippings: Sequence[Clipping], context: Optional[Dict[str, Any]] = None
+) -> datetime:
+    """
+    Timestamp stamped on every entry in reproducible mode, in order of preference:
+    context["timestamp"] (datetime or epoch seconds), $SOURCE_DATE_EPOCH, the newest
+    clipping date. Same input -> same timestamp, never earlier than 1980-01-01 UTC.
+    """
+    fixed = (context or {}).get("timestamp")
+    if fixed is None and os.environ.get("SOURCE_DATE_EPOCH"):
+        fixed = int(os.environ["SOURCE_DATE_EPOCH"])
+
+    if isinstance(fixed, datetime):
+        stamp = _as_utc(fixed)
+    elif fixed is not None:
+        stamp = datetime.fromtimestamp(fixed, timezone.utc)
+    else:
+        dates = [_as_utc(clip.date_time) for clip in clippings if clip.date_time]
+        stamp = max(dates, default=REPRODUCIBLE_MIN_TIME)
+    return max(stamp.astimezone(timezone.utc), REPRODUCIBLE_MIN_TIME)
+
+
+def _stable_key(clip: Clipping) -> Tuple[str, ...]:
+    date_str = clip.date_time.isoformat() if clip.date_time else ""
+    return (
+        clip.author,
+        clip.book_title,
+        date_str,
+        clip.location,
+        clip.page,
+        clip.entry_type,
+        clip.content,
+        clip.uid,
+    )
+
 
 class BaseExporter(ABC):
     """
     Abstract Base Class for all exporters.
     Enforces a consistent interface for the Strategy Pattern.
+
+    With context["reproducible"], exporters write the same bytes for the same clippings
+    (whatever their input order) and leave a "<output>.sha256" digest next to the file.
     """
 
+    # Digest of the last reproducible export, and whether it matched the previous one
+    last_digest: Optional[str] = None
+    unchanged = False
+
     @abstractmethod
     def export(
-        self, clippings: List[Clipping], output_file: str, context: Optional[Dict[str, Any]] = None
+        self,
+        clippings: Sequence[Clipping],
+        output_file: str,
+        context: Optional[Dict[str, Any]] = None,
     ):
         """
         Exports the given clippings to the specified output file.
 
         Args:
-            clippings: List of Clipping objects to export.
+            clippings: Clipping objects to export.
             output_file: Path to the destination file.
             context: Dictionary containing additional metadata (e.g., 'creator', 'location', 'root_notebook').
         """
         pass
+
+    @staticmethod
+    def reproducible_order(clippings: Sequence[Clipping]) -> List[Clipping]:
+        """Clippings sorted by author, book, date and location, independent of input order."""
+        return sorted(clippings, key=_stable_key)
+
+    def write_digest(self, output_file: str) -> str:
+        """
+        Writes the SHA-256 of the export to "<output_file>.sha256" (sha256sum format).
+        Sets self.unchanged when the previous digest file holds the same hash, so callers
+        can skip uploading or re-importing an identical archive.
+        """
+        sha = hashlib.sha256()
+        with open(output_file, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+
+        digest_file = f"{output_file}.sha256"
+        previous = None
+        if os.path.exists(digest_file):
+            with open(digest_file, "r", encoding="utf-8") as f:
+                previous = f.read().split(" ", 1)[0].strip()
+
+        self.last_digest = digest
+        self.unchanged = digest == previous
+        if self.unchanged:
+            logger.info(f"Export unchanged since last run (sha256 {digest[:12]})")
+        else:
+            with open(digest_file, "w", encoding="utf-8", newline="\n") as f:
+                f.write(f"{digest}  {os.path.basename(output_file)}\n")
+        return digest
@@ -1,6 +1,8 @@
 import csv
+import io
 import logging
-from typing import List, Dict, Any, Optional
+from itertools import islice
+from typing import Iterable, Iterator, Sequence, Dict, Any, Optional, TextIO, Tuple
 from domain.models import Clipping
 from exporters.base import BaseExporter
 
@@ -10,71 +12,97 @@ logger = logging.getLogger("KindleToJex.CsvExporter")
 class CsvExporter(BaseExporter):
     """
     Handles the export of clippings to CSV format.
+
+    Files are written row batch by row batch straight to the output, so memory does not
+    grow with the number of clippings; create_csv_string() is only for the clipboard.
     """
 
-    def create_csv_string(self, clippings: List[Clipping]) -> str:
+    FIELDNAMES = [
+        "book_title",
+        "author",
+        "content",
+        "type",
+        "date_time",
+        "page",
+        "location",
+        "tags",
+        "is_duplicate",
+        "source",
+    ]
+
+    # Rows handed to csv.writer.writerows() at a time
+    BATCH_SIZE = 1000
+
+    # Output file buffer size
+    BUFFER_SIZE = 1024 * 1024
+
+    def create_csv_string(self, clippings: Sequence[Clipping]) -> str:
         """
         Generates the CSV string content for a list of clippings.
         Useful for clipboard operations or in-memory processing.
         """
-        import io
-
         output = io.StringIO()
-        fieldnames = [
-            "book_title",
-            "author",
-            "content",
-            "type",
-            "date_time",
-            "page",
-            "location",
-            "tags",
-            "is_duplicate",
-            "source",
-        ]
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        # Manually write header to avoid potential issues with DictWriter in older pythons (though 3.8+ is fine)
-        writer.writeheader()
+        self.write_csv(clippings, output)
+        return output.getvalue()
 
+    def write_csv(self, clippings: Iterable[Clipping], stream: TextIO):
+        """Writes the header and one row per clipping, in batches, to a text stream."""
+        writer = csv.writer(stream)
+        writer.writerow(self.FIELDNAMES)
+
+        rows = self._rows(clippings)
+        while batch := list(islice(rows, self.BATCH_SIZE)):
+            writer.writerows(batch)
+
+    @staticmethod
+    def _rows(clippings: Iterable[Clipping]) -> Iterator[Tuple[Any, ...]]:
+        # Same columns and values as FIELDNAMES, without building a dict per row
         for clipping in clippings:
-            writer.writerow(
-                {
-                    "book_title": clipping.book_title,
-                    "author": clipping.author,
-                    "content": clipping.content,
-                    "type": clipping.entry_type,
-                    "date_time": clipping.date_time.isoformat() if clipping.date_time else "",
-                    "page": clipping.page,
-                    "location": clipping.location,
-                    "tags": ", ".join(clipping.tags),
-                    "is_duplicate": clipping.is_duplicate,
-                    "source": "kindle",
-                }
+            yield (
+                clipping.book_title,
+                clipping.author,
+                clipping.content,
+                clipping.entry_type,
+                clipping.date_time.isoformat() if clipping.date_time else "",
+                clipping.page,
+                clipping.location,
+                ", ".join(clipping.tags),
+                clipping.is_duplicate,
+                "kindle",
             )
 
-        return output.getvalue()
-
     def export(
-        self, clippings: List[Clipping], output_file: str, context: Optional[Dict[str, Any]] = None
+        self,
+        clippings: Sequence[Clipping],
+        output_file: str,
+        context: Optional[Dict[str, Any]] = None,
     ):
         """
         Writes a list of Clipping objects to a CSV file.
-        Context is accepted but ignored for CSV.
+        Only context["reproducible"] is used for CSV.
         """
         # Ensure output filename ends with .csv
         if not output_file.lower().endswith(".csv"):
             output_file += ".csv"
 
-        csv_content = self.create_csv_string(clippings)
+        reproducible = (context or {}).get("reproducible", False)
+        if reproducible:
+            clippings = self.reproducible_order(clippings)
 
         logger.info(f"Exporting {len(clippings)} clippings to CSV: {output_file}")
 
         try:
-            with open(output_file, "w", newline="", encoding="utf-8-sig") as f:
-                f.write(csv_content)
+            # utf-8-sig writes the BOM Excel needs to detect UTF-8
+            with open(
+                output_file, "w", newline="", encoding="utf-8-sig", buffering=self.BUFFER_SIZE
+            ) as f:
+                self.write_csv(clippings, f)
         except Exception as e:
             raise IOError(f"Failed to write CSV file: {e}")
 
+        if reproducible:
+            self.write_digest(output_file)
+
     # Alias for backward compatibility during transitions, can be deprecated later
-    def export_clippings(self, clippings: List[Clipping], output_file: str):
+    def export_clippings(self, clippings: Sequence[Clipping], output_file: str):
         self.export(clippings, output_file)
@@ -0,0 +1,183 @@
+"""
+Incremental sync of exported files into a directory (e.g. an Obsidian vault).
+
+Only files whose content changed are rewritten, so tools watching the directory only
+re-index what actually changed. A manifest in the target directory remembers the files
+the previous sync wrote and their hashes: files that are no longer exported are
+removed, and files the user created next to them are never touched. A file the user
+edited since the last sync is left as it is (with a warning) unless force=True.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger("KindleToJex.DirectorySync")
+
+MANIFEST_NAME = ".kindle-export.json"
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class DirectorySync:
+    """
+    Writes (relative path, content) pairs under `target_dir`.
+
+    With fsync_batch > 0, written files are flushed to disk `fsync_batch` at a time
+    (and their directories at the end) rather than left to the OS, so a crash right
+    after the export cannot leave truncated notes behind.
+
+    Files whose content on disk no longer matches the hash the manifest recorded were
+    edited by the user: they are neither overwritten nor removed but counted as "kept",
+    unless force=True.
+    """
+
+    def __init__(self, target_dir: str, fsync_batch: int = 0, force: bool = False):
+        self.target_dir = target_dir
+        self.fsync_batch = fsync_batch
+        self.force = force
+        self.manifest_path = os.path.join(target_dir, MANIFEST_NAME)
+        self.stats = {"written": 0, "unchanged": 0, "removed": 0, "kept": 0}
+        self._unsynced: List[str] = []
+        self._touched_dirs: Set[str] = set()
+
+    def sync(self, entries: Iterable[Tuple[str, bytes]]) -> Dict[str, int]:
+        """Writes new and changed files, removes stale ones; returns the counts."""
+        self.stats = {"written": 0, "unchanged": 0, "removed": 0, "kept": 0}
+        os.makedirs(self.target_dir, exist_ok=True)
+        previous = self._load_manifest()
+        current: Dict[str, str] = {}
+
+        for rel_path, data in entries:
+            digest = content_hash(data)
+            path = self._full_path(rel_path)
+            previous_digest = previous.get(rel_path)
+            if previous_digest == digest and os.path.exists(path):
+                # Same note as last time: nothing to write, whatever is on disk now
+                current[rel_path] = digest
+                self.stats["unchanged"] += 1
+                continue
+            on_disk = self._disk_hash(path)
+            if on_disk == digest:
+                current[rel_path] = digest
+                self.stats["unchanged"] += 1
+            elif on_disk is None or on_disk == previous_digest or self.force:
+                current[rel_path] = digest
+                self._write(path, data)
+                self.stats["written"] += 1
+            else:
+                self._keep(rel_path)
+                if previous_digest is not None:
+                    # Still listed: the next sync must see it as edited again
+                    current[rel_path] = previous_digest
+
+        for rel_path in previous.keys() - current.keys():
+            path = self._full_path(rel_path)
+            # Manifest paths come from a file on disk: never follow one out of the target
+            if not os.path.abspath(path).startswith(os.path.abspath(self.target_dir) + os.sep):
+                continue
+            on_disk = self._disk_hash(path)
+            if on_disk is None:
+                continue
+            if on_disk != previous[rel_path] and not self.force:
+                # Stays listed, so that a forced sync can still remove it
+                self._keep(rel_path)
+                current[rel_path] = previous[rel_path]
+            else:
+                self._remove(path)
+
+        self._flush()
+        self._save_manifest(current)
+        logger.info(
+            f"Synced {self.target_dir}: {self.stats['written']} written, "
+            f"{self.stats['unchanged']} unchanged, {self.stats['removed']} removed, "
+            f"{self.stats['kept']} kept"
+        )
+        return self.stats
+
+    def _full_path(self, rel_path: str) -> str:
+        return os.path.join(self.target_dir, *rel_path.split("/"))
+
+    @staticmethod
+    def _disk_hash(path: str) -> Optional[str]:
+        if not os.path.isfile(path):
+            return None
+        with open(path, "rb") as f:
+            return content_hash(f.read())
+
+    def _keep(self, rel_path: str):
+        logger.warning(
+            f"Keeping {rel_path}: it was changed outside the export (use --force to overwrite)"
+        )
+        self.stats["kept"] += 1
+
+    def _write(self, path: str, data: bytes):
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # Written next to the target and renamed, so watchers never see a partial note
+        tmp_path = os.path.join(directory, f".{os.path.basename(path)}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        if self.fsync_batch > 0:
+            self._unsynced.append(path)
+            self._touched_dirs.add(directory)
+            if len(self._unsynced) >= self.fsync_batch:
+                self._fsync_files()
+
+    def _remove(self, path: str):
+        os.remove(path)
+        self.stats["removed"] += 1
+        # Drop the book/author folders once they are empty
+        directory = os.path.dirname(path)
+        while os.path.abspath(directory) != os.path.abspath(self.target_dir):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                break  # Not empty
+            directory = os.path.dirname(directory)
+
+    def _fsync_files(self):
+        for path in self._unsynced:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        self._unsynced = []
+
+    def _flush(self):
+        if self.fsync_batch <= 0:
+            return
+        self._fsync_files()
+        for directory in self._touched_dirs:
+            try:
+                fd = os.open(directory, os.O_RDONLY)
+            except OSError:
+                continue  # Directories cannot be opened on Windows
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        self._touched_dirs = set()
+
+    def _load_manifest(self) -> Dict[str, str]:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("files", {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable sync manifest {self.manifest_path}: {e}")
+            return {}
+
+    def _save_manifest(self, files: Dict[str, str]):
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"files": files}, f, separators=(",", ":"))
+        os.replace(tmp_path, self.manifest_path)
@@ -0,0 +1,83 @@
+"""
+Manifest of the notes written by previous JEX exports, for delta exports.
+
+Note IDs are deterministic (book:location:page), so a note whose ID and content
+fingerprint are already in the manifest is known to Joplin and can be left out of
+the next archive.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Tuple
+from domain.models import Clipping
+
+logger = logging.getLogger("KindleToJex.ExportManifest")
+
+# Bump whenever the fingerprint or the note rendering changes, so all notes are re-exported
+MANIFEST_VERSION = 1
+
+
+def note_fingerprint(clip: Clipping, creator: str, location: Tuple[float, float, int]) -> str:
+    """Hash of everything a note entity and its tag associations are rendered from."""
+    date_str = clip.date_time.isoformat() if clip.date_time else ""
+    parts = (
+        clip.content,
+        clip.book_title,
+        clip.author,
+        date_str,
+        clip.page,
+        clip.location,
+        clip.entry_type,
+        "\x1e".join(clip.tags),
+        creator,
+        repr(tuple(location)),
+    )
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class ExportManifest:
+    """
+    Note ID -> content fingerprint of every note exported so far, stored as JSON.
+    Notes missing from an export keep their entry: Joplin still has them.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.notes: Dict[str, str] = {}
+        self.changed = 0
+        self.unchanged = 0
+
+    def load(self) -> "ExportManifest":
+        """Reads the manifest; a missing, unreadable or outdated one means a full export."""
+        if not os.path.exists(self.path):
+            return self
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable export manifest {self.path}: {e}")
+            return self
+
+        if data.get("version") == MANIFEST_VERSION:
+            self.notes = data.get("notes", {})
+        else:
+            logger.info("Export manifest is from another version; exporting all notes.")
+        return self
+
+    def update(self, note_id: str, fingerprint: str) -> bool:
+        """Records a note; returns True if it is new or changed since the last export."""
+        if self.notes.get(note_id) == fingerprint:
+            self.unchanged += 1
+            return False
+        self.notes[note_id] = fingerprint
+        self.changed += 1
+        return True
+
+    def save(self):
+        """Writes the manifest atomically, so an interrupted export keeps the previous one."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "notes": self.notes}, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,138 @@
+"""
+Optional compression of JEX archives.
+
+Joplin's importer reads plain and gzip-compressed tar archives, so gzip output keeps
+the .jex extension and imports as-is. xz and zstd give smaller files for storage and
+transfer; they are written as .jex.xz / .jex.zst and must be decompressed before import.
+zstd needs the optional 'zstandard' package and is the only codec that uses threads.
+"""
+
+import gzip
+import lzma
+import os
+import tarfile
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Optional, Union
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+CODECS = ("none", "gzip", "xz", "zstd")
+
+# Codecs Joplin can import without decompressing first
+IMPORTABLE_CODECS = ("none", "gzip")
+
+ARCHIVE_SUFFIXES = {"none": ".jex", "gzip": ".jex", "xz": ".jex.xz", "zstd": ".jex.zst"}
+
+DEFAULT_LEVELS = {"gzip": 6, "xz": 6, "zstd": 3}
+
+# compression_level="fast": lowest level, and every core for zstd
+FAST_LEVELS = {"gzip": 1, "xz": 0, "zstd": 1}
+
+# Valid levels (inclusive) per codec
+LEVEL_RANGES = {"gzip": (0, 9), "xz": (0, 9), "zstd": (1, 22)}
+
+
+def archive_path(output_file: str, codec: str) -> str:
+    """Output path with the extension of the codec (report.jex -> report.jex.xz)."""
+    suffix = ARCHIVE_SUFFIXES[codec]
+    if output_file.endswith(suffix):
+        return output_file
+    if output_file.endswith(".jex"):
+        return output_file + suffix[len(".jex") :]
+    return output_file + suffix
+
+
+def resolve_level(codec: str, level: Union[int, str, None]) -> Optional[int]:
+    if codec == "none":
+        return None
+    if level is None:
+        return DEFAULT_LEVELS[codec]
+    if level == "fast":
+        return FAST_LEVELS[codec]
+    try:
+        value = int(level)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid compression level {level!r}: expected a number or 'fast'")
+    low, high = LEVEL_RANGES[codec]
+    if not low <= value <= high:
+        raise ValueError(f"{codec} compression level must be {low}-{high} or 'fast', got {value}")
+    return value
+
+
+def check_codec(codec: str):
+    """Raises ValueError for unknown codecs or a missing optional dependency."""
+    if codec not in CODECS:
+        raise ValueError(f"Unknown JEX compression '{codec}', expected one of {', '.join(CODECS)}")
+    if codec == "zstd" and zstandard is None:
+        raise ValueError(
+            "zstd compression requires the 'zstandard' package (pip install zstandard)"
+        )
+
+
+@contextmanager
+def compressed_stream(
+    fileobj: BinaryIO,
+    codec: str,
+    level: Union[int, str, None] = None,
+    threads: int = 1,
+    mtime: Optional[int] = None,
+) -> Iterator[BinaryIO]:
+    """
+    Wraps an open binary file in a compressor for the codec. The compressed trailer is
+    written on exit; the underlying file is left open. `mtime` goes into the gzip
+    header (reproducible mode), `threads` is used by zstd.
+    """
+    check_codec(codec)
+    compression_level = resolve_level(codec, level)
+
+    if codec == "none":
+        yield fileobj
+        return
+
+    stream: BinaryIO
+    if codec == "gzip":
+        stream = gzip.GzipFile(
+            filename="", mode="wb", fileobj=fileobj, compresslevel=compression_level, mtime=mtime
+        )
+    elif codec == "xz":
+        stream = lzma.LZMAFile(fileobj, "wb", preset=compression_level)
+    else:
+        if level == "fast" and threads <= 1:
+            threads = os.cpu_count() or 1
+        compressor = zstandard.ZstdCompressor(
+            level=compression_level, threads=threads if threads > 1 else 0
+        )
+        stream = compressor.stream_writer(fileobj, closefd=False)
+
+    with stream:
+        yield stream
+
+
+def verify_archive(path: str, codec: str) -> int:
+    """
+    Reads the archive back the way an importer would and returns its entry count.
+    Raises tarfile.TarError (or the codec's error) if it is truncated or corrupt.
+    """
+    check_codec(codec)
+    with open(path, "rb") as f:
+        if codec == "zstd":
+            reader = zstandard.ZstdDecompressor().stream_reader(f)
+            with tarfile.open(fileobj=reader, mode="r|") as tar:
+                return _count_entries(tar)
+
+        mode = {"none": "r:", "gzip": "r:gz", "xz": "r:xz"}[codec]
+        with tarfile.open(fileobj=f, mode=mode) as tar:
+            return _count_entries(tar)
+
+
+def _count_entries(tar: tarfile.TarFile) -> int:
+    count = 0
+    for member in tar:
+        entry = tar.extractfile(member)
+        if entry is None or len(entry.read()) != member.size:
+            raise tarfile.TarError(f"Unreadable entry: {member.name}")
+        count += 1
+    return count
@@ -0,0 +1,53 @@
+import tarfile
+from datetime import datetime
+from typing import BinaryIO, Optional
+
+
+class JexTarWriter:
+    """
+    Writes a JEX archive (uncompressed ustar) one entry at a time.
+
+    Each header is built with TarInfo.tobuf() and written straight to the output
+    followed by the payload and its block padding, so nothing is buffered between
+    entries. The result is byte-identical to tarfile.open(mode="w:") + addfile().
+    """
+
+    def __init__(self, fileobj: BinaryIO, mtime: Optional[int] = None):
+        self.fileobj = fileobj
+        self.mtime = int(datetime.now().timestamp()) if mtime is None else mtime
+        self.offset = 0
+        self.closed = False
+
+    def add(self, name: str, payload: bytes):
+        """Appends one file entry to the archive."""
+        info = tarfile.TarInfo(name=name)
+        info.size = len(payload)
+        info.mtime = self.mtime
+        self._write(info.tobuf(tarfile.USTAR_FORMAT, "utf-8", "surrogateescape"))
+        self._write(payload)
+
+        remainder = len(payload) % tarfile.BLOCKSIZE
+        if remainder:
+            self._write(tarfile.NUL * (tarfile.BLOCKSIZE - remainder))
+
+    def close(self):
+        """Writes the end-of-archive marker and pads to a full record, like tarfile does."""
+        if self.closed:
+            return
+        self.closed = True
+        self._write(tarfile.NUL * (tarfile.BLOCKSIZE * 2))
+        remainder = self.offset % tarfile.RECORDSIZE
+        if remainder:
+            self._write(tarfile.NUL * (tarfile.RECORDSIZE - remainder))
+
+    def _write(self, data: bytes):
+        self.fileobj.write(data)
+        self.offset += len(data)
+
+    def __enter__(self) -> "JexTarWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Like tarfile, only finalize the archive when no error occurred
+        if exc_type is None:
+            self.close()
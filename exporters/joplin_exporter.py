@@ -1,14 +1,33 @@
-import tarfile
-import io
 import logging
-import hashlib
+import os
+import time
 from uuid import uuid4
 from datetime import datetime, timezone
-from typing import Dict, Any, List, Tuple, Optional
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 from domain.models import Clipping
 from domain.constants import GENERATOR_STRING
-from domain.joplin import JoplinNotebook, JoplinNote, JoplinTag, JoplinTagAssociation
-from exporters.base import BaseExporter
+from domain.joplin import (
+    JoplinEntity,
+    JoplinNotebook,
+    JoplinNote,
+    JoplinTag,
+    JoplinTagAssociation,
+)
+from exporters.base import BaseExporter, reproducible_timestamp
+from exporters.export_manifest import ExportManifest, note_fingerprint
+from exporters.jex_compression import (
+    IMPORTABLE_CODECS,
+    archive_path,
+    check_codec,
+    compressed_stream,
+    verify_archive,
+)
+from exporters.jex_writer import JexTarWriter
+from exporters.joplin_serializer import serialize_entity
+from services.identity_service import IdentityService
 
 logger = logging.getLogger("KindleToJex.JoplinExporter")
 
@@ -24,21 +43,23 @@ class JoplinEntityBuilder:
         return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
 
     @staticmethod
-    def _generate_id(key: Optional[str] = None) -> str:
+    def _generate_id(key: Optional[str] = None, cache: bool = True) -> str:
         """
         Generates a 32-char hex ID.
-        If 'key' is provided, returns a deterministic MD5 hash of the key.
+        If 'key' is provided, returns a deterministic MD5 hash of the key
+        (IdentityService.entity_id, computed once per key unless cache=False).
         If 'key' is None, returns a random UUID.
         """
         if key:
-            # MD5 is used here for deterministic ID generation, not security.
             # We want "Title" -> Always same ID.
-            return hashlib.md5(key.encode("utf-8")).hexdigest()
+            return IdentityService.entity_id(key, cache)
         return uuid4().hex
 
     @staticmethod
-    def create_notebook(title: str, parent_id: str = "") -> JoplinNotebook:
-        now = JoplinEntityBuilder._now()
+    def create_notebook(
+        title: str, parent_id: str = "", timestamp: Optional[str] = None
+    ) -> JoplinNotebook:
+        now = timestamp or JoplinEntityBuilder._now()
         # ID is based on TITLE ONLY to allow moving notebook without changing ID
         # This enables potential future "move" instead of "duplicate" behavior
         id_seed = f"notebook:{title}"
@@ -63,27 +84,17 @@ class JoplinEntityBuilder:
         altitude=0.0,
         author="",
         clipping_ref: Optional[Clipping] = None,
+        timestamp: Optional[str] = None,
     ) -> JoplinNote:
+        # 'timestamp' replaces the wall clock for notes without a date (reproducible mode)
         now = (
             created_time.isoformat(timespec="milliseconds")
             if created_time
-            else JoplinEntityBuilder._now()
+            else timestamp or JoplinEntityBuilder._now()
         )
 
-        # Deterministic ID strategy for Notes:
-        # We want to allow content edits without changing ID (so Joplin updates the note),
-        # BUT we need uniqueness.
-        # Strategy: Book + Location is the most stable "Identity" of a highlight.
-        if clipping_ref:
-            # key: "note:BookTitle:Location:Page"
-            # (Adding page to be extra safe against location formatting changes)
-            id_seed = f"note:{clipping_ref.book_title}:{clipping_ref.location}:{clipping_ref.page}"
-        else:
-            # Fallback for manual notes or unknown origin
-            id_seed = None
-
         return JoplinNote(
-            id=JoplinEntityBuilder._generate_id(id_seed),
+            id=JoplinEntityBuilder.note_id(clipping_ref),
             parent_id=parent_id,
             title=title,
             body=body,
@@ -102,8 +113,24 @@ class JoplinEntityBuilder:
         )
 
     @staticmethod
-    def create_tag(title: str) -> JoplinTag:
-        now = JoplinEntityBuilder._now()
+    def note_id(clipping_ref: Optional[Clipping] = None) -> str:
+        # Deterministic ID strategy for Notes:
+        # We want to allow content edits without changing ID (so Joplin updates the note),
+        # BUT we need uniqueness.
+        # Strategy: Book + Location is the most stable "Identity" of a highlight.
+        if clipping_ref:
+            # key: "note:BookTitle:Location:Page"
+            # (Adding page to be extra safe against location formatting changes)
+            id_seed = f"note:{clipping_ref.book_title}:{clipping_ref.location}:{clipping_ref.page}"
+        else:
+            # Fallback for manual notes or unknown origin
+            id_seed = None
+        # Seen at most twice per export: a cache lookup costs about as much as the hash
+        return JoplinEntityBuilder._generate_id(id_seed, cache=False)
+
+    @staticmethod
+    def create_tag(title: str, timestamp: Optional[str] = None) -> JoplinTag:
+        now = timestamp or JoplinEntityBuilder._now()
         clean_title = title.strip()
         # ID seed uses lowercase for deterministic dedup within the JEX file.
         # But the title is preserved as-is so Joplin's Tag.loadByTitle()
@@ -121,12 +148,15 @@ class JoplinEntityBuilder:
         )
 
     @staticmethod
-    def create_tag_association(tag_id: str, note_id: str) -> JoplinTagAssociation:
-        now = JoplinEntityBuilder._now()
+    def create_tag_association(
+        tag_id: str, note_id: str, timestamp: Optional[str] = None
+    ) -> JoplinTagAssociation:
+        now = timestamp or JoplinEntityBuilder._now()
         # Association ID should also be deterministic to avoid duplicate links
         id_seed = f"assoc:{note_id}:{tag_id}"
         return JoplinTagAssociation(
-            id=JoplinEntityBuilder._generate_id(id_seed),
+            # Every note/tag pair is exported once: not worth caching
+            id=JoplinEntityBuilder._generate_id(id_seed, cache=False),
             note_id=note_id,
             tag_id=tag_id,
             created_time=now,
@@ -136,27 +166,82 @@ class JoplinEntityBuilder:
         )
 
 
+# Per-process exporter used by the worker pool of the parallel export mode
+_worker_exporter: Optional["JoplinExporter"] = None
+
+
+def _init_render_worker(
+    location: Tuple[float, float, int], creator: str, timestamp: Optional[str] = None
+):
+    global _worker_exporter
+    _worker_exporter = JoplinExporter()
+    _worker_exporter.location = location
+    _worker_exporter.creator = creator
+    _worker_exporter.timestamp = timestamp
+
+
+def _render_note_batch(items: List[Tuple[Clipping, str]]) -> List[Tuple[str, bytes]]:
+    """Worker entry point: renders the note entries of a batch of (clipping, book notebook id)."""
+    exporter = _worker_exporter
+    assert exporter is not None, "Worker was not initialized"
+    return [exporter._render(exporter._build_note(clip, book_id)) for clip, book_id in items]
+
+
 class JoplinExporter(BaseExporter):
     """
     Handles the creation of JEX (Joplin Export) files, including
     the logic for organizing clippings into notebooks.
+
+    Entities are written to the archive as soon as they are built, so memory
+    does not grow with the number of notes.
+
+    With context["workers"] > 1, note payloads are rendered by a process pool while
+    this process plans notebooks and tags and appends every entry in the serial order.
+
+    With context["reproducible"], clippings are exported in a stable order and every
+    wall-clock time (entity times, tar mtime) is replaced by reproducible_timestamp().
+
+    With context["since_last"], only notes that are new or changed since the previous
+    export (per the manifest in context["manifest_file"], default "<output>.manifest.json")
+    are written, with the notebooks and tags they need.
+
+    context["compression"] ("none", "gzip", "xz", "zstd") and context["compression_level"]
+    (an int or "fast") compress the archive; see exporters.jex_compression.
+    context["verify"] reads the finished archive back and checks every entry.
     """
 
+    # Clippings sent to a worker at a time in parallel mode
+    RENDER_BATCH_SIZE = 500
+
     def __init__(self):
-        self.entities_to_export: List[Any] = []
+        self.writer: Optional[JexTarWriter] = None
+        self.entities_written = 0
+        self.skipped_unchanged = 0
+        # Sizes and throughput of the last export: raw_bytes, archive_bytes, seconds
+        self.archive_stats: Dict[str, float] = {}
         self.authors_cache: Dict[str, str] = {}
         self.books_cache: Dict[str, str] = {}
         self.tags_cache: Dict[str, str] = {}
+        self.location: Tuple[float, float, int] = (0.0, 0.0, 0)
+        self.creator = "System"
+        # Fixed entity time in reproducible mode, wall clock otherwise
+        self.timestamp: Optional[str] = None
         self.builder = JoplinEntityBuilder()
+        # Where rendered (name, payload) entries go; the archive unless planning a batch
+        self._sink: Optional[Callable[[str, bytes], None]] = None
 
     def export(
-        self, clippings: List[Clipping], output_file: str, context: Optional[Dict[str, Any]] = None
+        self,
+        clippings: Sequence[Clipping],
+        output_file: str,
+        context: Optional[Dict[str, Any]] = None,
     ):
         """
         Main entry point for JEX export.
         """
         # 1. Reset Internal State
-        self.entities_to_export = []
+        self.entities_written = 0
+        self.skipped_unchanged = 0
         self.authors_cache = {}
         self.books_cache = {}
         self.tags_cache = {}
@@ -164,38 +249,189 @@ class JoplinExporter(BaseExporter):
         # 2. Extract Context
         context = context or {}
         root_notebook_name = context.get("root_notebook", "Kindle Imports")
-        creator = context.get("creator", "System")
-        location = context.get("location", (0.0, 0.0, 0))  # lat, lon, alt
+        self.creator = context.get("creator", "System")
+        self.location = context.get("location", (0.0, 0.0, 0))  # lat, lon, alt
+        workers = context.get("workers", 1)
+        reproducible = context.get("reproducible", False)
+        codec = context.get("compression", "none")
+        check_codec(codec)
+
+        mtime = None
+        self.timestamp = None
+        if reproducible:
+            stamp = reproducible_timestamp(clippings, context)
+            mtime = int(stamp.timestamp())
+            self.timestamp = stamp.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+            clippings = self.reproducible_order(clippings)
+
+        output_file = archive_path(output_file, codec)
+        logger.info(f"Exporting JEX archive to: {output_file}")
+        if codec not in IMPORTABLE_CODECS:
+            logger.info(f"{codec} archives must be decompressed to a .jex before import.")
 
-        # 3. Create Root Notebook
-        root_nb = self.builder.create_notebook(root_notebook_name)
-        self.entities_to_export.append(root_nb)
-        root_id = root_nb.id
+        manifest = None
+        if context.get("since_last", False):
+            manifest_file = context.get("manifest_file") or f"{output_file}.manifest.json"
+            manifest = ExportManifest(manifest_file).load()
 
-        # 4. Process Clippings
+        # 3. Stream entities into the archive as they are built
         skipped_dupes = 0
-        for clip in clippings:
-            if clip.is_duplicate:
-                skipped_dupes += 1
-                continue
-            self._process_single_clipping(clip, root_id, location, creator)
+        start = time.perf_counter()
+        with (
+            open(output_file, "wb") as f,
+            compressed_stream(
+                f, codec, context.get("compression_level"), threads=workers, mtime=mtime
+            ) as stream,
+            JexTarWriter(stream, mtime=mtime) as writer,
+        ):
+            self.writer = writer
+            self._sink = writer.add
+            try:
+                # Root Notebook
+                root_nb = self.builder.create_notebook(root_notebook_name, timestamp=self.timestamp)
+                self._emit(root_nb)
+                root_id = root_nb.id
+
+                # Process Clippings
+                def active_clippings() -> Iterator[Clipping]:
+                    nonlocal skipped_dupes
+                    for clip in clippings:
+                        if clip.is_duplicate:
+                            skipped_dupes += 1
+                            continue
+                        if manifest is not None and not manifest.update(
+                            self.builder.note_id(clip),
+                            note_fingerprint(clip, self.creator, self.location),
+                        ):
+                            self.skipped_unchanged += 1
+                            continue
+                        yield clip
+
+                if workers > 1:
+                    self._export_parallel(active_clippings(), root_id, workers)
+                else:
+                    for clip in active_clippings():
+                        self._process_single_clipping(clip, root_id)
+            finally:
+                self.writer = None
+                self._sink = None
+
+        self._report_archive(output_file, codec, writer.offset, time.perf_counter() - start)
+
+        if context.get("verify", False):
+            entries = verify_archive(output_file, codec)
+            if entries != self.entities_written:
+                raise IOError(
+                    f"Archive check failed: {entries} entries, {self.entities_written} written"
+                )
+            logger.info(f"Verified {entries} archive entries.")
 
         if skipped_dupes > 0:
             logger.info(f"Skipped {skipped_dupes} duplicate items during JEX export.")
-
-        logger.info(f"Exporting JEX archive to: {output_file}")
-
-        # 5. Write JAR
-        self._write_jex_file(output_file, self.entities_to_export)
-
-    def _process_single_clipping(
-        self, clip: Clipping, root_id: str, location: Tuple[float, float, int], creator: str
-    ):
+        logger.info(f"Wrote {self.entities_written} entities to {output_file}")
+        stats = IdentityService.stats
+        logger.debug(
+            f"Entity ID cache: {stats['entity_id_hits']} hits, "
+            f"{stats['entity_id_misses']} misses ({IdentityService.hit_rates()['entity_id']:.0%})"
+        )
+        if manifest is not None:
+            # Only once the archive is complete: a failed export must not mark notes as sent
+            manifest.save()
+            logger.info(
+                f"Delta export: {manifest.changed} new or changed notes, "
+                f"{self.skipped_unchanged} unchanged notes left out."
+            )
+        if reproducible:
+            self.write_digest(output_file)
+
+    def _report_archive(self, output_file: str, codec: str, raw_bytes: int, seconds: float):
+        archive_bytes = os.path.getsize(output_file)
+        self.archive_stats = {
+            "raw_bytes": raw_bytes,
+            "archive_bytes": archive_bytes,
+            "seconds": seconds,
+        }
+        if codec != "none":
+            ratio = archive_bytes / raw_bytes if raw_bytes else 0.0
+            throughput = raw_bytes / 2**20 / seconds if seconds else 0.0
+            logger.info(
+                f"{codec}: {raw_bytes / 2**20:.1f} MiB -> {archive_bytes / 2**20:.1f} MiB "
+                f"({ratio:.0%}) in {seconds:.2f}s, {throughput:.1f} MiB/s"
+            )
+
+    def _render(self, entity: JoplinEntity) -> Tuple[str, bytes]:
+        """Archive entry (file name, payload) of an entity."""
+        return f"{entity.id}.md", self._create_entity_content(entity).encode("utf-8")
+
+    def _emit(self, entity: JoplinEntity):
+        """Serializes one entity straight into the archive."""
+        assert self._sink is not None, "_emit() called outside export()"
+        self._sink(*self._render(entity))
+        self.entities_written += 1
+
+    def _process_single_clipping(self, clip: Clipping, root_id: str):
+        book_id = self._book_notebook(clip, root_id)
+        note = self._build_note(clip, book_id)
+        self._emit(note)
+        self._emit_tags(clip, note.id)
+
+    def _export_parallel(self, clippings: Iterator[Clipping], root_id: str, workers: int):
+        """
+        Renders note payloads in a process pool. Notebooks, tags and associations are
+        planned here in clipping order (note IDs do not depend on the rendering), and
+        each batch is appended once its notes are back, so the archive is the same as
+        the serial one.
+        """
+        # Each plan entry is a rendered (name, payload) or the index of a note in its batch
+        Plan = List[Union[int, Tuple[str, bytes]]]
+        pending: Deque[Tuple[Plan, Future]] = deque()
+
+        writer = self.writer
+        assert writer is not None
+
+        def flush_oldest():
+            plan, future = pending.popleft()
+            notes = future.result()
+            for entry in plan:
+                if isinstance(entry, int):
+                    writer.add(*notes[entry])
+                    self.entities_written += 1
+                else:
+                    writer.add(*entry)
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_render_worker,
+            initargs=(self.location, self.creator, self.timestamp),
+        ) as pool:
+            while batch := list(islice(clippings, self.RENDER_BATCH_SIZE)):
+                plan: Plan = []
+                items = []
+                self._sink = lambda name, payload: plan.append((name, payload))
+                for clip in batch:
+                    book_id = self._book_notebook(clip, root_id)
+                    plan.append(len(items))
+                    items.append((clip, book_id))
+                    self._emit_tags(clip, self.builder.note_id(clip))
+                self._sink = writer.add
+
+                pending.append((plan, pool.submit(_render_note_batch, items)))
+                # Keep a bounded number of batches in flight
+                if len(pending) >= workers * 2:
+                    flush_oldest()
+
+            while pending:
+                flush_oldest()
+
+    def _book_notebook(self, clip: Clipping, root_id: str) -> str:
+        """Returns the book notebook ID, emitting the author/book notebooks on first use."""
         # Author Notebook - Uppercase per user requirement
         author_name = clip.author.upper()
         if author_name not in self.authors_cache:
-            author_nb = self.builder.create_notebook(author_name, parent_id=root_id)
-            self.entities_to_export.append(author_nb)
+            author_nb = self.builder.create_notebook(
+                author_name, parent_id=root_id, timestamp=self.timestamp
+            )
+            self._emit(author_nb)
             self.authors_cache[author_name] = author_nb.id
         author_id = self.authors_cache[author_name]
 
@@ -203,109 +439,49 @@ class JoplinExporter(BaseExporter):
         book_title = clip.book_title
         book_cache_key = f"{author_name}__{book_title}"
         if book_cache_key not in self.books_cache:
-            book_nb = self.builder.create_notebook(book_title, parent_id=author_id)
-            self.entities_to_export.append(book_nb)
+            book_nb = self.builder.create_notebook(
+                book_title, parent_id=author_id, timestamp=self.timestamp
+            )
+            self._emit(book_nb)
             self.books_cache[book_cache_key] = book_nb.id
-        book_id = self.books_cache[book_cache_key]
+        return self.books_cache[book_cache_key]
 
-        # Create Note
+    def _build_note(self, clip: Clipping, book_id: str) -> JoplinNote:
         note_title = self._format_title(clip)
         note_body = self._format_body(clip)
 
-        note = self.builder.create_note(
+        return self.builder.create_note(
             title=note_title,
             body=note_body,
             parent_id=book_id,
             created_time=clip.date_time,
-            latitude=location[0],
-            longitude=location[1],
-            altitude=location[2],
-            author=creator,
+            latitude=self.location[0],
+            longitude=self.location[1],
+            altitude=self.location[2],
+            author=self.creator,
             clipping_ref=clip,
+            timestamp=self.timestamp,
         )
-        self.entities_to_export.append(note)
 
-        # Handle Tags
+    def _emit_tags(self, clip: Clipping, note_id: str):
         # Cache key is lowercased to avoid self-duplicates within the JEX,
         # but the actual tag title preserves original case for Joplin matching.
         for tag_str in clip.tags:
             tag_key = tag_str.lower().strip()
             if tag_key not in self.tags_cache:
-                tag_obj = self.builder.create_tag(tag_str)
-                self.entities_to_export.append(tag_obj)
+                tag_obj = self.builder.create_tag(tag_str, timestamp=self.timestamp)
+                self._emit(tag_obj)
                 self.tags_cache[tag_key] = tag_obj.id
 
             tag_id = self.tags_cache[tag_key]
-            assoc = self.builder.create_tag_association(tag_id=tag_id, note_id=note.id)
-            self.entities_to_export.append(assoc)
-
-    def _write_jex_file(self, output_filename: str, entites: List[Any]):
-        """
-        Writes the entity list to a .jex tarball.
-        """
-        if not output_filename.endswith(".jex"):
-            output_filename += ".jex"
-
-        with tarfile.open(output_filename, "w:") as tar:
-            tar.format = tarfile.USTAR_FORMAT
-
-            for entity_obj in entites:
-                # Convert Dataclass to Dict for serialization
-                entity = entity_obj.to_dict()
-
-                file_name = f"{entity['id']}.md"
-                content = self._create_entity_content(entity)
-
-                # Create a file object in memory
-                file_obj = io.BytesIO(content.encode("utf-8"))
-
-                # Create tar info
-                tar_info = tarfile.TarInfo(name=file_name)
-                tar_info.size = len(file_obj.getvalue())
-                tar_info.mtime = int(datetime.now().timestamp())
-
-                tar.addfile(tar_info, file_obj)
-
-    def _create_entity_content(self, entity: Dict[str, Any]) -> str:
-        # Standard Joplin RAW Format:
-        # Line 1: Title
-        # Line 2: Empty
-        # Line 3+: Body (if note)
-        # ... Empty Line ...
-        # Line N: Properties
-
-        parts = []
-
-        # 1. Title (Header) - Universal for Notes, Tags, etc.
-        # The user confirmed: "Tag name up top".
-        parts.append(entity.get("title", ""))
-        parts.append("")  # Blank separator
-
-        # 2. Body (If present)
-        if entity.get("body"):
-            parts.append(entity["body"])
-            parts.append("")  # Blank separator
-
-        # 3. Properties
-        special_keys = {"title", "body", "type_"}
-
-        # Helper for value normalization
-        def normalize_val(v):
-            return v.value if hasattr(v, "value") else v
-
-        # Add generic properties
-        for key, value in entity.items():
-            if key not in special_keys:
-                parts.append(f"{key}: {normalize_val(value)}")
-
-        # 4. Type (Last)
-        if "type_" in entity:
-            parts.append(f"type_: {normalize_val(entity['type_'])}")
-
-        # Join adds newlines between parts.
-        # If parts=['Title', '', 'id: 1'] -> "Title\n\nid: 1" (Correct single blank line)
-        # If parts=['Title', '', 'Body', '', 'id: 1'] -> "Title\n\nBody\n\nid: 1" (Correct)
-        return "\n".join(parts)
+            assoc = self.builder.create_tag_association(
+                tag_id=tag_id, note_id=note_id, timestamp=self.timestamp
+            )
+            self._emit(assoc)
+
+    def _create_entity_content(self, entity: JoplinEntity) -> str:
+        """Joplin raw text of an entity (see exporters.joplin_serializer)."""
+        return serialize_entity(entity)
 
     # Configurable Layout Constants
     KINDLE_LOCATION_RATIO = 16.69
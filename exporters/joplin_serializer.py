@@ -0,0 +1,97 @@
+"""
+Serialization of Joplin entities to the raw text format stored in JEX archives.
+
+Standard Joplin RAW Format:
+    Line 1: Title
+    Line 2: Empty
+    Line 3+: Body (if note)
+    ... Empty Line ...
+    Line N: Properties ("key: value"), type_ last
+"""
+
+from dataclasses import MISSING, fields
+from operator import attrgetter
+from typing import Any, Callable, Dict, Tuple, Type
+from domain.joplin import JoplinEntity
+
+# Keys rendered outside the generic property list
+SPECIAL_KEYS = {"title", "body", "type_"}
+
+
+def _normalize(value: Any) -> Any:
+    return value.value if hasattr(value, "value") else value
+
+
+def render_entity_generic(entity: JoplinEntity) -> str:
+    """
+    Reference implementation: walks the fields of any entity one by one.
+    Used for entities the compiled templates cannot render (None values, overridden type_).
+    """
+    parts = []
+
+    # 1. Title (Header) - Universal for Notes, Tags, etc.
+    parts.append(getattr(entity, "title", ""))
+    parts.append("")  # Blank separator
+
+    # 2. Body (If present)
+    body = getattr(entity, "body", "")
+    if body:
+        parts.append(body)
+        parts.append("")  # Blank separator
+
+    # 3. Properties
+    for field_info in fields(entity):
+        key = field_info.name
+        value = getattr(entity, key)
+        if key not in SPECIAL_KEYS and value is not None:
+            parts.append(f"{key}: {_normalize(value)}")
+
+    # 4. Type (Last)
+    if entity.type_ is not None:
+        parts.append(f"type_: {_normalize(entity.type_)}")
+
+    # Join adds newlines between parts.
+    # If parts=['Title', '', 'id: 1'] -> "Title\n\nid: 1" (Correct single blank line)
+    # If parts=['Title', '', 'Body', '', 'id: 1'] -> "Title\n\nBody\n\nid: 1" (Correct)
+    return "\n".join(parts)
+
+
+class _CompiledTemplate:
+    """Format template and attribute getter generated once per entity dataclass."""
+
+    def __init__(self, entity_type: Type[JoplinEntity]):
+        entity_fields = fields(entity_type)
+        names = [f.name for f in entity_fields if f.name not in SPECIAL_KEYS]
+        type_field = next(f for f in entity_fields if f.name == "type_")
+
+        self.has_title = any(f.name == "title" for f in entity_fields)
+        self.has_body = any(f.name == "body" for f in entity_fields)
+        self.get_values: Callable[[Any], Tuple[Any, ...]] = attrgetter(*names)
+        self.default_type = None if type_field.default is MISSING else type_field.default
+        # Enum resolved once: "type_: 1"
+        self.template = "\n".join(f"{name}: {{}}" for name in names)
+        self.template += f"\ntype_: {_normalize(self.default_type)}"
+
+    def render(self, entity: JoplinEntity) -> str:
+        values = self.get_values(entity)
+        if None in values or entity.type_ is not self.default_type:
+            return render_entity_generic(entity)
+
+        title = entity.title if self.has_title else ""  # type: ignore[attr-defined]
+        body = entity.body if self.has_body else ""  # type: ignore[attr-defined]
+        # Property fields are plain str/int/float, formatted as-is
+        properties = self.template.format(*values)
+        if body:
+            return f"{title}\n\n{body}\n\n{properties}"
+        return f"{title}\n\n{properties}"
+
+
+_TEMPLATES: Dict[type, _CompiledTemplate] = {}
+
+
+def serialize_entity(entity: JoplinEntity) -> str:
+    """Renders an entity to Joplin raw text, exactly as render_entity_generic() does."""
+    template = _TEMPLATES.get(type(entity))
+    if template is None:
+        template = _TEMPLATES[type(entity)] = _CompiledTemplate(type(entity))
+    return template.render(entity)
@@ -1,6 +1,7 @@
+import io
 import json
 import logging
-from typing import List, Dict, Any, Optional
+from typing import Sequence, Dict, Any, Optional, TextIO
 from domain.models import Clipping
 from exporters.base import BaseExporter
 
@@ -11,61 +12,104 @@ class JsonExporter(BaseExporter):
     """
     Handles the export of clippings to a raw JSON file.
     Ideal for backups or developers who want to process the data programmatically.
+
+    The file is written one clipping at a time, so no full copy of the export is built
+    in memory. With lines=True the output is JSON Lines (.jsonl): one clipping object
+    per line and no meta block. Both can be read back with parsers.json_parser.
     """
 
+    def __init__(self, lines: bool = False):
+        self.lines = lines
+
+    @staticmethod
+    def clipping_to_dict(clip: Clipping) -> Dict[str, Any]:
+        return {
+            "book_title": clip.book_title,
+            "author": clip.author,
+            "content": clip.content,
+            "type": clip.entry_type,
+            "date_time": clip.date_time.isoformat() if clip.date_time else None,
+            "page": clip.page,
+            "location": clip.location,
+            "tags": list(clip.tags),
+            # Include raw boolean indicating if it was flagged as dupe
+            "is_duplicate": clip.is_duplicate,
+            "source": "kindle",
+        }
+
     def create_json_string(
-        self, clippings: List[Clipping], context: Optional[Dict[str, Any]] = None
+        self, clippings: Sequence[Clipping], context: Optional[Dict[str, Any]] = None
     ) -> str:
         """
         Generates the JSON string for a list of clippings.
         """
+        output = io.StringIO()
+        self.write_json(clippings, output, context)
+        return output.getvalue()
+
+    def write_json(
+        self,
+        clippings: Sequence[Clipping],
+        stream: TextIO,
+        context: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Streams the export document to a text stream. The output is the same as
+        json.dumps({"meta": ..., "clippings": [...]}, indent=2, ensure_ascii=False).
+        """
         context = context or {}
+        meta = {
+            "count": len(clippings),
+            "generated_at": context.get("generated_at", None),
+            "creator": context.get("creator", "System"),
+            "source": "KindleClippingsToJEX",
+        }
+        meta_json = json.dumps(meta, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+        stream.write(f'{{\n  "meta": {meta_json},\n  "clippings": [')
 
-        # Convert Clipping objects to dictionaries
-        data_list = []
+        encode = json.JSONEncoder(indent=2, ensure_ascii=False).encode
+        separator = "\n    "
         for clip in clippings:
-            item = {
-                "book_title": clip.book_title,
-                "author": clip.author,
-                "content": clip.content,
-                "type": clip.entry_type,
-                "date_time": clip.date_time.isoformat() if clip.date_time else None,
-                "page": clip.page,
-                "location": clip.location,
-                "tags": list(clip.tags),
-                # Include raw boolean indicating if it was flagged as dupe
-                "is_duplicate": clip.is_duplicate,
-                "source": "kindle",
-            }
-            data_list.append(item)
-
-        export_data = {
-            "meta": {
-                "count": len(data_list),
-                "generated_at": context.get("generated_at", None),
-                "creator": context.get("creator", "System"),
-                "source": "KindleClippingsToJEX",
-            },
-            "clippings": data_list,
-        }
-        return json.dumps(export_data, indent=2, ensure_ascii=False)
+            # JSON strings never contain raw newlines, so re-indenting by line is safe
+            stream.write(separator + encode(self.clipping_to_dict(clip)).replace("\n", "\n    "))
+            separator = ",\n    "
+
+        stream.write("]\n}" if separator == "\n    " else "\n  ]\n}")
+
+    def write_json_lines(self, clippings: Sequence[Clipping], stream: TextIO):
+        """Streams one compact JSON object per clipping, newline-terminated."""
+        encode = json.JSONEncoder(ensure_ascii=False).encode
+        for clip in clippings:
+            stream.write(encode(self.clipping_to_dict(clip)) + "\n")
 
     def export(
-        self, clippings: List[Clipping], output_file: str, context: Optional[Dict[str, Any]] = None
+        self,
+        clippings: Sequence[Clipping],
+        output_file: str,
+        context: Optional[Dict[str, Any]] = None,
     ):
         """
-        Writes a list of Clipping objects to a JSON file.
+        Writes a list of Clipping objects to a JSON (or JSON Lines) file.
         """
-        # Ensure output filename ends with .json
-        if not output_file.lower().endswith(".json"):
-            output_file += ".json"
+        # Ensure output filename ends with .json / .jsonl
+        extension = ".jsonl" if self.lines else ".json"
+        if not output_file.lower().endswith(extension):
+            output_file += extension
 
-        json_content = self.create_json_string(clippings, context)
+        reproducible = (context or {}).get("reproducible", False)
+        if reproducible:
+            clippings = self.reproducible_order(clippings)
 
         logger.info(f"Exporting {len(clippings)} clippings to {output_file}...")
 
         try:
             with open(output_file, "w", encoding="utf-8") as f:
-                f.write(json_content)
+                if self.lines:
+                    self.write_json_lines(clippings, f)
+                else:
+                    self.write_json(clippings, f, context)
         except Exception as e:
             raise IOError(f"Failed to write JSON file: {e}")
+
+        if reproducible:
+            self.write_digest(output_file)
@@ -1,18 +1,57 @@
-import zipfile
 import re
-from typing import List, Dict, Any, Optional
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Sequence, Deque, Dict, Any, List, Optional, Tuple
 from domain.models import Clipping
 from domain.constants import GENERATOR_STRING
-from exporters.base import BaseExporter
+from exporters.base import BaseExporter, reproducible_timestamp
+from exporters.directory_sync import DirectorySync
+from exporters.zip_writer import ZipStreamWriter, deflate_entry
+from services.identity_service import IdentityService
+
+# Per-process exporter used by the worker pool of the parallel export mode
+_worker_exporter: Optional["MarkdownExporter"] = None
+
+
+def _init_markdown_worker():
+    global _worker_exporter
+    _worker_exporter = MarkdownExporter()
+
+
+def _deflate_markdown_batch(clippings: List[Clipping]) -> List[Tuple[bytes, int, int]]:
+    """Worker entry point: renders and deflates the notes of a batch of clippings."""
+    exporter = _worker_exporter
+    assert exporter is not None, "Worker was not initialized"
+    return [exporter._deflate_markdown(clip) for clip in clippings]
 
 
 class MarkdownExporter(BaseExporter):
     """
     Handles the export of clippings to a ZIP file containing Markdown files with Yaml frontmatter.
     Standard format for Obsidian and other PKM tools.
+
+    Members are deflated before they are appended (see exporters.zip_writer). With
+    context["workers"] > 1, rendering and compression run in a process pool while
+    this process writes the members in order; the archive is the same either way.
+
+    With directory=True, the same AUTHOR/Book/Note.md tree is synced into the output
+    directory instead (see exporters.directory_sync): only changed notes are rewritten
+    and notes that are no longer exported are removed. context["fsync_batch"] > 0
+    flushes written notes to disk that many at a time, and notes edited in the directory
+    since the last sync are only overwritten or removed with context["force"].
     """
 
-    def create_clipboard_markdown(self, clippings: List[Clipping]) -> str:
+    # Clippings sent to a worker at a time in parallel mode
+    RENDER_BATCH_SIZE = 500
+
+    def __init__(self, directory: bool = False):
+        self.directory = directory
+        # Written/unchanged/removed/kept counts of the last directory sync
+        self.sync_stats: Dict[str, int] = {}
+        # Sanitized folder names by author/book title; a library only has a few hundred
+        self._folder_names: Dict[str, str] = {}
+
+    def create_clipboard_markdown(self, clippings: Sequence[Clipping]) -> str:
         """
         Generates a simplified Markdown string for clipboard copy/paste.
         Format: > Content (Citation)
@@ -36,45 +75,147 @@ class MarkdownExporter(BaseExporter):
         return "\n\n---\n\n".join(output)
 
     def export(
-        self, clippings: List[Clipping], output_file: str, context: Optional[Dict[str, Any]] = None
+        self,
+        clippings: Sequence[Clipping],
+        output_file: str,
+        context: Optional[Dict[str, Any]] = None,
     ):
         """
         Writes a list of Clipping objects to a ZIP file containing .md files organized by folders.
         Structure: AUTHOR/Book/Note.md
+
+        With context["reproducible"], clippings are written in a stable order (which also
+        decides the clash suffixes) with a fixed date, permissions and host system, so
+        the same clippings always give the same ZIP.
         """
+        context = context or {}
+        reproducible = context.get("reproducible", False)
+        workers = context.get("workers", 1)
+
+        if self.directory:
+            self._export_to_directory(
+                clippings,
+                output_file,
+                context.get("fsync_batch", 0),
+                context.get("force", False),
+            )
+            return
+
         # Ensure output filename ends with .zip
         if not output_file.lower().endswith(".zip"):
             output_file += ".zip"
 
         try:
-            with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zipf:
-                for clipping in clippings:
-                    if clipping.is_duplicate:
-                        continue
+            writer_options: Dict[str, Any] = {}
+            if reproducible:
+                clippings = self.reproducible_order(clippings)
+                writer_options = {
+                    "date_time": reproducible_timestamp(clippings, context).timetuple()[:6],
+                    "create_system": 3,  # Unix, whatever the platform
+                    "external_attr": 0o644 << 16,
+                }
 
-                    # Clean paths - Author uppercase (Folder Only)
-                    author_folder = self._sanitize_filename(clipping.author.upper())
-                    book_folder = self._sanitize_filename(clipping.book_title)
-                    filename = self._generate_filename(clipping)
-
-                    # Construct full path inside ZIP
-                    full_path = f"{author_folder}/{book_folder}/{filename}"
-
-                    content = self._generate_markdown_content(clipping)
-                    zipf.writestr(full_path, content)
+            entries = self._entry_paths(clippings)
+            with open(output_file, "wb") as f, ZipStreamWriter(f, **writer_options) as writer:
+                if workers > 1:
+                    self._export_parallel(entries, writer, workers)
+                else:
+                    for full_path, clipping in entries:
+                        writer.add(full_path, *self._deflate_markdown(clipping))
 
         except Exception as e:
             raise IOError(f"Failed to create Markdown/ZIP archive: {e}")
 
+        if reproducible:
+            self.write_digest(output_file)
+
+    def _entry_paths(self, clippings: Sequence[Clipping]) -> List[Tuple[str, Clipping]]:
+        """
+        (path inside the ZIP, clipping) of every non-duplicate clipping.
+        Paths that clash (compared case-insensitively, as on Windows and macOS) get a
+        " (2)", " (3)"... suffix in clipping order.
+        """
+        entries = []
+        used: Dict[str, int] = {}
+        for clipping in clippings:
+            if clipping.is_duplicate:
+                continue
+
+            # Clean paths - Author uppercase (Folder Only)
+            author_folder = self._folder_name(clipping.author.upper())
+            book_folder = self._folder_name(clipping.book_title)
+            filename = self._generate_filename(clipping)
+
+            # Construct full path inside ZIP
+            full_path = f"{author_folder}/{book_folder}/{filename}"
+            key = full_path.casefold()
+            clashes = used.get(key, 0)
+            used[key] = clashes + 1
+            if clashes:
+                full_path = f"{full_path[: -len('.md')]} ({clashes + 1}).md"
+            entries.append((full_path, clipping))
+        return entries
+
+    def _export_to_directory(
+        self, clippings: Sequence[Clipping], target_dir: str, fsync_batch: int, force: bool
+    ):
+        entries = (
+            (full_path, self._generate_markdown_content(clipping).encode("utf-8"))
+            for full_path, clipping in self._entry_paths(clippings)
+        )
+        try:
+            self.sync_stats = DirectorySync(target_dir, fsync_batch, force).sync(entries)
+        except OSError as e:
+            raise IOError(f"Failed to sync Markdown notes to {target_dir}: {e}")
+
+    def _folder_name(self, text: str) -> str:
+        name = self._folder_names.get(text)
+        if name is None:
+            name = self._folder_names[text] = self._sanitize_filename(text)
+        return name
+
+    def _deflate_markdown(self, clipping: Clipping) -> Tuple[bytes, int, int]:
+        return deflate_entry(self._generate_markdown_content(clipping).encode("utf-8"))
+
+    def _export_parallel(
+        self, entries: List[Tuple[str, Clipping]], writer: ZipStreamWriter, workers: int
+    ):
+        """Deflates batches in a process pool and appends them in submission order."""
+        pending: Deque[Tuple[List[str], Future]] = deque()
+
+        def flush_oldest():
+            paths, future = pending.popleft()
+            for full_path, member in zip(paths, future.result()):
+                writer.add(full_path, *member)
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_markdown_worker) as pool:
+            for start in range(0, len(entries), self.RENDER_BATCH_SIZE):
+                batch = entries[start : start + self.RENDER_BATCH_SIZE]
+                paths = [full_path for full_path, _ in batch]
+                clippings = [clipping for _, clipping in batch]
+                pending.append((paths, pool.submit(_deflate_markdown_batch, clippings)))
+                # Keep a bounded number of batches in flight
+                if len(pending) >= workers * 2:
+                    flush_oldest()
+
+            while pending:
+                flush_oldest()
+
     # Alias for legacy compatibility
     def export_clippings(
-        self, clippings: List[Clipping], output_file: str, context: Optional[Dict[str, Any]] = None
+        self,
+        clippings: Sequence[Clipping],
+        output_file: str,
+        context: Optional[Dict[str, Any]] = None,
     ):
         self.export(clippings, output_file, context)
 
     def _generate_filename(self, clipping: Clipping) -> str:
         """
         Generates a sanitized, unique filename for the note.
+        The suffix hashes where the clipping sits in its book folder (location, page, type
+        and date) rather than its text, so the same clipping gets the same name on every
+        export, even after its content is edited.
         """
         date_str = clipping.date_time.strftime("%Y%m%d%H%M%S") if clipping.date_time else "000000"
 
@@ -84,10 +225,14 @@ class MarkdownExporter(BaseExporter):
         elif clipping.location:
             prefix = f"Loc {clipping.location}"
 
-        content_hash = hash(clipping.content) % 10000
+        # Not cached: every clipping has its own seed
+        identity = IdentityService.entity_id(
+            f"md:{clipping.location}|{clipping.page}|{clipping.entry_type}|{date_str}",
+            cache=False,
+        )
 
         sanitized_prefix = self._sanitize_filename(prefix)
-        return f"{sanitized_prefix} - {date_str}_{content_hash:04d}.md"
+        return f"{sanitized_prefix} - {date_str}_{identity[:8]}.md"
 
     def _sanitize_filename(self, text: str) -> str:
         """
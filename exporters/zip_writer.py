@@ -0,0 +1,229 @@
+import struct
+import sys
+import time
+import zlib
+from dataclasses import dataclass
+from typing import BinaryIO, List, Optional, Tuple
+
+DateTime = Tuple[int, int, int, int, int, int]
+
+# Record layouts of the ZIP format (APPNOTE.TXT), kept here rather than taken from
+# zipfile's module internals, which are not a public API
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_CENTRAL_DIR = struct.Struct("<4s4B4HL2L5H2L")
+_END_ARCHIVE = struct.Struct("<4s4H2LH")
+_END_ARCHIVE64 = struct.Struct("<4sQ2H2L4Q")
+_END_ARCHIVE64_LOCATOR = struct.Struct("<4sLQL")
+_ZIP64_EXTRA = struct.Struct("<HHQQ")
+
+_LOCAL_HEADER_SIGNATURE = b"PK\003\004"
+_CENTRAL_DIR_SIGNATURE = b"PK\001\002"
+_END_ARCHIVE_SIGNATURE = b"PK\005\006"
+_END_ARCHIVE64_SIGNATURE = b"PK\006\006"
+_END_ARCHIVE64_LOCATOR_SIGNATURE = b"PK\006\007"
+
+ZIP64_LIMIT = (1 << 31) - 1
+ZIP_FILECOUNT_LIMIT = (1 << 16) - 1
+
+_DEFLATED = 8
+_DEFAULT_VERSION = 20
+_ZIP64_VERSION = 45
+_UTF8_FILENAME_FLAG = 0x800
+# "Made by" system of ZipFile.writestr(): MS-DOS on Windows, Unix elsewhere
+_DEFAULT_SYSTEM = 0 if sys.platform == "win32" else 3
+
+
+@dataclass
+class _Member:
+    filename: bytes
+    flag_bits: int
+    version: int
+    dostime: int
+    dosdate: int
+    crc: int
+    compress_size: int
+    file_size: int
+    header_offset: int
+
+
+def deflate_entry(data: bytes, level: int = zlib.Z_DEFAULT_COMPRESSION) -> Tuple[bytes, int, int]:
+    """
+    Compresses one member the way ZipFile(..., ZIP_DEFLATED) does (raw deflate stream).
+    Returns (compressed bytes, CRC-32, uncompressed size), ready for ZipStreamWriter.add().
+    Safe to call in worker processes.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(), zlib.crc32(data), len(data)
+
+
+class ZipStreamWriter:
+    """
+    Writes a ZIP archive from members that were deflated in advance, so compression can
+    run anywhere (e.g. a process pool) while members are appended in order.
+
+    Headers, the central directory and the ZIP64 end records are laid out as
+    ZipFile.writestr() and ZipFile.close() write them: for the same members, the
+    archive is byte-identical to ZipFile.writestr() with ZIP_DEFLATED.
+    """
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        date_time: Optional[DateTime] = None,
+        create_system: Optional[int] = None,
+        external_attr: int = 0o600 << 16,
+    ):
+        self.fileobj = fileobj
+        # Like writestr(name, ...): local time, rw------- permissions
+        self.date_time = date_time or time.localtime(time.time())[:6]
+        self.create_system = _DEFAULT_SYSTEM if create_system is None else create_system
+        self.external_attr = external_attr
+        self.members: List[_Member] = []
+        self.offset = 0
+        self.closed = False
+
+    def add(self, name: str, compressed: bytes, crc: int, size: int):
+        """Appends a member deflated with deflate_entry()."""
+        try:
+            filename, flag_bits = name.encode("ascii"), 0
+        except UnicodeEncodeError:
+            filename, flag_bits = name.encode("utf-8"), _UTF8_FILENAME_FLAG
+        dt = self.date_time
+        member = _Member(
+            filename=filename,
+            flag_bits=flag_bits,
+            version=_DEFAULT_VERSION,
+            dostime=dt[3] << 11 | dt[4] << 5 | (dt[5] // 2),
+            dosdate=(dt[0] - 1980) << 9 | dt[1] << 5 | dt[2],
+            crc=crc,
+            compress_size=len(compressed),
+            file_size=size,
+            header_offset=self.offset,
+        )
+
+        # Sizes go to a ZIP64 extra field when the member may not fit in 32 bits
+        extra = b""
+        compress_size, file_size = member.compress_size, member.file_size
+        if size * 1.05 > ZIP64_LIMIT:
+            extra = _ZIP64_EXTRA.pack(1, _ZIP64_EXTRA.size - 4, file_size, compress_size)
+            compress_size = file_size = 0xFFFFFFFF
+            member.version = _ZIP64_VERSION
+
+        header = _LOCAL_HEADER.pack(
+            _LOCAL_HEADER_SIGNATURE,
+            member.version,
+            0,
+            flag_bits,
+            _DEFLATED,
+            member.dostime,
+            member.dosdate,
+            crc,
+            compress_size,
+            file_size,
+            len(filename),
+            len(extra),
+        )
+        self._write(header + filename + extra)
+        self._write(compressed)
+        self.members.append(member)
+
+    def close(self):
+        """Writes the central directory and the end-of-archive records."""
+        if self.closed:
+            return
+        self.closed = True
+        start_dir = self.offset
+
+        for member in self.members:
+            extra = []
+            file_size, compress_size = member.file_size, member.compress_size
+            if file_size > ZIP64_LIMIT or compress_size > ZIP64_LIMIT:
+                extra += [file_size, compress_size]
+                file_size = compress_size = 0xFFFFFFFF
+            header_offset = member.header_offset
+            if header_offset > ZIP64_LIMIT:
+                extra.append(header_offset)
+                header_offset = 0xFFFFFFFF
+
+            extra_data = b""
+            version = member.version
+            if extra:
+                extra_data = struct.pack("<HH" + "Q" * len(extra), 1, 8 * len(extra), *extra)
+                version = _ZIP64_VERSION
+
+            centdir = _CENTRAL_DIR.pack(
+                _CENTRAL_DIR_SIGNATURE,
+                version,
+                self.create_system,
+                version,
+                0,
+                member.flag_bits,
+                _DEFLATED,
+                member.dostime,
+                member.dosdate,
+                member.crc,
+                compress_size,
+                file_size,
+                len(member.filename),
+                len(extra_data),
+                0,
+                0,
+                0,
+                self.external_attr,
+                header_offset,
+            )
+            self._write(centdir + member.filename + extra_data)
+
+        end_dir = self.offset
+        count = len(self.members)
+        size = end_dir - start_dir
+        if count > ZIP_FILECOUNT_LIMIT or start_dir > ZIP64_LIMIT or size > ZIP64_LIMIT:
+            self._write(
+                _END_ARCHIVE64.pack(
+                    _END_ARCHIVE64_SIGNATURE,
+                    44,
+                    45,
+                    45,
+                    0,
+                    0,
+                    count,
+                    count,
+                    size,
+                    start_dir,
+                )
+            )
+            self._write(
+                _END_ARCHIVE64_LOCATOR.pack(
+                    _END_ARCHIVE64_LOCATOR_SIGNATURE,
+                    0,
+                    end_dir,
+                    1,
+                )
+            )
+            count = min(count, 0xFFFF)
+            size = min(size, 0xFFFFFFFF)
+            start_dir = min(start_dir, 0xFFFFFFFF)
+
+        self._write(
+            _END_ARCHIVE.pack(
+                _END_ARCHIVE_SIGNATURE,
+                0,
+                0,
+                count,
+                count,
+                size,
+                start_dir,
+                0,
+            )
+        )
+
+    def _write(self, data: bytes):
+        self.fileobj.write(data)
+        self.offset += len(data)
+
+    def __enter__(self) -> "ZipStreamWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
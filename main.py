@@ -1,5 +1,6 @@
 import sys
 import os
+import multiprocessing
 
 # Ensure project root is in path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -34,4 +35,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Frozen (PyInstaller) Windows builds: worker processes run their task, not the app
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,120 @@
+"""
+Byte-offset checkpoints for incremental re-parsing of 'My Clippings.txt'.
+
+The Kindle only ever appends to the clippings file. A checkpoint remembers how far
+the file was parsed (the offset just past the last complete separator), a hash of
+those bytes and the clippings found in them, so the next run only parses the tail.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from domain.models import Clipping
+
+logger = logging.getLogger("KindleToJex.Checkpoint")
+
+# Bump whenever parsing changes what a block turns into, so old checkpoints are ignored
+CHECKPOINT_VERSION = 2
+
+
+@dataclass
+class ParseCheckpoint:
+    """
+    State of a previous parse of one clippings file.
+
+    Attributes:
+        file_path (str): Absolute path of the parsed file.
+        file_size (int): Size of the file when it was parsed.
+        offset (int): Byte offset just past the last complete separator.
+        prefix_hash (str): SHA-256 of the bytes before `offset`.
+        encoding (str): Encoding the file was decoded with.
+        separator (str): Block separator used.
+        patterns (Dict[str, Any]): Language patterns the blocks were parsed with.
+        clippings (List[Clipping]): Highlights and notes of the prefix, before note linking.
+        stats (Dict[str, Any]): Parser stats for the prefix.
+        version (int): CHECKPOINT_VERSION of the parser that wrote it.
+    """
+
+    file_path: str
+    file_size: int
+    offset: int
+    prefix_hash: str
+    encoding: str
+    separator: str
+    patterns: Dict[str, Any]
+    clippings: List[Clipping] = field(default_factory=list)
+    stats: Dict[str, Any] = field(default_factory=dict)
+    version: int = CHECKPOINT_VERSION
+
+
+def hash_prefix(file_path: str, length: int, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of the first `length` bytes of a file."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest.hexdigest()
+
+
+class CheckpointStore:
+    """
+    Persists one checkpoint per clippings file in a directory (pickle files).
+    Unreadable or outdated checkpoints are treated as missing. Loading a pickle runs
+    code from it, which is why incremental parsing is opt-in (incremental_parse).
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path_for(self, file_path: str) -> str:
+        key = hashlib.sha256(os.path.abspath(file_path).encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.directory, f"checkpoint_{key}.pkl")
+
+    def load(self, file_path: str) -> Optional[ParseCheckpoint]:
+        path = self._path_for(file_path)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                checkpoint = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+            return None
+
+        if not isinstance(checkpoint, ParseCheckpoint) or checkpoint.version != CHECKPOINT_VERSION:
+            logger.info(f"Ignoring outdated checkpoint {path}")
+            return None
+        return checkpoint
+
+    def save(self, checkpoint: ParseCheckpoint):
+        path = self._path_for(checkpoint.file_path)
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # Replace atomically so a crash never leaves a truncated checkpoint
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error(f"Failed to save checkpoint {path}: {e}")
+
+    def clear(self, file_path: str):
+        path = self._path_for(file_path)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def clear_all(self):
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.startswith("checkpoint_"):
+                os.remove(os.path.join(self.directory, name))
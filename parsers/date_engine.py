@@ -0,0 +1,146 @@
+"""
+Date parsing for the 'Added on ...' part of Kindle metadata lines.
+
+Kindle only emits a handful of date layouts per language, so most strings are
+resolved by strict strptime-style fast paths compiled from languages.json.
+Results are memoized per raw string and dateparser is only the last fallback.
+"""
+
+import re
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+import dateparser
+
+logger = logging.getLogger("KindleToJex.DateEngine")
+
+# Regex fragments for the strptime-style directives supported in "date_formats".
+# %B is built per language from its "months" list.
+DIRECTIVES = {
+    # Weekday name (not validated, the date is); pt has hyphenated ones ("segunda-feira")
+    "%A": r"[^\W\d_]+(?:-[^\W\d_]+)*",
+    "%d": r"(?P<day>\d{1,2})",
+    "%Y": r"(?P<year>\d{4})",
+    "%H": r"(?P<hour>\d{1,2})",
+    "%I": r"(?P<hour12>\d{1,2})",
+    "%M": r"(?P<minute>\d{2})",
+    "%S": r"(?P<second>\d{2})",
+    "%p": r"(?P<ampm>AM|PM)",
+}
+
+_FORMAT_TOKENS = re.compile(r"%[A-Za-z]|\s+|,|[^%\s,]+")
+
+
+def compile_date_format(date_format: str, month_pattern: str) -> Pattern:
+    """
+    Translates a strptime-style format (e.g. "%A, %B %d, %Y %I:%M:%S %p") into a strict regex.
+    Commas are optional and whitespace may be preceded by a comma, since Kindle
+    firmwares are not consistent about them.
+    """
+    parts = []
+    for token in _FORMAT_TOKENS.findall(date_format):
+        if token == "%B":
+            parts.append(f"(?P<month>{month_pattern})")
+        elif token in DIRECTIVES:
+            parts.append(DIRECTIVES[token])
+        elif token.startswith("%"):
+            raise ValueError(f"Unsupported date directive '{token}' in '{date_format}'")
+        elif token.isspace():
+            parts.append(r",?\s+")
+        elif token == ",":
+            parts.append(",?")
+        else:
+            parts.append(re.escape(token))
+    return re.compile("".join(parts), re.IGNORECASE)
+
+
+class DateEngine:
+    """
+    Resolves Kindle date strings: LRU memo -> per-language fast paths -> dateparser.
+    """
+
+    CACHE_SIZE = 4096
+
+    def __init__(self, patterns: Optional[Dict[str, Any]] = None):
+        self._patterns: Optional[Dict[str, Any]] = None
+        self._cache: "OrderedDict[str, Optional[datetime]]" = OrderedDict()
+        self.months: Dict[str, int] = {}
+        self.formats: List[Pattern] = []
+        self.set_patterns(patterns or {})
+
+    def set_patterns(self, patterns: Dict[str, Any]):
+        """
+        Builds the fast paths from a language entry of languages.json.
+        Languages without "months"/"date_formats" always use dateparser.
+        """
+        if patterns is self._patterns:
+            return
+        self._patterns = patterns
+        self._cache.clear()
+
+        # Each month entry may list alternative spellings: "septiembre|setiembre"
+        self.months = {}
+        for number, entry in enumerate(patterns.get("months", []), start=1):
+            for name in entry.split("|"):
+                self.months[name.lower()] = number
+
+        self.formats = []
+        if self.months:
+            names = sorted(self.months, key=len, reverse=True)
+            month_pattern = "|".join(re.escape(name) for name in names)
+            self.formats = [
+                compile_date_format(fmt, month_pattern) for fmt in patterns.get("date_formats", [])
+            ]
+
+    def parse(self, date_str: str) -> Tuple[Optional[datetime], str]:
+        """
+        Parses a date string.
+        Returns the datetime (or None) and how it was resolved:
+        'cached', 'fast_path', 'fallback' or 'failed'.
+        """
+        if date_str in self._cache:
+            self._cache.move_to_end(date_str)
+            return self._cache[date_str], "cached"
+
+        date_obj = self._parse_fast(date_str)
+        source = "fast_path"
+        if date_obj is None:
+            date_obj = dateparser.parse(date_str)
+            source = "fallback" if date_obj else "failed"
+
+        self._cache[date_str] = date_obj
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+        return date_obj, source
+
+    def _parse_fast(self, date_str: str) -> Optional[datetime]:
+        text = date_str.strip()
+        for regex in self.formats:
+            match = regex.fullmatch(text)
+            if not match:
+                continue
+
+            fields = match.groupdict()
+            hour = int(fields.get("hour") or 0)
+            if fields.get("hour12"):
+                # 12 AM is midnight, 12 PM is noon
+                hour = int(fields["hour12"]) % 12
+                if fields["ampm"].upper() == "PM":
+                    hour += 12
+
+            try:
+                return datetime(
+                    int(fields["year"]),
+                    self.months[fields["month"].lower()],
+                    int(fields["day"]),
+                    hour,
+                    int(fields.get("minute") or 0),
+                    int(fields.get("second") or 0),
+                )
+            except ValueError:
+                # Impossible date (e.g. February 30): let dateparser decide
+                continue
+
+        return None
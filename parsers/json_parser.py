@@ -0,0 +1,154 @@
+"""
+Streaming reader for the JSON and JSON Lines files written by JsonExporter.
+
+Clippings are decoded one object at a time from a bounded buffer, so exports of any
+size can be read back without loading the whole document.
+"""
+
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, TextIO
+from domain.models import Clipping
+
+logger = logging.getLogger("KindleToJex.JsonParser")
+
+_WHITESPACE = " \t\r\n"
+
+
+def clipping_from_dict(item: Dict[str, Any]) -> Clipping:
+    """Inverse of JsonExporter.clipping_to_dict."""
+    date_time = item.get("date_time")
+    return Clipping(
+        content=item.get("content", ""),
+        book_title=item.get("book_title", ""),
+        author=item.get("author", ""),
+        date_time=datetime.fromisoformat(date_time) if date_time else None,
+        location=item.get("location", ""),
+        page=item.get("page", ""),
+        entry_type=item.get("type", "highlight"),
+        tags=tuple(item.get("tags") or ()),
+        is_duplicate=bool(item.get("is_duplicate", False)),
+    )
+
+
+class JsonClippingsReader:
+    """
+    Iterates the clippings of a JSON export ({"meta": ..., "clippings": [...]}) or of a
+    JSON Lines file (one clipping object per line). The format is detected from the
+    content. For JSON documents, `meta` holds the top-level values other than the
+    clippings that were read so far (all of them once iteration is done).
+    """
+
+    def __init__(self, file_path: str, chunk_size: int = 1024 * 1024):
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.meta: Dict[str, Any] = {}
+        self._decoder = json.JSONDecoder()
+
+    def __iter__(self) -> Iterator[Clipping]:
+        with open(self.file_path, "r", encoding="utf-8-sig") as f:
+            first_line = f.readline()
+            f.seek(0)
+            if self._is_json_lines(first_line):
+                yield from self._iter_lines(f)
+            else:
+                yield from self._iter_document(f)
+
+    @staticmethod
+    def _is_json_lines(first_line: str) -> bool:
+        try:
+            value = json.loads(first_line)
+        except ValueError:
+            return False
+        return isinstance(value, dict) and "content" in value
+
+    def _iter_lines(self, f: TextIO) -> Iterator[Clipping]:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield clipping_from_dict(json.loads(line))
+            except ValueError as e:
+                raise ValueError(f"{self.file_path}:{line_number}: invalid clipping: {e}")
+
+    # --- Incremental decoding of a JSON document ---
+
+    def _iter_document(self, f: TextIO) -> Iterator[Clipping]:
+        self._file = f
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+        self._expect("{")
+        if self._peek() == "}":
+            return
+        while True:
+            key = self._decode_value()
+            self._expect(":")
+            if key == "clippings":
+                yield from self._iter_array()
+            else:
+                self.meta[key] = self._decode_value()
+            if self._next_char() == "}":
+                return
+            # Otherwise a "," before the next key
+
+    def _iter_array(self) -> Iterator[Clipping]:
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield clipping_from_dict(self._decode_value())
+            if self._next_char() == "]":
+                return
+
+    def _decode_value(self) -> Any:
+        """Decodes the next value, reading more of the file until it is complete."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                self._fill()
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and not self._eof:
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+    def _peek(self) -> Optional[str]:
+        """Skips whitespace; returns the next character without consuming it."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if self._eof:
+                return None
+            self._fill()
+
+    def _next_char(self) -> Optional[str]:
+        char = self._peek()
+        self._pos += 1
+        return char
+
+    def _expect(self, expected: str):
+        char = self._next_char()
+        if char != expected:
+            raise ValueError(f"{self.file_path}: expected '{expected}', found {char!r}")
+
+    def _fill(self):
+        # Drop what was consumed so the buffer only holds the value being decoded
+        self._buffer = self._buffer[self._pos :]
+        self._pos = 0
+        chunk = self._file.read(self.chunk_size)
+        if chunk:
+            self._buffer += chunk
+        else:
+            self._eof = True
@@ -1,35 +1,90 @@
 import re
-import dateparser
+import codecs
+import heapq
 import json
 import os
 import logging
-from typing import List, Dict, Optional, Tuple, Any
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import List, Dict, Optional, Tuple, Any, Iterable, Iterator, Deque
 from domain.models import Clipping
-from parsers.patterns import DEFAULT_PATTERNS
+from parsers.patterns import (
+    DEFAULT_PATTERNS,
+    BOOK_HEADER_RE,
+    HYPHENATED_BREAK_RE,
+    CompiledPatterns,
+)
+from parsers.date_engine import DateEngine
+from parsers.checkpoint import CheckpointStore, ParseCheckpoint, hash_prefix
 from utils.text_cleaner import TextCleaner
 from utils.title_cleaner import TitleCleaner
 from services.identity_service import IdentityService
 
 logger = logging.getLogger("KindleToJex.Parser")
 
+# Per-process parser used by the worker pool of parse_file(workers=N)
+_worker_parser: Optional["KindleClippingsParser"] = None
+
+
+def _init_worker(separator: str, language_file: Optional[str], patterns: Dict[str, Any]):
+    global _worker_parser
+    _worker_parser = KindleClippingsParser(
+        separator=separator, language_code="auto", language_file=language_file
+    )
+    _worker_parser._apply_patterns(patterns)
+
+
+def _parse_block_batch(blocks: List[str]) -> Tuple[List[Clipping], Dict[str, Any]]:
+    """Worker entry point: parses a batch of raw blocks and returns them with their stats."""
+    parser = _worker_parser
+    assert parser is not None, "Worker was not initialized"
+    parser._reset_stats()
+    clippings = [clipping for clipping in map(parser._build_clipping, blocks) if clipping]
+    return clippings, parser.stats
+
 
 class KindleClippingsParser:
     """
     Parses 'My Clippings.txt' files from Kindle devices.
     """
 
+    # Encodings to try in order of likelihood
+    ENCODINGS = ["utf-8-sig", "utf-8", "cp1252", "latin-1"]
+
+    # Bytes read per step by the streaming iterator
+    CHUNK_SIZE = 64 * 1024
+
+    # Raw blocks sent to a worker at a time when parsing in parallel
+    BATCH_SIZE = 1000
+
+    # Bump whenever a change alters parse results, so cached results are invalidated
+    VERSION = 2
+
     def __init__(self, separator="==========", language_code="es", language_file=None):
         self.separator = separator
         self.language_code = language_code
         self.language_file = language_file
+        self.date_engine = DateEngine()
+        self.patterns: Dict[str, Any] = {}
         self._load_language_patterns()
-        self.stats: Dict[str, Any] = {
+        self.stats: Dict[str, Any] = {}
+        self._reset_stats()
+        self._separator_end = 0
+
+    def _reset_stats(self):
+        self.stats = {
             "total": 0,
             "parsed": 0,
             "skipped": 0,
             "failed_blocks": [],
             "titles_cleaned": 0,
             "title_changes": [],
+            "pdfs_cleaned": 0,
+            "dates_fast_path": 0,
+            "dates_cached": 0,
+            "dates_fallback": 0,
+            "dates_failed": 0,
         }
 
     def _load_language_patterns(self):
@@ -45,7 +100,7 @@ class KindleClippingsParser:
         # Default fallback patterns (Spanish)
         # Use imported constant as default
         self.default_patterns = DEFAULT_PATTERNS
-        self.patterns = self.default_patterns
+        self._apply_patterns(self.default_patterns)
 
         self.available_languages = {}
         if os.path.exists(lang_file):
@@ -59,11 +114,19 @@ class KindleClippingsParser:
 
         if self.language_code != "auto":
             if self.language_code in self.available_languages:
-                self.patterns = self.available_languages[self.language_code]
+                self._apply_patterns(self.available_languages[self.language_code])
                 logger.info(f"Loaded patterns for language: {self.language_code}")
             else:
                 logger.warning(f"Language '{self.language_code}' not found. Using defaults.")
 
+    def _apply_patterns(self, patterns: Dict[str, Any]):
+        """Switches the active language, compiling its regexes and date fast paths once."""
+        if patterns is self.patterns:
+            return
+        self.patterns = patterns
+        self.compiled = CompiledPatterns(patterns)
+        self.date_engine.set_patterns(patterns)
+
     def _detect_language(self, content: str) -> str:
         """Attempts to detect language by checking patterns against file content."""
         logger.info("Attempting robust auto-detection of language...")
@@ -99,106 +162,339 @@ class KindleClippingsParser:
     def get_stats(self):
         return self.stats
 
-    def parse_file(self, file_path: str, encoding: Optional[str] = None) -> List[Clipping]:
+    def parse_file(
+        self,
+        file_path: str,
+        encoding: Optional[str] = None,
+        workers: int = 1,
+        checkpoints: Optional[CheckpointStore] = None,
+    ) -> List[Clipping]:
+        """
+        Parses the whole file and returns its highlights, with notes linked as tags.
+        With workers > 1, blocks are parsed by a pool of processes.
+        With a checkpoint store, only the part appended since the previous parse is read.
+        """
+        highlights: List[Clipping] = []
+        notes: List[Clipping] = []
+
+        if checkpoints is not None:
+            parsed: Iterable[Clipping] = self._parse_incremental(
+                file_path, encoding, workers, checkpoints
+            )
+        else:
+            parsed = self.iter_clippings(file_path, encoding, workers=workers)
+
+        # Pass 1: Collect Highlights and Notes separately
+        for clipping in parsed:
+            if clipping.entry_type == "highlight":
+                highlights.append(clipping)
+            else:
+                notes.append(clipping)
+
+        # Pass 2: Link Notes to Highlights
+        self._link_notes_to_highlights(highlights, notes)
+
+        logger.info(f"Parsing Stats: {self.stats}")
+        return highlights
+
+    def iter_clippings(
+        self, file_path: str, encoding: Optional[str] = None, workers: int = 1
+    ) -> Iterator[Clipping]:
+        """
+        Streams the file and yields one Clipping per block, as soon as its separator is read.
+
+        Memory stays bounded by the largest single block rather than the file size.
+        Notes are yielded as 'note' clippings: linking them to their highlights needs
+        the whole book, which is what parse_file() does on top of this iterator.
+
+        With workers > 1, batches of blocks are parsed in a process pool and yielded
+        in file order; only a few batches per worker are in flight at any time.
         """
-        Parses parsing with robust encoding handling.
+        logger.info(f"Parsing file: {file_path}")
+        self._reset_stats()
+
+        if not os.path.exists(file_path):
+            logger.error(f"File not found: {file_path}")
+            return
+
+        enc = self._detect_encoding(file_path, encoding)
+        if enc is None:
+            return
+
+        self._auto_detect_language(file_path, enc)
+        yield from self._parse_blocks(self._iter_raw_blocks(file_path, enc), workers)
+
+    def _auto_detect_language(self, file_path: str, encoding: str):
+        """Applies the patterns of the detected language if the parser is in 'auto' mode."""
+        if self.language_code == "auto":
+            detected_lang = self._detect_language(self._read_sample(file_path, encoding))
+            if detected_lang in self.available_languages:
+                self._apply_patterns(self.available_languages[detected_lang])
+            else:
+                self._apply_patterns(self.default_patterns)
+
+    def _parse_blocks(self, blocks: Iterator[str], workers: int) -> Iterator[Clipping]:
+        if workers > 1:
+            yield from self._parse_blocks_parallel(blocks, workers)
+            return
+
+        for raw in blocks:
+            clipping = self._build_clipping(raw)
+            if clipping:
+                yield clipping
+
+    def _parse_incremental(
+        self,
+        file_path: str,
+        encoding: Optional[str],
+        workers: int,
+        checkpoints: CheckpointStore,
+    ) -> List[Clipping]:
+        """
+        Parses only the bytes appended since the stored checkpoint and merges them with
+        the clippings it holds. Falls back to a full parse when the checkpoint does not
+        match the file anymore (edited or truncated prefix, other encoding or language).
+
+        A new checkpoint is saved at the last complete separator: the text after it may
+        still be a block being written, so it is parsed but left for the next run.
         """
         logger.info(f"Parsing file: {file_path}")
-        self.stats = {
-            "total": 0,
-            "parsed": 0,
-            "skipped": 0,
-            "failed_blocks": [],
-            "titles_cleaned": 0,
-            "title_changes": [],
-            "pdfs_cleaned": 0,
-        }
+        self._reset_stats()
 
         if not os.path.exists(file_path):
             logger.error(f"File not found: {file_path}")
             return []
 
-        # List of encodings to try in order of likelihood
-        encodings_to_try = ["utf-8-sig", "utf-8", "cp1252", "latin-1"]
+        enc = None
+        checkpoint = self._load_checkpoint(file_path, encoding, checkpoints)
+        if checkpoint:
+            # Only the tail needs to decode, the prefix did last time
+            enc = self._detect_encoding(file_path, checkpoint.encoding, start=checkpoint.offset)
+            if enc == checkpoint.encoding:
+                self._auto_detect_language(file_path, enc)
+            if enc != checkpoint.encoding or checkpoint.patterns != self.patterns:
+                logger.info("Checkpoint does not match the file anymore. Parsing whole file.")
+                checkpoint = None
+
+        clippings: List[Clipping] = []
+        start = 0
+        if checkpoint:
+            clippings = checkpoint.clippings
+            start = checkpoint.offset
+            self._merge_stats(checkpoint.stats)
+            logger.info(
+                f"Resuming from checkpoint at byte {start} ({len(clippings)} clippings cached)"
+            )
+        else:
+            enc = self._detect_encoding(file_path, encoding)
+            if enc is None:
+                return []
+            self._auto_detect_language(file_path, enc)
+
+        assert enc is not None
+        trailing: List[str] = []
+        blocks = self._iter_raw_blocks(file_path, enc, start=start)
+        clippings.extend(self._parse_blocks(self._hold_last(blocks, trailing), workers))
+
+        if not checkpoint or self._separator_end > checkpoint.offset:
+            checkpoints.save(
+                ParseCheckpoint(
+                    file_path=os.path.abspath(file_path),
+                    file_size=os.path.getsize(file_path),
+                    offset=self._separator_end,
+                    prefix_hash=hash_prefix(file_path, self._separator_end),
+                    encoding=enc,
+                    separator=self.separator,
+                    patterns=self.patterns,
+                    clippings=clippings,
+                    stats=self.stats,
+                )
+            )
+
+        for raw in trailing:
+            clipping = self._build_clipping(raw)
+            if clipping:
+                clippings.append(clipping)
+
+        return clippings
+
+    def _load_checkpoint(
+        self, file_path: str, encoding: Optional[str], checkpoints: CheckpointStore
+    ) -> Optional[ParseCheckpoint]:
+        """Returns the stored checkpoint if the file still starts with the bytes it covers."""
+        checkpoint = checkpoints.load(file_path)
+        if checkpoint is None:
+            return None
+
+        if (
+            checkpoint.separator != self.separator
+            or (encoding and encoding != checkpoint.encoding)
+            or os.path.getsize(file_path) < checkpoint.offset
+            or hash_prefix(file_path, checkpoint.offset) != checkpoint.prefix_hash
+        ):
+            logger.info("Checkpoint does not match the file anymore. Parsing whole file.")
+            return None
+
+        return checkpoint
+
+    @staticmethod
+    def _hold_last(blocks: Iterator[str], held: List[str]) -> Iterator[str]:
+        """Yields all blocks but the last one, which is appended to `held`."""
+        previous = None
+        for raw in blocks:
+            if previous is not None:
+                yield previous
+            previous = raw
+        if previous is not None:
+            held.append(previous)
+
+    def _parse_blocks_parallel(self, blocks: Iterator[str], workers: int) -> Iterator[Clipping]:
+        """Fans block batches out to a process pool, merging the per-worker stats."""
+        pending: Deque[Future] = deque()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.separator, self.language_file, self.patterns),
+        ) as pool:
+            while True:
+                # Keep a bounded number of batches in flight
+                while len(pending) < workers * 2:
+                    batch = list(islice(blocks, self.BATCH_SIZE))
+                    if not batch:
+                        break
+                    pending.append(pool.submit(_parse_block_batch, batch))
+
+                if not pending:
+                    break
+
+                clippings, stats = pending.popleft().result()
+                self._merge_stats(stats)
+                yield from clippings
+
+    def _merge_stats(self, other: Dict[str, Any]):
+        """Adds the stats of a worker batch to this parser's stats."""
+        for key, value in other.items():
+            if key == "title_changes":
+                for change in value:
+                    if change not in self.stats[key]:
+                        self.stats[key].append(change)
+            elif isinstance(value, list):
+                self.stats[key].extend(value)
+            else:
+                self.stats[key] = self.stats.get(key, 0) + value
+
+    def _detect_encoding(
+        self, file_path: str, encoding: Optional[str] = None, start: int = 0
+    ) -> Optional[str]:
+        """
+        Returns the first encoding able to decode the file from byte `start` on.
+        The file is streamed through an incremental decoder, so its content is never held.
+        """
+        encodings_to_try = list(self.ENCODINGS)
         if encoding:
             encodings_to_try.insert(0, encoding)
 
-        content = None
         for enc in encodings_to_try:
+            decoder = codecs.getincrementaldecoder(enc)()
             try:
-                with open(file_path, "r", encoding=enc) as f:
-                    content = f.read()
+                with open(file_path, "rb") as f:
+                    f.seek(start)
+                    while chunk := f.read(self.CHUNK_SIZE):
+                        decoder.decode(chunk)
+                    decoder.decode(b"", final=True)
                 logger.info(f"Successfully read file using encoding: {enc}")
-                break
+                return enc
             except UnicodeDecodeError:
                 continue
             except OSError as e:
                 logger.error(f"Error reading file {file_path}: {e}")
-                return []
+                return None
 
-        if content is None:
-            logger.error(f"Failed to decode file {file_path}. Tried encodings: {encodings_to_try}")
-            return []
+        logger.error(f"Failed to decode file {file_path}. Tried encodings: {encodings_to_try}")
+        return None
 
-        # Global Sanitation: Remove invisible characters that cause issues
+    @staticmethod
+    def _sanitize(text: str) -> str:
+        """Removes invisible characters that cause issues and normalizes line endings."""
         # \ufeff: BOM (Byte Order Mark)
         # \u200b: Zero Width Space
-        content = content.replace("\ufeff", "").replace("\u200b", "")
-
-        raw_clippings = content.split(self.separator)
-
-        # Auto-detect language if requested
-        if self.language_code == "auto":
-            detected_lang = self._detect_language(content)
-            if detected_lang in self.available_languages:
-                self.patterns = self.available_languages[detected_lang]
-            else:
-                self.patterns = self.default_patterns
-
-        parsed_clippings: List[Clipping] = []
-        notes_data: List[Dict] = []
-
-        # Pass 1: Collect Highlights and Notes separately
-        for raw in raw_clippings:
-            if not raw.strip():
-                continue
-
-            self.stats["total"] += 1
-            data = self._parse_single_clipping(raw)
+        text = text.replace("\ufeff", "").replace("\u200b", "")
+        # Same newline translation a text-mode read would do
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+
+    def _read_sample(self, file_path: str, encoding: str, size: int = 5000) -> str:
+        """Reads the first characters of the file (used for language detection)."""
+        decoder = codecs.getincrementaldecoder(encoding)()
+        with open(file_path, "rb") as f:
+            text = decoder.decode(f.read(self.CHUNK_SIZE))
+        return self._sanitize(text)[:size]
+
+    def _iter_raw_blocks(self, file_path: str, encoding: str, start: int = 0) -> Iterator[str]:
+        """
+        Yields the decoded text between separators, reading the file in binary chunks.
+        The separator is searched as encoded bytes, so only one block is decoded at a time.
 
-            if not data:
-                self.stats["skipped"] += 1
-                # Store first 50 chars of failed block for debugging
-                snippet = raw.strip().replace("\n", " ")[:500]
-                self.stats["failed_blocks"].append(snippet)
-                continue
+        Reading starts at byte `start`, which must be a block boundary. The offset just
+        past the last separator read is kept in self._separator_end.
+        """
+        encoder = codecs.getincrementalencoder(encoding)()
+        encoder.encode("")  # Emit any BOM so the separator is encoded alone
+        separator = encoder.encode(self.separator)
+        decoder = codecs.getincrementaldecoder(encoding)()
+
+        self._separator_end = start
+        buffer_offset = start  # File offset of buffer[0]
+        buffer = b""
+        with open(file_path, "rb") as f:
+            f.seek(start)
+            while chunk := f.read(self.CHUNK_SIZE):
+                # A separator may straddle the previous chunk boundary
+                search_from = max(0, len(buffer) - len(separator) + 1)
+                buffer += chunk
+                block_start = 0
+                while (idx := buffer.find(separator, search_from)) != -1:
+                    raw = self._sanitize(decoder.decode(buffer[block_start:idx]))
+                    decoder.decode(separator)
+                    block_start = search_from = idx + len(separator)
+                    self._separator_end = buffer_offset + block_start
+                    yield raw
+                buffer = buffer[block_start:]
+                buffer_offset += block_start
+
+        yield self._sanitize(decoder.decode(buffer, final=True))
+
+    def _build_clipping(self, raw: str) -> Optional[Clipping]:
+        """Parses one raw block into a Clipping, updating the stats."""
+        if not raw.strip():
+            return None
 
-            self.stats["parsed"] += 1
-
-            if data["type"] == "highlight":
-                clipping = Clipping(
-                    content=data["content"],
-                    book_title=data["book"],
-                    author=data["author"],
-                    date_time=data["date_time"],
-                    location=data["location"],
-                    page=data["page"],
-                    entry_type="highlight",
-                )
+        self.stats["total"] += 1
+        data = self._parse_single_clipping(raw)
 
-                # Generate Deterministic ID
-                clipping.uid = IdentityService.generate_id(clipping)
+        if not data:
+            self.stats["skipped"] += 1
+            # Store a snippet of the failed block for debugging
+            snippet = raw.strip().replace("\n", " ")[:500]
+            self.stats["failed_blocks"].append(snippet)
+            return None
 
-                parsed_clippings.append(clipping)
+        self.stats["parsed"] += 1
 
-            elif data["type"] == "note":
-                notes_data.append(data)
+        clipping = Clipping(
+            content=data["content"],
+            book_title=data["book"],
+            author=data["author"],
+            date_time=data["date_time"],
+            location=data["location"],
+            page=data["page"],
+            entry_type=data["type"],
+        )
 
-        # Pass 2: Link Notes to Highlights (Logic remains same)
-        self._link_notes_to_highlights(parsed_clippings, notes_data)
+        if clipping.entry_type == "highlight":
+            # Generate Deterministic ID
+            clipping.uid = IdentityService.generate_id(clipping)
 
-        logger.info(f"Parsing Stats: {self.stats}")
-        return parsed_clippings
+        return clipping
 
     @staticmethod
     def _parse_loc_range(loc_str: str) -> Tuple[int, int]:
@@ -210,36 +506,64 @@ class KindleClippingsParser:
         except Exception:
             return -1, -1
 
-    def _link_notes_to_highlights(self, highlights, notes):
-        highlights_by_book: Dict[str, List[Clipping]] = {}
-        for clip in highlights:
-            if clip.book_title not in highlights_by_book:
-                highlights_by_book[clip.book_title] = []
-            highlights_by_book[clip.book_title].append(clip)
-
-        for note in notes:
-            book_key = note["book"]
-            if book_key in highlights_by_book:
-                candidates = highlights_by_book[book_key]
-                note_start, _ = self._parse_loc_range(note["location"])
-
-                best_match = None
-                for h in candidates:
-                    h_start, h_end = self._parse_loc_range(h.location)
-                    if h_start <= note_start <= h_end:
-                        best_match = h
-                        break
+    def _link_notes_to_highlights(self, highlights: List[Clipping], notes: List[Clipping]):
+        """
+        Adds each note's content as tags of the first highlight (in file order)
+        whose location range covers the note's start location.
 
-                if best_match:
-                    raw_tags = re.split(r"[.,;\n\r]", note["content"])
-                    for raw_tag in raw_tags:
-                        tag_text = raw_tag.strip()
-                        if not tag_text:
-                            continue
-                        if not tag_text[0].isalnum():
-                            tag_text = tag_text[1:].strip()
-                        if tag_text and tag_text not in best_match.tags:
-                            best_match.tags.append(tag_text)
+        Ranges are parsed once. Per book, highlights sorted by start are swept against the
+        notes in location order: a highlight enters a heap keyed by file order once it starts
+        at or before the note, and leaves for good once it ends before it. Each note lookup
+        is therefore logarithmic instead of a scan over every highlight of the book.
+        """
+        # book -> [(start, end, highlight index)]
+        spans_by_book: Dict[str, List[Tuple[int, int, int]]] = {}
+        for index, clip in enumerate(highlights):
+            start, end = self._parse_loc_range(clip.location)
+            spans_by_book.setdefault(clip.book_title, []).append((start, end, index))
+
+        # book -> [(note start, note index)]
+        notes_by_book: Dict[str, List[Tuple[int, int]]] = {}
+        for note_index, note in enumerate(notes):
+            if note.book_title in spans_by_book:
+                note_start, _ = self._parse_loc_range(note.location)
+                notes_by_book.setdefault(note.book_title, []).append((note_start, note_index))
+
+        matches: Dict[int, Clipping] = {}
+        for book_key, book_notes in notes_by_book.items():
+            spans = sorted(spans_by_book[book_key])
+            active: List[Tuple[int, int]] = []  # heap of (highlight index, end)
+            next_span = 0
+
+            for note_start, note_index in sorted(book_notes):
+                while next_span < len(spans) and spans[next_span][0] <= note_start:
+                    _, end, index = spans[next_span]
+                    heapq.heappush(active, (index, end))
+                    next_span += 1
+
+                # Notes come in increasing location order, so a highlight
+                # ending before this note cannot cover any later one either
+                while active and active[0][1] < note_start:
+                    heapq.heappop(active)
+
+                if active:
+                    matches[note_index] = highlights[active[0][0]]
+
+        # Tags are added in file order of the notes
+        for note_index, note in enumerate(notes):
+            best_match = matches.get(note_index)
+            if best_match:
+                raw_tags = re.split(r"[.,;\n\r]", note.content)
+                new_tags = []
+                for raw_tag in raw_tags:
+                    tag_text = raw_tag.strip()
+                    if not tag_text:
+                        continue
+                    if not tag_text[0].isalnum():
+                        tag_text = tag_text[1:].strip()
+                    if tag_text:
+                        new_tags.append(tag_text)
+                best_match.add_tags(new_tags)
 
     def _parse_single_clipping(self, raw_text: str) -> Optional[Dict]:
         lines = [line_str for line_str in raw_text.splitlines() if line_str.strip()]
@@ -252,20 +576,15 @@ class KindleClippingsParser:
         # and treat everything before it as the Header.
 
         meta_index = -1
-        c_type = ""
+        meta: Optional[Dict[str, Optional[str]]] = None
 
         for i in range(1, len(lines)):  # Start checking from 2nd line
-            line = lines[i]
-            if re.search(self.patterns["highlight"], line):
-                c_type = "highlight"
-                meta_index = i
-                break
-            elif re.search(self.patterns["note"], line):
-                c_type = "note"
+            meta = self.compiled.parse_metadata(lines[i])
+            if meta:
                 meta_index = i
                 break
 
-        if meta_index == -1:
+        if meta is None:
             # Metadata pattern not found, might be a corrupted block
             return None
 
@@ -274,7 +593,7 @@ class KindleClippingsParser:
         full_header = " ".join(header_lines).replace("\n", " ").strip()
 
         # Line 1: Book Title Parsing using the combined header
-        match_book = re.match(r"(?P<title>.*)\((?P<author>.*)\)", full_header)
+        match_book = BOOK_HEADER_RE.match(full_header)
         if match_book:
             title = match_book.group("title").strip()
             author = match_book.group("author").strip()
@@ -291,30 +610,13 @@ class KindleClippingsParser:
             if change not in self.stats["title_changes"]:
                 self.stats["title_changes"].append(change)
 
-        # Line 2: Metadata
-        meta_line = lines[meta_index]
-
-        # Location
-        loc_match = re.search(
-            r"(" + self.patterns["location"] + r") (?P<location>[0-9,-]+)", meta_line
-        )
-        location = loc_match.group("location") if loc_match else ""
-
-        # Page
-        page_match = re.search(r"(" + self.patterns["page"] + r") (?P<page>[0-9,-]+)", meta_line)
-        page = page_match.group("page") if page_match else ""
-
-        # Date
-        # Robust date parsing needs the date string part
-        # Pattern: "Added on [Date part]"
-        date_part_match = re.search(
-            r"(" + self.patterns["added"] + r") (?P<date_str>.*)$", meta_line
-        )
-        if date_part_match:
-            date_str = date_part_match.group("date_str")
-            date_obj = dateparser.parse(date_str)
+        # Line 2: Metadata (type, page, location and date, extracted in a single pass)
+        date_str = meta["date_str"]
+        if date_str is not None:
+            date_obj, source = self.date_engine.parse(date_str)
+            self.stats[f"dates_{source}"] += 1
         else:
-            # Fallback if specific pattern fails, try parsing the whole line end or just give up gracefully
+            # "Added on" pattern not found: give up on the date gracefully
             date_obj = None
 
         content = "\n".join(lines[meta_index + 1 :])
@@ -326,17 +628,15 @@ class KindleClippingsParser:
         # Heuristic: If length got shorter by removing "- " pattern, it was likely de-hyphenated
         # This is a bit rough, but 'clean_text' does more than just de-hyphenate.
         # A simpler check is if "letter-\n" existed in original but is gone.
-        if re.search(r"[^\W\d_]+-\s*\n\s*[^\W\d_]+", original_content) and not re.search(
-            r"[^\W\d_]+-\s*\n\s*[^\W\d_]+", content
-        ):
+        if HYPHENATED_BREAK_RE.search(original_content) and not HYPHENATED_BREAK_RE.search(content):
             self.stats["pdfs_cleaned"] = self.stats.get("pdfs_cleaned", 0) + 1
 
         return {
             "book": title,
             "author": author,
-            "type": c_type,
-            "location": location,
-            "page": page,
+            "type": meta["type"],
+            "location": meta["location"],
+            "page": meta["page"],
             "date_time": date_obj,
             "content": content,
         }
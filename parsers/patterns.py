@@ -3,6 +3,9 @@ Default Regex patterns for Kindle clippings parsing.
 Separated from logic to allow easier updates and multi-language extensions.
 """
 
+import re
+from typing import Dict, Optional
+
 DEFAULT_PATTERNS = {
     # Variations of "Highlight"
     "highlight": r"subrayado|Subrayado|Highlight|highlight",
@@ -15,3 +18,69 @@ DEFAULT_PATTERNS = {
     # Variations of "Location"
     "location": r"posición|Pos\.|position|Position|location|Location|loc\.",
 }
+
+# Header line: "Book Title (Author)"
+BOOK_HEADER_RE = re.compile(r"(?P<title>.*)\((?P<author>.*)\)")
+
+# A word broken by a PDF line wrap: "exam-\nple"
+HYPHENATED_BREAK_RE = re.compile(r"[^\W\d_]+-\s*\n\s*[^\W\d_]+")
+
+
+class CompiledPatterns:
+    """
+    The regexes of one language, compiled once when that language is selected.
+
+    `metadata` extracts type, page, location and date from the metadata line in a
+    single pass. Kindle writes them in that order; any field the combined regex
+    misses is looked up again with its own regex, so the result never depends on it.
+    """
+
+    def __init__(self, patterns: Dict[str, str]):
+        highlight, note = patterns["highlight"], patterns["note"]
+        page, location, added = patterns["page"], patterns["location"], patterns["added"]
+
+        self.highlight = re.compile(highlight)
+        self.note = re.compile(note)
+        self.page = re.compile(r"(" + page + r") (?P<page>[0-9,-]+)")
+        self.location = re.compile(r"(" + location + r") (?P<location>[0-9,-]+)")
+        self.added = re.compile(r"(" + added + r") (?P<date_str>.*)$")
+
+        # Highlight is tried on the whole line before Note, like two separate searches would
+        self.metadata = re.compile(
+            r"(?:.*?(?P<highlight>" + highlight + r")|.*?(?P<note>" + note + r"))"
+            r"(?:.*?(?:" + page + r") (?P<page>[0-9,-]+))?"
+            r"(?:.*?(?:" + location + r") (?P<location>[0-9,-]+))?"
+            r"(?:.*?(?:" + added + r") (?P<date_str>.*))?"
+        )
+
+    def parse_metadata(self, line: str) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Returns type, page, location and date_str of a metadata line,
+        or None if the line is not a highlight/note metadata line.
+        Missing page/location come back as "" and a missing date as None.
+        """
+        match = self.metadata.match(line)
+        if not match:
+            return None
+
+        page = match.group("page")
+        if page is None:
+            page_match = self.page.search(line)
+            page = page_match.group("page") if page_match else ""
+
+        location = match.group("location")
+        if location is None:
+            loc_match = self.location.search(line)
+            location = loc_match.group("location") if loc_match else ""
+
+        date_str = match.group("date_str")
+        if date_str is None:
+            date_match = self.added.search(line)
+            date_str = date_match.group("date_str") if date_match else None
+
+        return {
+            "type": "highlight" if match.group("highlight") is not None else "note",
+            "page": page,
+            "location": location,
+            "date_str": date_str,
+        }
@@ -1,7 +1,11 @@
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 import logging
 from domain.models import Clipping
 from parsers.kindle_parser import KindleClippingsParser
+from parsers.checkpoint import CheckpointStore
+from parsers.json_parser import JsonClippingsReader
+from services.identity_service import IdentityService
+from services.parse_cache import ParseCache
 from exporters.base import BaseExporter
 from exporters.joplin_exporter import JoplinExporter
 from exporters.csv_exporter import CsvExporter
@@ -13,12 +17,22 @@ logger = logging.getLogger("KindleToJex.Service")
 
 
 class ClippingsService:
-    def __init__(self, language_code="es"):
+    def __init__(
+        self,
+        language_code="es",
+        checkpoint_dir: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+    ):
         from utils.config_manager import get_config_manager
 
         lang_path = get_config_manager().get_resource_path("languages.json")
         self.parser = KindleClippingsParser(language_code=language_code, language_file=lang_path)
 
+        # Incremental parsing: only the part of the file appended since the last run is parsed
+        self.checkpoints = CheckpointStore(checkpoint_dir) if checkpoint_dir else None
+        # Parse results of unchanged files are loaded from disk instead
+        self.parse_cache = ParseCache(cache_dir) if cache_dir else None
+
         # Strategy Registry - Lazy Loading Cache
         self.exporters_cache: Dict[str, BaseExporter] = {}
 
@@ -31,8 +45,13 @@ class ClippingsService:
         creator_name: str,
         enable_deduplication: bool = True,
         export_format: str = "jex",
+        workers: int = 1,
+        reproducible: bool = False,
+        since_last: bool = False,
+        export_options: Optional[Dict[str, Any]] = None,
+        fuzzy_deduplication: bool = False,
     ):
-        clippings = self.parser.parse_file(input_file)
+        clippings = self.load_clippings(input_file, workers=workers)
         if not clippings:
             logger.warning("No clippings found to process.")
             return
@@ -42,22 +61,75 @@ class ClippingsService:
         if enable_deduplication:
             from services.deduplication_service import SmartDeduplicator
 
-            deduplicator = SmartDeduplicator()
+            deduplicator = SmartDeduplicator(fuzzy=fuzzy_deduplication, workers=workers)
             final_clippings = deduplicator.deduplicate(clippings)
 
         self.process_clippings_from_list(
-            final_clippings, output_file, root_notebook_name, location, creator_name, export_format
+            final_clippings,
+            output_file,
+            root_notebook_name,
+            location,
+            creator_name,
+            export_format,
+            workers=workers,
+            reproducible=reproducible,
+            since_last=since_last,
+            export_options=export_options,
+        )
+
+    def load_clippings(self, input_file: str, workers: int = 1) -> List[Clipping]:
+        """
+        Parses the file, or returns the cached result if it did not change since.
+        The parser stats (self.parser.get_stats()) are restored on cache hits too.
+        JSON and JSON Lines exports of this app are read back as they are.
+        """
+        if input_file.lower().endswith((".json", ".jsonl")):
+            clippings = list(JsonClippingsReader(input_file))
+            # Exports carry no uid: identify the highlights as the parser would
+            IdentityService.assign_ids(clippings, workers=workers)
+            self.parser._reset_stats()
+            self.parser.stats["total"] = self.parser.stats["parsed"] = len(clippings)
+            return clippings
+        language = self.parser.language_code
+        if self.parse_cache:
+            cached = self.parse_cache.get(input_file, language, self.parser.VERSION)
+            if cached:
+                clippings, self.parser.stats = cached
+                return clippings
+
+        clippings = self.parser.parse_file(
+            input_file, workers=workers, checkpoints=self.checkpoints
         )
+        if self.parse_cache and clippings:
+            self.parse_cache.put(
+                input_file, language, self.parser.VERSION, clippings, self.parser.get_stats()
+            )
+        return clippings
+
+    def clear_caches(self):
+        """Removes stored parse results and incremental parse checkpoints."""
+        if self.parse_cache:
+            self.parse_cache.clear()
+        if self.checkpoints:
+            self.checkpoints.clear_all()
 
     def process_clippings_from_list(
         self,
-        clippings: List[Clipping],
+        clippings: Sequence[Clipping],
         output_file: str,
         root_notebook_name: str,
         location: Tuple[float, float, int],
         creator_name: str,
         export_format: str = "jex",
+        workers: int = 1,
+        reproducible: bool = False,
+        since_last: bool = False,
+        export_options: Optional[Dict[str, Any]] = None,
     ):
+        """
+        Exports the clippings with the exporter for `export_format`.
+        `export_options` are format-specific context entries, e.g. JEX "compression".
+        """
         logger.info(f"Processing {len(clippings)} clippings for {export_format.upper()} export...")
 
         exporter = self._get_exporter(export_format)
@@ -67,7 +139,14 @@ class ClippingsService:
             "root_notebook": root_notebook_name,
             "location": location,
             "creator": creator_name,
+            # Exporters that support it render in a process pool (JEX)
+            "workers": workers,
+            # Byte-identical output for identical clippings, plus a .sha256 digest file
+            "reproducible": reproducible,
+            # JEX: only notes new or changed since the previous export (see ExportManifest)
+            "since_last": since_last,
         }
+        context.update(export_options or {})
 
         try:
             exporter.export(clippings, output_file, context)
@@ -90,8 +169,12 @@ class ClippingsService:
             exporter = CsvExporter()
         elif code == "md":
             exporter = MarkdownExporter()
+        elif code == "md-dir":
+            exporter = MarkdownExporter(directory=True)
         elif code == "json":
             exporter = JsonExporter()
+        elif code == "jsonl":
+            exporter = JsonExporter(lines=True)
         else:
             logger.warning(f"Unknown format '{format_code}', defaulting to 'jex'")
             return self._get_exporter("jex")
@@ -1,16 +1,134 @@
+from bisect import bisect_right, insort_right
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Tuple, Dict, TypedDict
+from operator import attrgetter, itemgetter
+from typing import Deque, Iterable, List, Optional, Tuple, Dict
 from domain.models import Clipping
+from services.identity_service import IdentityService, LshIndex
 import logging
 
 logger = logging.getLogger("KindleToJex.Deduplicator")
 
+_SENTENCE_ENDINGS = frozenset({".", "!", "?", '"', "”", ")"})
 
-class EnhancedClip(TypedDict):
-    clip: Clipping
-    start: int
-    end: int
-    len: int
+# What the per-book passes read from a clipping: (content, location, type, tags, date).
+# Plain tuples pickle an order of magnitude faster than Clipping objects.
+BookRow = Tuple[str, str, str, Tuple[str, ...], Optional[datetime]]
+# Result for one book: positions of the duplicates, and the tags that were merged
+BookResult = Tuple[List[int], Dict[int, Tuple[str, ...]]]
+
+# Per-process deduplicator used by the worker pool of the parallel mode
+_worker_deduplicator: Optional["SmartDeduplicator"] = None
+
+
+def _init_dedup_worker():
+    global _worker_deduplicator
+    _worker_deduplicator = SmartDeduplicator()
+
+
+def _deduplicate_book_batch(books: List[List[BookRow]]) -> List[BookResult]:
+    """Worker entry point: runs the per-book passes over a batch of books."""
+    deduplicator = _worker_deduplicator
+    assert deduplicator is not None, "Worker was not initialized"
+    results = []
+    for rows in books:
+        clippings = [
+            Clipping(content, "", "", date_time, location, entry_type=entry_type, tags=tags)
+            for content, location, entry_type, tags, date_time in rows
+        ]
+        deduplicator._deduplicate_book(clippings)
+        duplicates = [index for index, clip in enumerate(clippings) if clip.is_duplicate]
+        merged = {
+            index: clip.tags
+            for index, (clip, row) in enumerate(zip(clippings, rows))
+            if len(clip.tags) != len(row[3])
+        }
+        results.append((duplicates, merged))
+    return results
+
+
+# A highlight as kept by the incremental state: (start, end, clipping, tags before merging)
+_HighlightItem = Tuple[int, int, Clipping, Tuple[str, ...]]
+
+
+class _Cluster:
+    """Highlights of a book, sorted by start, whose locations chain into each other."""
+
+    __slots__ = ("start", "end", "items")
+
+    def __init__(self, item: _HighlightItem):
+        self.start = item[0]
+        self.end = item[1]
+        self.items: List[_HighlightItem] = [item]
+
+
+class _BookState:
+    """
+    Highlights of one book split into clusters: a highlight that starts past the end
+    of every highlight before it (plus the overlap tolerance) starts a new cluster.
+    The sweep of SmartDeduplicator never carries a survivor across such a boundary,
+    so each cluster can be re-evaluated on its own. Notes are kept by location.
+    """
+
+    def __init__(self):
+        self.clusters: List[_Cluster] = []
+        self.notes: Dict[str, List[Tuple[Clipping, Tuple[str, ...]]]] = {}
+
+    def add_highlight(self, item: _HighlightItem, tolerance: int) -> _Cluster:
+        """Files a highlight after those with the same start; returns its cluster."""
+        clusters = self.clusters
+        index = bisect_right(clusters, item[0], key=attrgetter("start"))
+        if index and item[0] <= clusters[index - 1].end + tolerance:
+            index -= 1
+            cluster = clusters[index]
+            insort_right(cluster.items, item, key=itemgetter(0))
+            cluster.end = max(cluster.end, item[1])
+        else:
+            cluster = _Cluster(item)
+            clusters.insert(index, cluster)
+
+        # A longer highlight can bridge the gap to the following clusters
+        while index + 1 < len(clusters) and clusters[index + 1].start <= cluster.end + tolerance:
+            following = clusters.pop(index + 1)
+            cluster.items.extend(following.items)
+            cluster.end = max(cluster.end, following.end)
+            following.items = []  # In case it was already queued for evaluation
+        return cluster
+
+
+@dataclass
+class DeduplicationState:
+    """
+    What SmartDeduplicator.deduplicate_incremental() keeps between calls.
+
+    Attributes:
+        clippings: All clippings so far, flagged, in chronological order.
+        inputs: The same clippings in the order they were added.
+        input_tags: Their tags as they were added, before notes were merged in.
+    """
+
+    clippings: List[Clipping] = field(default_factory=list)
+    inputs: List[Clipping] = field(default_factory=list)
+    input_tags: List[Tuple[str, ...]] = field(default_factory=list)
+    books: Dict[str, _BookState] = field(default_factory=dict)
+
+    def is_prefix_of(self, clippings: List[Clipping]) -> bool:
+        """
+        True if `clippings` starts with the clippings of this state (same identity, see
+        IdentityService.clipping_id, and same tags), e.g. My Clippings.txt was parsed
+        again after the Kindle appended to it: the rest can then be passed to
+        deduplicate_incremental(). A note appended to an old highlight tags it when
+        parsed, so the tags count too.
+        """
+        if len(clippings) < len(self.inputs):
+            return False
+        clipping_id = IdentityService.clipping_id
+        return all(
+            old_tags == new.tags and clipping_id(old) == clipping_id(new)
+            for old, old_tags, new in zip(self.inputs, self.input_tags, clippings)
+        )
 
 
 class SmartDeduplicator:
@@ -19,9 +137,25 @@ class SmartDeduplicator:
     Handles:
     1. Overlapping highlights (keeping the longest/most complete version).
     2. Duplicate notes (keeping the latest version).
+    3. Optionally (fuzzy=True), near-duplicate highlights anywhere in the library, e.g.
+       the same passage under a renamed or re-imported book title.
     """
 
     OVERLAP_TOLERANCE_CHARS = 5
+    # Fewer words than this are too common to call near-duplicates across books
+    FUZZY_MIN_WORDS = 5
+
+    # Smaller libraries are deduplicated faster than a process pool starts
+    PARALLEL_MIN_CLIPPINGS = 20_000
+    # Clippings sent to a worker at a time (whole books, so a batch may hold more)
+    BATCH_SIZE = 5_000
+
+    def __init__(self, fuzzy: bool = False, fuzzy_threshold: float = 0.8, workers: int = 1):
+        self.fuzzy = fuzzy
+        self.fuzzy_threshold = fuzzy_threshold
+        self.workers = workers
+        # Location string -> (start, end), shared by all books
+        self._locations: Dict[str, Tuple[int, int]] = {}
 
     def deduplicate(self, clippings: List[Clipping]) -> List[Clipping]:
         if not clippings:
@@ -39,50 +173,178 @@ class SmartDeduplicator:
             books[key].append(clip)
 
         # 2. Process each book
-        for key, book_clippings in books.items():
-            # Separate Notes and Highlights
-            highlights = [c for c in book_clippings if c.entry_type == "highlight"]
-            notes = [c for c in book_clippings if c.entry_type == "note"]
-
-            # Process Highlights (Overlap Logic)
-            self._flag_duplicates_highlights(highlights)
-
-            # Process Notes (Latest by Location Logic)
-            self._flag_duplicates_notes(notes)
+        if self.workers > 1 and len(books) > 1 and len(clippings) >= self.PARALLEL_MIN_CLIPPINGS:
+            self._deduplicate_books_parallel(list(books.values()))
+        else:
+            for book_clippings in books.values():
+                self._deduplicate_book(book_clippings)
 
         # Return ALL clippings (some are now flagged)
-        # Restore chronological order if shuffled by grouping
+        # Restore chronological order if shuffled by grouping. The input order is kept
+        # (and sorted, the way the Kindle appends clippings), so this is close to linear.
         clippings.sort(key=lambda x: x.date_time if x.date_time else datetime.min)
 
+        if self.fuzzy:
+            self._flag_near_duplicates(clippings)
+
         return clippings
 
+    def deduplicate_incremental(
+        self, state: Optional[DeduplicationState], new_clippings: Iterable[Clipping]
+    ) -> DeduplicationState:
+        """
+        Adds clippings to a deduplicated library (state=None starts a new one).
+
+        Only the highlight clusters and note locations the new clippings fall into are
+        evaluated again, so the cost follows the size of the delta. The flags and tags
+        are the same as deduplicate() gives for all the clippings in the order they
+        were added. With fuzzy=True the library-wide pass makes every book count, so
+        everything is evaluated again.
+        """
+        if state is None:
+            state = DeduplicationState()
+        new_clippings = list(new_clippings)
+        state.input_tags.extend(clip.tags for clip in new_clippings)
+        tolerance = self.OVERLAP_TOLERANCE_CHARS
+
+        clusters: Dict[int, _Cluster] = {}
+        note_groups: Dict[int, List[Tuple[Clipping, Tuple[str, ...]]]] = {}
+        new_highlights: Dict[str, List[_HighlightItem]] = {}
+        for clip in new_clippings:
+            clip.is_duplicate = False
+            book = state.books.get(clip.title_hash)
+            if book is None:
+                book = state.books[clip.title_hash] = _BookState()
+
+            if clip.entry_type == "highlight":
+                start, end = self._locations.get(clip.location) or self._parse_location(
+                    clip.location
+                )
+                item = (start, end, clip, clip.tags)
+                if book.clusters:
+                    cluster = book.add_highlight(item, tolerance)
+                    clusters[id(cluster)] = cluster
+                else:
+                    new_highlights.setdefault(clip.title_hash, []).append(item)
+            elif clip.entry_type == "note":
+                group = book.notes.setdefault(clip.location, [])
+                group.append((clip, clip.tags))
+                note_groups[id(group)] = group
+
+        if self.fuzzy:
+            # The library-wide pass can involve any book: evaluate them all again
+            for key, book in state.books.items():
+                if key not in new_highlights:
+                    clusters.update((id(cluster), cluster) for cluster in book.clusters)
+                note_groups.update((id(group), group) for group in book.notes.values())
+
+        # Highlights of books seen for the first time: one pass per book, then clustered
+        for key, items in new_highlights.items():
+            self._flag_duplicates_highlights([item[2] for item in items])
+            book = state.books[key]
+            items.sort(key=itemgetter(0))
+            for item in items:
+                if book.clusters and item[0] <= book.clusters[-1].end + tolerance:
+                    book.clusters[-1].items.append(item)
+                    book.clusters[-1].end = max(book.clusters[-1].end, item[1])
+                else:
+                    book.clusters.append(_Cluster(item))
+
+        # Evaluate the touched clusters and note groups from scratch
+        for cluster in clusters.values():
+            for _, _, clip, tags in cluster.items:
+                clip.is_duplicate = False
+                clip.tags = tags
+            self._flag_duplicates_highlights([item[2] for item in cluster.items])
+        for group in note_groups.values():
+            for clip, tags in group:
+                clip.is_duplicate = False
+                clip.tags = tags
+            self._flag_duplicates_notes([clip for clip, _ in group])
+
+        state.inputs.extend(new_clippings)
+        # Already sorted with a few clippings appended: close to linear
+        state.clippings.extend(new_clippings)
+        state.clippings.sort(key=lambda x: x.date_time if x.date_time else datetime.min)
+
+        if self.fuzzy:
+            self._flag_near_duplicates(state.clippings)
+
+        logger.info(
+            f"Deduplicated {len(new_clippings)} new clippings: {len(new_highlights)} new books, "
+            f"{len(clusters)} highlight clusters and {len(note_groups)} note locations evaluated"
+        )
+        return state
+
+    def _deduplicate_book(self, book_clippings: List[Clipping]):
+        # Separate Notes and Highlights
+        highlights = [c for c in book_clippings if c.entry_type == "highlight"]
+        notes = [c for c in book_clippings if c.entry_type == "note"]
+
+        # Process Highlights (Overlap Logic)
+        self._flag_duplicates_highlights(highlights)
+
+        # Process Notes (Latest by Location Logic)
+        self._flag_duplicates_notes(notes)
+
+    def _deduplicate_books_parallel(self, books: List[List[Clipping]]):
+        """
+        Runs the per-book passes in a process pool. Books are independent, so each
+        batch of books is deduplicated by one worker and its flags and merged tags are
+        applied back to the clippings here.
+        """
+        pending: Deque[Tuple[List[List[Clipping]], Future]] = deque()
+
+        def apply_oldest():
+            batch, future = pending.popleft()
+            for book_clippings, (duplicates, merged) in zip(batch, future.result()):
+                # Flags were all reset: only the duplicates need to be set
+                for index in duplicates:
+                    book_clippings[index].is_duplicate = True
+                for index, tags in merged.items():
+                    book_clippings[index].add_tags(tags)
+
+        def submit(batch: List[List[Clipping]]):
+            rows = [
+                [(c.content, c.location, c.entry_type, c.tags, c.date_time) for c in book]
+                for book in batch
+            ]
+            pending.append((batch, pool.submit(_deduplicate_book_batch, rows)))
+            # Keep a bounded number of batches in flight
+            if len(pending) >= self.workers * 2:
+                apply_oldest()
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_dedup_worker) as pool:
+            batch: List[List[Clipping]] = []
+            size = 0
+            for book_clippings in books:
+                batch.append(book_clippings)
+                size += len(book_clippings)
+                if size >= self.BATCH_SIZE:
+                    submit(batch)
+                    batch, size = [], 0
+            if batch:
+                submit(batch)
+
+            while pending:
+                apply_oldest()
+
     def _merge_tags(self, source: Clipping, target: Clipping):
         """Merges tags from source to target, avoiding duplicates."""
         if source.tags:
-            existing_tags = set(target.tags)
-            for tag in source.tags:
-                if tag not in existing_tags:
-                    target.tags.append(tag)
-                    existing_tags.add(tag)
+            target.add_tags(source.tags)
 
     def _flag_duplicates_highlights(self, highlights: List[Clipping]):
         """
         Marks highlights that are subsets of other highlights as duplicates.
         Also flags very short highlights as potential accidents.
-        """
 
-        # Helper to parse location
-        def parse_loc(loc_str: str) -> Tuple[int, int]:
-            try:
-                parts = loc_str.split("-")
-                start = int(parts[0])
-                end = int(parts[1]) if len(parts) > 1 else start
-                return start, end
-            except (ValueError, IndexError):
-                return 0, 0
-
-        # Attach parsed locs for sorting
-        enhanced: List[EnhancedClip] = []
+        Highlights are swept in order of their start location; each one is only
+        compared with the current "survivor" of the overlapping run.
+        """
+        # (start, end, length, clip), with each location parsed once
+        items: List[Tuple[int, int, int, Clipping]] = []
+        locations = self._locations
         for h in highlights:
             # Heuristics for "Accidental" vs "Short but valid"
             # SKIP if the user has explicitly tagged/noted this highlight.
@@ -90,67 +352,112 @@ class SmartDeduplicator:
                 text = h.content.strip()
                 length = len(text)
 
-                is_garbage = length < 5
-                is_fragment = length < 75 and (text and text[0].islower())
-                is_incomplete = length < 75 and (
-                    text and text[-1] not in {".", "!", "?", '"', "”", ")"}
-                )
-
-                if is_garbage or is_fragment or is_incomplete:
+                # Garbage (< 5 chars), or a short fragment / incomplete sentence
+                if length < 75 and (
+                    length < 5 or text[0].islower() or text[-1] not in _SENTENCE_ENDINGS
+                ):
                     h.is_duplicate = True
 
-            s, e = parse_loc(h.location)
-            enhanced.append({"clip": h, "start": s, "end": e, "len": len(h.content)})
+            location = locations.get(h.location) or self._parse_location(h.location)
+            items.append((location[0], location[1], len(h.content), h))
 
-        # Sort primarily by Start Location
-        enhanced.sort(key=lambda x: int(x["start"]))
-
-        if not enhanced:
+        if not items:
             return
 
+        # Stable: highlights starting at the same location keep their input order
+        items.sort(key=itemgetter(0))
+        tolerance = self.OVERLAP_TOLERANCE_CHARS
+
         # We keep track of the "active" highlight we are comparing against
         # This is the "survivor" so far in the chain
-        survivor = enhanced[0]
-
-        for current in enhanced[1:]:
-            # Check overlap between 'current' and the last 'survivor'
-            is_overlapping = (current["start"] >= survivor["start"]) and (
-                current["start"] <= survivor["end"] + self.OVERLAP_TOLERANCE_CHARS
-            )
-
-            if is_overlapping:
-                # Decide which one is the duplicate
-                if survivor["clip"].content in current["clip"].content:
-                    # Survivor is a SUBSET -> Survivor is duplicate
-                    self._merge_tags(survivor["clip"], current["clip"])  # Rescue tags
-                    survivor["clip"].is_duplicate = True
-                    survivor = current  # Current becomes the new survivor
-                elif current["clip"].content in survivor["clip"].content:
-                    # Current is a SUBSET -> Current is duplicate
-                    self._merge_tags(current["clip"], survivor["clip"])  # Rescue tags
-                    current["clip"].is_duplicate = True
-                    # Survivor stays the same
-                else:
-                    # Partial overlap (fuzzy logic)
-                    overlap_amount = min(survivor["end"], current["end"]) - max(
-                        survivor["start"], current["start"]
-                    )
-                    span = max(survivor["end"], current["end"]) - min(
-                        survivor["start"], current["start"]
-                    )
-
-                    if span > 0 and (overlap_amount / span) > 0.5:
-                        # Significant overlap -> Keep longest
-                        if current["len"] > survivor["len"]:
-                            self._merge_tags(survivor["clip"], current["clip"])
-                            survivor["clip"].is_duplicate = True
-                            survivor = current
-                        else:
-                            self._merge_tags(current["clip"], survivor["clip"])
-                            current["clip"].is_duplicate = True
-            else:
+        s_start, s_end, s_len, survivor = items[0]
+
+        for c_start, c_end, c_len, current in items[1:]:
+            # Sorted by start, so only the end of the survivor can rule out an overlap
+            if c_start > s_end + tolerance:
                 # No overlap -> Current becomes the new survivor for the next block
-                survivor = current
+                s_start, s_end, s_len, survivor = c_start, c_end, c_len, current
+                continue
+
+            # Decide which one is the duplicate. Lengths are compared first: a longer
+            # text cannot be a subset, and texts of equal length only if they are equal
+            if (
+                s_len < c_len
+                and survivor.content in current.content
+                or (s_len == c_len and survivor.content == current.content)
+            ):
+                # Survivor is a SUBSET -> Survivor is duplicate
+                self._merge_tags(survivor, current)  # Rescue tags
+                survivor.is_duplicate = True
+                s_start, s_end, s_len, survivor = c_start, c_end, c_len, current
+            elif c_len < s_len and current.content in survivor.content:
+                # Current is a SUBSET -> Current is duplicate
+                self._merge_tags(current, survivor)  # Rescue tags
+                current.is_duplicate = True
+                # Survivor stays the same
+            else:
+                # Partial overlap (fuzzy logic)
+                overlap_amount = min(s_end, c_end) - c_start
+                span = max(s_end, c_end) - s_start
+
+                if span > 0 and (overlap_amount / span) > 0.5:
+                    # Significant overlap -> Keep longest
+                    if c_len > s_len:
+                        self._merge_tags(survivor, current)
+                        survivor.is_duplicate = True
+                        s_start, s_end, s_len, survivor = c_start, c_end, c_len, current
+                    else:
+                        self._merge_tags(current, survivor)
+                        current.is_duplicate = True
+
+    def _parse_location(self, location: str) -> Tuple[int, int]:
+        """'100-120' -> (100, 120), '100' -> (100, 100); unparseable locations are (0, 0)."""
+        try:
+            parts = location.split("-")
+            start = int(parts[0])
+            parsed = (start, int(parts[1]) if len(parts) > 1 else start)
+        except (ValueError, IndexError):
+            parsed = (0, 0)
+        # Locations are interned strings that repeat across a library: parse each once
+        self._locations[location] = parsed
+        return parsed
+
+    def _flag_near_duplicates(self, clippings: List[Clipping]):
+        """
+        Library-wide pass over the highlights left by the per-book passes: highlights
+        whose word sets are at least `fuzzy_threshold` similar (Jaccard) are merged,
+        keeping the longest. Candidates come from an LSH index of MinHash signatures,
+        so each highlight is only compared with the few that likely match.
+        """
+        index = LshIndex()
+        survivors: List[Clipping] = []
+        for clip in clippings:
+            if clip.is_duplicate or clip.entry_type != "highlight":
+                continue
+            if len(clip.content.split()) < self.FUZZY_MIN_WORDS:
+                continue
+            signature = IdentityService.minhash_signature(clip)
+
+            match, best = None, 0.0
+            for position in sorted(index.candidates(signature)):
+                candidate = survivors[position]
+                if candidate.is_duplicate:
+                    continue  # Replaced by a longer version since it was indexed
+                similarity = IdentityService.calculate_similarity(candidate.content, clip.content)
+                if similarity >= self.fuzzy_threshold and similarity > best:
+                    match, best = candidate, similarity
+
+            if match is None:
+                index.add(len(survivors), signature)
+                survivors.append(clip)
+            elif len(clip.content) > len(match.content):
+                self._merge_tags(match, clip)
+                match.is_duplicate = True
+                index.add(len(survivors), signature)
+                survivors.append(clip)
+            else:
+                self._merge_tags(clip, match)
+                clip.is_duplicate = True
 
     def _flag_duplicates_notes(self, notes: List[Clipping]):
         """
@@ -1,9 +1,77 @@
 import hashlib
 import logging
+import string
+import struct
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Deque, Dict, Hashable, List, Sequence, Set, Tuple
 from domain.models import Clipping
 
 logger = logging.getLogger("KindleToJex.IdentityService")
 
+_PUNCTUATION = str.maketrans("", "", string.punctuation)
+
+# MinHash signatures: every shingle (pair of consecutive words) is hashed once and lands
+# in one of MINHASH_BINS bins (one-permutation hashing), so signing a clipping is a
+# single pass over its words. Pairs rather than single words keep passages that only
+# share common words ("the", "of"...) from looking alike.
+MINHASH_BINS = 32
+# LSH: MINHASH_BINS // LSH_BANDS bins per band; pairs with a Jaccard similarity above
+# ~0.6 share a band (are candidates) with high probability, dissimilar ones rarely do
+LSH_BANDS = 8
+
+_EMPTY_BIN = 0xFFFFFFFF
+# Empty bins borrow the value of the next filled bin, shifted by this per bin of distance
+_DENSIFY_STEP = 0x9E3779B1
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+_PAIR_MIX = 0x9E3779B97F4A7C15
+_SIGNATURE = struct.Struct(f"<{MINHASH_BINS}I")
+
+# Word -> 64-bit hash; the vocabulary of a library is small and repeats a lot
+_word_hashes: Dict[str, int] = {}
+
+
+def _word_hash(word: str) -> int:
+    value = _word_hashes.get(word)
+    if value is None:
+        digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+        value = _word_hashes[word] = int.from_bytes(digest, "little")
+    return value
+
+
+# The fields generate_id() hashes: content, book title, author, location, page
+IdentityFields = Tuple[str, str, str, str, str]
+
+
+def _identity_fields(clipping: Clipping) -> IdentityFields:
+    return (
+        clipping.content,
+        clipping.book_title,
+        clipping.author,
+        clipping.location,
+        clipping.page,
+    )
+
+
+def _identity_hash(fields: IdentityFields) -> str:
+    content, title, author, location, page = fields
+
+    # Use location as primary differentiator, page as secondary
+    # Some clippings have only one, or neither.
+    loc_marker = location.strip() or page.strip() or "unknown_loc"
+
+    # We construct a pipe-delimited string of the invariant parts, stripped to be
+    # robust against minor whitespace. Format: CONTENT|TITLE|AUTHOR|LOCATION
+    unique_string = f"{content.strip()}|{title.strip()}|{author.strip()}|{loc_marker}"
+
+    return hashlib.sha256(unique_string.encode("utf-8")).hexdigest()
+
+
+def _hash_identity_batch(rows: List[IdentityFields]) -> List[str]:
+    """Worker entry point of IdentityService.assign_ids(workers=N)."""
+    return [_identity_hash(fields) for fields in rows]
+
 
 class IdentityService:
     """
@@ -13,6 +81,31 @@ class IdentityService:
     - Robust to minor import variations.
     """
 
+    # Content -> MinHash signature, so each text is only signed once
+    _signatures: Dict[str, bytes] = {}
+    # Identity fields -> generate_id(), for clippings without a uid (notes, JSON imports)
+    _ids: Dict[IdentityFields, str] = {}
+    # Seed -> entity_id(): notebooks, tags and notes are looked up many times per export
+    _entity_ids: Dict[str, str] = {}
+
+    # Hits and misses of the caches above since the last clear_cache()
+    stats: Dict[str, int] = {
+        "id_hits": 0,
+        "id_misses": 0,
+        "entity_id_hits": 0,
+        "entity_id_misses": 0,
+        "signature_hits": 0,
+        "signature_misses": 0,
+    }
+
+    # Entries a cache may hold before it is emptied, so a long session cannot grow it forever
+    CACHE_LIMIT = 200_000
+
+    # Fewer clippings than this are hashed faster than a process pool starts
+    PARALLEL_MIN_CLIPPINGS = 20_000
+    # Clippings sent to a worker at a time
+    BATCH_SIZE = 5_000
+
     @staticmethod
     def generate_id(clipping: Clipping) -> str:
         """
@@ -27,20 +120,105 @@ class IdentityService:
         Crucially, we EXCLUDE the timestamp. This ensures that if you re-import
         the same file later (or from a different device clock), the ID remains identical.
         """
-        # specialized cleaning for ID generation to be robust against minor whitespace
-        clean_content = clipping.content.strip()
-        clean_title = clipping.book_title.strip()
-        clean_author = clipping.author.strip()
+        return _identity_hash(_identity_fields(clipping))
+
+    @staticmethod
+    def clipping_id(clipping: Clipping) -> str:
+        """
+        The identity the clipping was parsed with: its uid, or current_id() if it has
+        none. The uid is not updated when a field is changed afterwards (the GUI table
+        sets a new one when a row is edited), so compare contents with current_id().
+        """
+        if clipping.uid:
+            IdentityService.stats["id_hits"] += 1
+            return clipping.uid
+        return IdentityService.current_id(clipping)
+
+    @staticmethod
+    def current_id(clipping: Clipping) -> str:
+        """generate_id() of the current fields, computed once per distinct fields."""
+        stats = IdentityService.stats
+        fields = _identity_fields(clipping)
+        uid = IdentityService._ids.get(fields)
+        if uid is None:
+            stats["id_misses"] += 1
+            uid = _identity_hash(fields)
+            IdentityService._store(IdentityService._ids, fields, uid)
+        else:
+            stats["id_hits"] += 1
+        return uid
+
+    @staticmethod
+    def assign_ids(clippings: Sequence[Clipping], workers: int = 1) -> int:
+        """
+        Sets the uid of the highlights that have none, as the parser does (e.g. after a
+        JSON import). With workers > 1, large imports are hashed in a process pool.
+        Returns the number of uids set.
+        """
+        missing = [c for c in clippings if not c.uid and c.entry_type == "highlight"]
+        if workers > 1 and len(missing) >= IdentityService.PARALLEL_MIN_CLIPPINGS:
+            IdentityService._assign_ids_parallel(missing, workers)
+        else:
+            for clip in missing:
+                clip.uid = _identity_hash(_identity_fields(clip))
+        IdentityService.stats["id_misses"] += len(missing)
+        return len(missing)
 
-        # Use location as primary differentiator, page as secondary
-        # Some clippings have only one, or neither.
-        loc_marker = clipping.location.strip() or clipping.page.strip() or "unknown_loc"
+    @staticmethod
+    def _assign_ids_parallel(clippings: List[Clipping], workers: int):
+        pending: Deque[Tuple[List[Clipping], Future]] = deque()
 
-        # We construct a pipe-delimited string of the invariant parts
-        # Format: CONTENT|TITLE|AUTHOR|LOCATION
-        unique_string = f"{clean_content}|{clean_title}|{clean_author}|{loc_marker}"
+        def apply_oldest():
+            batch, future = pending.popleft()
+            for clip, uid in zip(batch, future.result()):
+                clip.uid = uid
 
-        return hashlib.sha256(unique_string.encode("utf-8")).hexdigest()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            remaining = iter(clippings)
+            while batch := list(islice(remaining, IdentityService.BATCH_SIZE)):
+                rows = [_identity_fields(clip) for clip in batch]
+                pending.append((batch, pool.submit(_hash_identity_batch, rows)))
+                # Keep a bounded number of batches in flight
+                if len(pending) >= workers * 2:
+                    apply_oldest()
+            while pending:
+                apply_oldest()
+
+    @staticmethod
+    def entity_id(seed: str, cache: bool = True) -> str:
+        """
+        Deterministic 32-char hex ID of a Joplin entity (MD5 of its seed, e.g.
+        "notebook:Title"). Computed once per seed unless cache=False, for seeds that
+        never come back (tag associations).
+        """
+        if not cache:
+            return hashlib.md5(seed.encode("utf-8")).hexdigest()
+        stats = IdentityService.stats
+        entity_id = IdentityService._entity_ids.get(seed)
+        if entity_id is None:
+            stats["entity_id_misses"] += 1
+            # MD5 is used here for deterministic ID generation, not security.
+            entity_id = hashlib.md5(seed.encode("utf-8")).hexdigest()
+            IdentityService._store(IdentityService._entity_ids, seed, entity_id)
+        else:
+            stats["entity_id_hits"] += 1
+        return entity_id
+
+    @staticmethod
+    def hit_rates() -> Dict[str, float]:
+        """Share of lookups served from cache, per cache ("id", "entity_id", "signature")."""
+        stats = IdentityService.stats
+        rates = {}
+        for name in ("id", "entity_id", "signature"):
+            hits, misses = stats[f"{name}_hits"], stats[f"{name}_misses"]
+            rates[name] = hits / (hits + misses) if hits + misses else 0.0
+        return rates
+
+    @staticmethod
+    def _store(cache: Dict, key, value):
+        if len(cache) >= IdentityService.CACHE_LIMIT:
+            cache.clear()
+        cache[key] = value
 
     @staticmethod
     def calculate_similarity(text1: str, text2: str) -> float:
@@ -51,27 +229,93 @@ class IdentityService:
         if not text1 or not text2:
             return 0.0
 
-        # simple punctuation removal map
-        import string
-
-        translator = str.maketrans("", "", string.punctuation)
-
-        set1 = set(text1.lower().translate(translator).split())
-        set2 = set(text2.lower().translate(translator).split())
+        set1 = IdentityService.word_set(text1)
+        set2 = IdentityService.word_set(text2)
 
         intersection = len(set1.intersection(set2))
         union = len(set1.union(set2))
 
         return intersection / union if union > 0 else 0.0
 
+    @staticmethod
+    def words(text: str) -> List[str]:
+        """Lowercased words without punctuation, in order."""
+        return text.lower().translate(_PUNCTUATION).split()
+
+    @staticmethod
+    def word_set(text: str) -> Set[str]:
+        """The words compared by calculate_similarity."""
+        return set(IdentityService.words(text))
+
+    @staticmethod
+    def minhash(words: Sequence[str]) -> bytes:
+        """
+        MinHash signature of the shingles of a word sequence (b"" if there are no
+        words; a single word is its own shingle). The share of equal bins between two
+        signatures estimates the Jaccard similarity of their shingle sets.
+        """
+        bins = [_EMPTY_BIN] * MINHASH_BINS
+        filled = 0
+        hashes = [_word_hash(word) for word in words]
+        if len(hashes) > 1:
+            hashes = [
+                (first * _PAIR_MIX & _MASK64) ^ second for first, second in zip(hashes, hashes[1:])
+            ]
+        for value in hashes:
+            index = value % MINHASH_BINS
+            value >>= 32
+            if value < bins[index]:
+                filled += bins[index] == _EMPTY_BIN
+                bins[index] = value
+
+        if filled == 0:
+            return b""
+        if filled < MINHASH_BINS:
+            # Densification: short texts leave bins empty, which would otherwise all
+            # compare equal. Walk right to left (wrapping once) so every empty bin sees
+            # its nearest filled neighbour.
+            dense = bins[:]
+            nearest = 0
+            for i in range(2 * MINHASH_BINS - 1, -1, -1):
+                if bins[i % MINHASH_BINS] != _EMPTY_BIN:
+                    nearest = i
+                elif i < MINHASH_BINS:
+                    borrowed = bins[nearest % MINHASH_BINS] + (nearest - i) * _DENSIFY_STEP
+                    dense[i] = borrowed & 0xFFFFFFFF
+            bins = dense
+        return _SIGNATURE.pack(*bins)
+
+    @staticmethod
+    def minhash_signature(clipping: Clipping) -> bytes:
+        """MinHash signature of the clipping content, cached by content."""
+        content = clipping.content
+        signature = IdentityService._signatures.get(content)
+        if signature is None:
+            IdentityService.stats["signature_misses"] += 1
+            signature = IdentityService.minhash(IdentityService.words(content))
+            IdentityService._store(IdentityService._signatures, content, signature)
+        else:
+            IdentityService.stats["signature_hits"] += 1
+        return signature
+
+    @staticmethod
+    def clear_cache():
+        """Forgets the cached IDs and signatures (e.g. after loading another library)."""
+        IdentityService._signatures.clear()
+        IdentityService._ids.clear()
+        IdentityService._entity_ids.clear()
+        for key in IdentityService.stats:
+            IdentityService.stats[key] = 0
+
     @staticmethod
     def is_duplicate(clip1: Clipping, clip2: Clipping, threshold: float = 0.9) -> bool:
         """
         Determines if two clippings are duplicates using strict or fuzzy logic.
         """
         # 1. Strict ID Check (Fastest)
-        id1 = IdentityService.generate_id(clip1)
-        id2 = IdentityService.generate_id(clip2)
+        # Hashes the current fields: an edited clipping keeps its old uid
+        id1 = IdentityService.current_id(clip1)
+        id2 = IdentityService.current_id(clip2)
         if id1 == id2:
             return True
 
@@ -90,3 +334,43 @@ class IdentityService:
                 return True
 
         return False
+
+
+class LshIndex:
+    """
+    Locality-sensitive hashing index of MinHash signatures.
+
+    Each signature is cut into bands and filed under every band. Near-duplicates share
+    at least one band with high probability, so finding the candidates for a clipping
+    costs a few dict lookups instead of a comparison with every other clipping.
+    Candidates are only likely matches: confirm them with calculate_similarity.
+    """
+
+    def __init__(self, bands: int = LSH_BANDS):
+        if bands <= 0 or MINHASH_BINS % bands:
+            raise ValueError(f"LSH bands must divide {MINHASH_BINS}, got {bands}")
+        self.bands = bands
+        self._band_bytes = _SIGNATURE.size // bands
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [{} for _ in range(bands)]
+
+    def add(self, key: Hashable, signature: bytes):
+        """Files `key` under every band of the signature (empty signatures are ignored)."""
+        if not signature:
+            return
+        size = self._band_bytes
+        for band, buckets in enumerate(self._buckets):
+            start = band * size
+            buckets.setdefault(signature[start : start + size], []).append(key)
+
+    def candidates(self, signature: bytes) -> Set[Hashable]:
+        """Keys of the indexed signatures that share at least one band with `signature`."""
+        found: Set[Hashable] = set()
+        if not signature:
+            return found
+        size = self._band_bytes
+        for band, buckets in enumerate(self._buckets):
+            start = band * size
+            keys = buckets.get(signature[start : start + size])
+            if keys:
+                found.update(keys)
+        return found
@@ -0,0 +1,207 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+import zlib
+from contextlib import closing
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from domain.models import Clipping
+
+logger = logging.getLogger("KindleToJex.ParseCache")
+
+# Bump whenever the payload layout changes, so older entries are read as misses
+PAYLOAD_FORMAT = 1
+
+
+def encode_payload(clippings: List[Clipping], stats: Dict[str, Any]) -> bytes:
+    """Parse result as compressed JSON: plain data, nothing is executed when reading it."""
+    rows = [
+        [
+            clip.content,
+            clip.book_title,
+            clip.author,
+            clip.date_time.isoformat() if clip.date_time else None,
+            clip.location,
+            clip.page,
+            clip.entry_type,
+            list(clip.tags),
+            clip.is_duplicate,
+            clip.uid,
+        ]
+        for clip in clippings
+    ]
+    data = {"format": PAYLOAD_FORMAT, "clippings": rows, "stats": stats}
+    return zlib.compress(json.dumps(data, separators=(",", ":")).encode("utf-8"), 1)
+
+
+def decode_payload(payload: bytes) -> Tuple[List[Clipping], Dict[str, Any]]:
+    """Inverse of encode_payload(); raises ValueError for entries of another format."""
+    data = json.loads(zlib.decompress(payload))
+    if data.get("format") != PAYLOAD_FORMAT:
+        raise ValueError(f"payload format {data.get('format')!r}")
+    clippings = []
+    for row in data["clippings"]:
+        content, book_title, author, date_time, location, page, entry_type, tags, dupe, uid = row
+        clippings.append(
+            Clipping(
+                content=content,
+                book_title=book_title,
+                author=author,
+                date_time=datetime.fromisoformat(date_time) if date_time else None,
+                location=location,
+                page=page,
+                entry_type=entry_type,
+                tags=tags,
+                is_duplicate=dupe,
+                uid=uid,
+            )
+        )
+    return clippings, data["stats"]
+
+
+def file_fingerprint(file_path: str, chunk_size: int = 1024 * 1024) -> Tuple[int, int, str]:
+    """Returns (size, mtime in ns, SHA-256 of the content) of a file."""
+    st = os.stat(file_path)
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return st.st_size, st.st_mtime_ns, digest.hexdigest()
+
+
+class ParseCache:
+    """
+    SQLite store of parse results (clippings with notes linked, plus parser stats).
+
+    Entries are keyed by (path, size, mtime, content hash, language, parser version):
+    a hit skips parsing, text and title cleaning and ID hashing altogether.
+    Only the latest result per (path, language, parser version) is kept, and the least
+    recently used entries are evicted past `max_entries` or `max_bytes` of payload.
+    """
+
+    FILENAME = "parse_cache.sqlite3"
+
+    def __init__(self, directory: str, max_entries: int = 16, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.db_path = os.path.join(directory, self.FILENAME)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(self.directory, exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS parse_results (
+                path TEXT NOT NULL,
+                language TEXT NOT NULL,
+                parser_version INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                payload BLOB NOT NULL,
+                PRIMARY KEY (path, language, parser_version)
+            )
+            """
+        )
+        return conn
+
+    def get(
+        self, file_path: str, language: str, parser_version: int
+    ) -> Optional[Tuple[List[Clipping], Dict[str, Any]]]:
+        """Returns the cached (clippings, stats) if the file is unchanged, else None."""
+        path = os.path.abspath(file_path)
+        try:
+            with closing(self._connect()) as conn, conn:
+                row = conn.execute(
+                    "SELECT size, mtime_ns, content_hash, payload FROM parse_results "
+                    "WHERE path = ? AND language = ? AND parser_version = ?",
+                    (path, language, parser_version),
+                ).fetchone()
+                if row is None:
+                    return None
+
+                size, mtime_ns, content_hash, payload = row
+                # Cheap check first: a different size is always a miss
+                if os.path.getsize(path) != size:
+                    return None
+                if file_fingerprint(path) != (size, mtime_ns, content_hash):
+                    return None
+
+                conn.execute(
+                    "UPDATE parse_results SET last_used = ? "
+                    "WHERE path = ? AND language = ? AND parser_version = ?",
+                    (time.time(), path, language, parser_version),
+                )
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Parse cache lookup failed for {path}: {e}")
+            return None
+
+        try:
+            clippings, stats = decode_payload(payload)
+        except Exception as e:
+            # Written by another version, or damaged: parse the file again
+            logger.warning(f"Ignoring unreadable parse cache entry for {path}: {e}")
+            return None
+
+        logger.info(f"Parse cache hit for {path} ({len(clippings)} clippings)")
+        return clippings, stats
+
+    def put(
+        self,
+        file_path: str,
+        language: str,
+        parser_version: int,
+        clippings: List[Clipping],
+        stats: Dict[str, Any],
+    ):
+        """Stores a parse result, replacing older results for the same file and evicting."""
+        path = os.path.abspath(file_path)
+        try:
+            size, mtime_ns, content_hash = file_fingerprint(path)
+            payload = encode_payload(clippings, stats)
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO parse_results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        path,
+                        language,
+                        parser_version,
+                        size,
+                        mtime_ns,
+                        content_hash,
+                        time.time(),
+                        sqlite3.Binary(payload),
+                    ),
+                )
+                self._evict(conn)
+        except (sqlite3.Error, OSError) as e:
+            logger.error(f"Failed to store parse result for {path}: {e}")
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drops the least recently used entries beyond the count and size limits."""
+        rows = conn.execute(
+            "SELECT rowid, length(payload) FROM parse_results ORDER BY last_used DESC"
+        ).fetchall()
+
+        total = 0
+        stale = []
+        for position, (rowid, length) in enumerate(rows):
+            total += length
+            # The most recent entry is always kept, even if it alone exceeds max_bytes
+            if position > 0 and (position >= self.max_entries or total > self.max_bytes):
+                stale.append((rowid,))
+
+        if stale:
+            conn.executemany("DELETE FROM parse_results WHERE rowid = ?", stale)
+            logger.info(f"Evicted {len(stale)} entries from the parse cache")
+
+    def clear(self):
+        """Deletes the cache database."""
+        if os.path.exists(self.db_path):
+            os.remove(self.db_path)
+            logger.info(f"Parse cache cleared: {self.db_path}")
@@ -0,0 +1,92 @@
+import unittest
+import os
+import shutil
+import tempfile
+from parsers.checkpoint import CheckpointStore
+from parsers.kindle_parser import KindleClippingsParser
+
+
+def block(i: int, kind: str = "subrayado", location: str = "") -> str:
+    location = location or f"{i}0-{i}9"
+    return (
+        f"Libro {i % 3} (Autor)\r\n"
+        f"- La {kind} en la página {i} | posición {location} | Añadid. el 1 de enero de 2024\r\n\r\n"
+        f"Texto número {i}.\r\n"
+        "==========\r\n"
+    )
+
+
+class TestIncrementalParse(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "My Clippings.txt")
+        self.store = CheckpointStore(os.path.join(self.tmp_dir, "cache"))
+        self.write("".join(block(i) for i in range(6)))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, text: str, mode: str = "w"):
+        with open(self.path, mode, encoding="utf-8", newline="") as f:
+            f.write(text)
+
+    def parse(self, checkpoints=None):
+        parser = KindleClippingsParser(language_code="auto")
+        return parser.parse_file(self.path, checkpoints=checkpoints), parser.get_stats()
+
+    def assertSameResult(self, result, expected):
+        self.assertEqual(result[0], expected[0])
+        for key in ("total", "parsed", "skipped", "failed_blocks"):
+            self.assertEqual(result[1][key], expected[1][key])
+
+    def test_appended_blocks_are_parsed_from_checkpoint(self):
+        self.assertSameResult(self.parse(self.store), self.parse())
+        offset = self.store.load(self.path).offset
+        # Right after the last separator, before its line break
+        self.assertEqual(offset, os.path.getsize(self.path) - 2)
+
+        # A note on an already parsed highlight must still be linked to it
+        self.write(block(6) + block(7, "nota", "12"), mode="a")
+        result = self.parse(self.store)
+
+        self.assertEqual(result[1]["total"], 8)
+        self.assertEqual(result[0][1].tags, ("Texto número 7",))
+        self.assertSameResult(result, self.parse())
+        self.assertGreater(self.store.load(self.path).offset, offset)
+
+    def test_unterminated_block_is_not_checkpointed(self):
+        self.write(block(6).replace("==========\r\n", ""), mode="a")
+        full = self.parse()
+        self.assertEqual(len(full[0]), 7)
+        self.assertSameResult(self.parse(self.store), full)
+
+        # The block is completed by the next write and must not appear twice
+        self.write("==========\r\n" + block(7), mode="a")
+        self.assertSameResult(self.parse(self.store), self.parse())
+        self.assertEqual(len(self.store.load(self.path).clippings), 8)
+
+    def test_changed_prefix_forces_full_parse(self):
+        self.parse(self.store)
+        with open(self.path, "r+b") as f:
+            f.write(b"Tomos")
+
+        result = self.parse(self.store)
+        self.assertEqual(result[0][0].book_title, "Tomos 0")
+        self.assertSameResult(result, self.parse())
+
+    def test_truncated_file_forces_full_parse(self):
+        self.parse(self.store)
+        self.write("".join(block(i) for i in range(2)))
+        self.assertSameResult(self.parse(self.store), self.parse())
+
+    def test_unreadable_checkpoint_is_ignored(self):
+        self.parse(self.store)
+        with open(self.store._path_for(self.path), "wb") as f:
+            f.write(b"garbage")
+
+        self.assertIsNone(self.store.load(self.path))
+        self.assertSameResult(self.parse(self.store), self.parse())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 import os
 import csv
+import io
 from datetime import datetime
 from domain.models import Clipping
 from exporters.csv_exporter import CsvExporter
@@ -46,6 +47,20 @@ class TestCsvExporter(unittest.TestCase):
             self.assertEqual(row["page"], "10")
             self.assertEqual(row["tags"], "tag1, tag2")
 
+    def test_streamed_file_matches_clipboard_string(self):
+        self.exporter.BATCH_SIZE = 2  # Several batches
+        clippings = self.clippings * 3 + [
+            Clipping('Quote "a", b\nnext line', "Book", "Ann", None, is_duplicate=True)
+        ]
+        self.exporter.export(clippings, self.test_file)
+
+        with open(self.test_file, "rb") as f:
+            data = f.read()
+        self.assertTrue(data.startswith(b"\xef\xbb\xbf"))  # UTF-8 BOM for Excel
+        expected = self.exporter.create_csv_string(clippings)
+        self.assertEqual(data[3:].decode("utf-8"), expected)
+        self.assertEqual(len(list(csv.reader(io.StringIO(expected)))), 5)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import json
+import os
+import dateparser
+from parsers.date_engine import DateEngine, compile_date_format
+
+
+LANGUAGES_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources", "languages.json"
+)
+
+
+class TestDateEngine(unittest.TestCase):
+    SAMPLES = {
+        "en": [
+            "Monday, March 4, 2024 10:15:22 PM",
+            "Friday, October 27, 2023 12:00:00 AM",
+            "Monday, January 1, 2024 12:00:00 PM",
+            "Sunday, 8 May 2016 19:21:40",
+            "Monday, 5 March 2012, 14:51:03",
+        ],
+        "es": [
+            "lunes, 4 de marzo de 2024 22:15:22",
+            "sábado 24 de agosto de 2018 10:00:00",
+            "1 de enero de 2024",
+        ],
+        "fr": ["samedi 24 août 2018 10:00:00"],
+        "de": ["Samstag, 24. August 2018 10:00:00"],
+        "it": ["sabato 24 agosto 2018 10:00:00"],
+        "pt": [
+            "sábado, 24 de agosto de 2018 10:00:00",
+            "segunda-feira, 4 de março de 2024 22:15:22",
+            "terça-feira, 5 de março de 2024 08:01:02",
+        ],
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        with open(LANGUAGES_FILE, "r", encoding="utf-8") as f:
+            cls.languages = json.load(f)
+
+    def test_fast_path_matches_dateparser(self):
+        for lang, samples in self.SAMPLES.items():
+            engine = DateEngine(self.languages[lang])
+            for sample in samples:
+                with self.subTest(lang=lang, sample=sample):
+                    date_obj, source = engine.parse(sample)
+                    self.assertEqual(source, "fast_path")
+                    self.assertEqual(date_obj, dateparser.parse(sample))
+
+    def test_repeated_strings_are_cached(self):
+        engine = DateEngine(self.languages["en"])
+        first, source = engine.parse("Monday, March 4, 2024 10:15:22 PM")
+        self.assertEqual(source, "fast_path")
+
+        second, source = engine.parse("Monday, March 4, 2024 10:15:22 PM")
+        self.assertEqual(source, "cached")
+        self.assertEqual(first, second)
+
+    def test_unknown_layout_falls_back_to_dateparser(self):
+        engine = DateEngine(self.languages["en"])
+        date_obj, source = engine.parse("2024-03-04 22:15")
+        self.assertEqual(source, "fallback")
+        self.assertEqual(date_obj, dateparser.parse("2024-03-04 22:15"))
+
+        _, source = engine.parse("not a date at all")
+        self.assertEqual(source, "failed")
+
+    def test_impossible_date_is_not_accepted_by_fast_path(self):
+        engine = DateEngine(self.languages["en"])
+        self.assertIsNone(engine._parse_fast("Monday, February 30, 2024 10:15:22 PM"))
+
+    def test_unsupported_directive(self):
+        with self.assertRaises(ValueError):
+            compile_date_format("%j %Y", "enero")
+
+
+if __name__ == "__main__":
+    unittest.main()
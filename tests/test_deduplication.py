@@ -0,0 +1,236 @@
+import copy
+import random
+import unittest
+from datetime import datetime, timedelta
+from domain.models import Clipping
+from services.deduplication_service import SmartDeduplicator
+from services.identity_service import IdentityService, LshIndex
+
+LONG = "It was the best of times, it was the worst of times, it was the age of wisdom."
+
+
+def highlight(content, location, minute=0, tags=()):
+    return Clipping(
+        content=content,
+        book_title="A Tale of Two Cities",
+        author="Charles Dickens",
+        date_time=datetime(2023, 1, 1) + timedelta(minutes=minute),
+        location=location,
+        tags=tags,
+    )
+
+
+class TestSmartDeduplicator(unittest.TestCase):
+    def setUp(self):
+        self.deduplicator = SmartDeduplicator()
+
+    def flags(self, clippings):
+        self.deduplicator.deduplicate(clippings)
+        return [c.is_duplicate for c in clippings]
+
+    def test_extended_selection_replaces_shorter_one(self):
+        prefix = highlight(LONG[:-1], "100-101", 0, tags=("keep",))
+        full = highlight(LONG, "100-102", 1)
+        self.assertEqual(self.flags([prefix, full]), [True, False])
+        self.assertEqual(full.tags, ("keep",))
+
+    def test_trimmed_selection_is_flagged(self):
+        full = highlight(LONG, "100-102", 0)
+        part = highlight(LONG[13:], "101-102", 1, tags=("t",))
+        self.assertEqual(self.flags([full, part]), [False, True])
+        self.assertEqual(full.tags, ("t",))
+
+    def test_identical_highlights_keep_the_later_one(self):
+        first = highlight(LONG, "100-102", 0)
+        second = highlight(LONG, "100-102", 1)
+        self.assertEqual(self.flags([first, second]), [True, False])
+
+    def test_partial_overlap_keeps_the_longer_text(self):
+        left = highlight(LONG, "100-110", 0)
+        right = highlight(LONG[20:] + " It was the age of foolishness.", "102-110", 1)
+        self.assertEqual(self.flags([left, right]), [True, False])
+
+        # Overlapping less than half of the combined span: both are kept
+        left = highlight(LONG, "100-110", 0)
+        right = highlight(LONG[20:] + " It was the age of foolishness.", "108-130", 1)
+        self.assertEqual(self.flags([left, right]), [False, False])
+
+    def test_distant_locations_are_not_compared(self):
+        first = highlight(LONG, "100-102", 0)
+        second = highlight(LONG, "200-202", 1)
+        self.assertEqual(self.flags([first, second]), [False, False])
+
+    def test_unparseable_locations_sort_first(self):
+        clippings = [
+            highlight(LONG, "", 0),
+            highlight(LONG, "abc", 1),
+            highlight(LONG, "3-4", 2),
+        ]
+        # "" and "abc" both parse as 0 and keep their order; "3" is within the tolerance
+        self.assertEqual(self.flags(clippings), [True, True, False])
+
+    def test_short_accidental_highlights(self):
+        clippings = [
+            highlight("Hi.", "10", 0),
+            highlight("lowercase start of a sentence.", "20", 1),
+            highlight("Ends without punctuation", "30", 2),
+            highlight("Ends without punctuation", "40", 3, tags=("mine",)),
+            highlight("A short but complete sentence.", "50", 4),
+        ]
+        self.assertEqual(self.flags(clippings), [True, True, True, False, False])
+
+    def test_older_notes_at_the_same_location_are_flagged(self):
+        old = highlight("First thought", "100", 0, tags=("a",))
+        new = highlight("Second thought", "100", 5)
+        old.entry_type = new.entry_type = "note"
+        self.assertEqual(self.flags([old, new]), [True, False])
+        self.assertEqual(new.tags, ("a",))
+
+    def test_parallel_matches_serial(self):
+        rng = random.Random(7)
+        clippings = []
+        for i in range(400):
+            start = rng.randint(1, 300)
+            clip = highlight(
+                LONG[rng.randint(0, 20) : rng.randint(30, len(LONG))],
+                f"{start}-{start + rng.randint(0, 4)}",
+                rng.randint(0, 50),
+                tags=("t",) if rng.random() < 0.2 else (),
+            )
+            clip.book_title = f"Book {i % 7}"
+            if rng.random() < 0.2:
+                clip.entry_type = "note"
+            clippings.append(clip)
+
+        serial = SmartDeduplicator().deduplicate(copy.deepcopy(clippings))
+        parallel = SmartDeduplicator(workers=2)
+        parallel.PARALLEL_MIN_CLIPPINGS = 0
+        parallel.BATCH_SIZE = 50
+        result = parallel.deduplicate(clippings)
+
+        def summary(items):
+            return [(c.content, c.book_title, c.is_duplicate, c.tags) for c in items]
+
+        self.assertEqual(summary(result), summary(serial))
+        self.assertTrue(any(c.is_duplicate for c in result))
+
+
+class TestIncrementalDeduplication(unittest.TestCase):
+    def library(self, count, seed):
+        rng = random.Random(seed)
+        clippings = []
+        for i in range(count):
+            start = rng.randint(1, 400)
+            clip = highlight(
+                LONG[rng.randint(0, 20) : rng.randint(30, len(LONG))],
+                rng.choice([f"{start}-{start + rng.randint(-2, 8)}", str(start), "x"]),
+                rng.randint(0, 500),
+                tags=(rng.choice("abc"),) if rng.random() < 0.2 else (),
+            )
+            clip.book_title = f"Book {rng.randrange(4)}"
+            if rng.random() < 0.2:
+                clip.entry_type = "note"
+            clippings.append(clip)
+        return clippings
+
+    @staticmethod
+    def summary(items):
+        return [(c.content, c.location, c.book_title, c.is_duplicate, c.tags) for c in items]
+
+    def test_matches_full_deduplication(self):
+        for seed in range(20):
+            for fuzzy in (False, True):
+                with self.subTest(seed=seed, fuzzy=fuzzy):
+                    clippings = self.library(200, seed)
+                    full = SmartDeduplicator(fuzzy=fuzzy).deduplicate(copy.deepcopy(clippings))
+
+                    deduplicator = SmartDeduplicator(fuzzy=fuzzy)
+                    state = None
+                    for start, end in ((0, 120), (120, 121), (121, 170), (170, 200)):
+                        state = deduplicator.deduplicate_incremental(state, clippings[start:end])
+
+                    self.assertEqual(self.summary(state.clippings), self.summary(full))
+                    self.assertEqual(state.inputs, clippings)
+
+    def test_only_touched_clusters_are_evaluated(self):
+        deduplicator = SmartDeduplicator()
+        kept = highlight(LONG, "100-102", 0)
+        state = deduplicator.deduplicate_incremental(None, [kept])
+
+        # Marked by hand: a cluster that is not touched keeps its flags
+        kept.is_duplicate = True
+        state = deduplicator.deduplicate_incremental(state, [highlight(LONG, "500-502", 1)])
+        self.assertTrue(kept.is_duplicate)
+
+        longer = highlight(LONG + " It was the age of foolishness.", "100-104", 2)
+        state = deduplicator.deduplicate_incremental(state, [longer])
+        self.assertEqual([c.is_duplicate for c in state.clippings], [True, False, False])
+
+    def test_is_prefix_of(self):
+        clippings = self.library(10, 1)
+        clippings[2].entry_type = "note"
+        for clip in clippings:
+            # Like the parser: only highlights get a uid
+            clip.uid = IdentityService.generate_id(clip) if clip.entry_type == "highlight" else ""
+        state = SmartDeduplicator().deduplicate_incremental(None, clippings[:6])
+
+        reparsed = copy.deepcopy(clippings)
+        self.assertTrue(state.is_prefix_of(reparsed))
+        self.assertFalse(state.is_prefix_of(reparsed[:5]))
+        self.assertFalse(state.is_prefix_of(reparsed[1:]))
+
+        reparsed[2].content = "An edited note"
+        self.assertFalse(state.is_prefix_of(reparsed))
+
+        # A note appended to the file tags an old highlight when parsed again
+        reparsed = copy.deepcopy(clippings)
+        reparsed[0].add_tags(["new tag"])
+        self.assertFalse(state.is_prefix_of(reparsed))
+
+
+class TestNearDuplicates(unittest.TestCase):
+    def test_similar_signatures_share_a_band(self):
+        words = IdentityService.words(LONG)
+        index = LshIndex()
+        index.add("same", IdentityService.minhash(words))
+        index.add("other", IdentityService.minhash("a passage about the sea and the sky".split()))
+        found = index.candidates(IdentityService.minhash(words + ["and", "foolishness"]))
+        self.assertIn("same", found)
+        self.assertNotIn("other", found)
+        self.assertEqual(IdentityService.minhash(()), b"")
+        self.assertEqual(index.candidates(b""), set())
+
+    def test_signature_is_cached_by_content(self):
+        clip = highlight(LONG, "100")
+        clip.uid = "cached-uid"
+        signature = IdentityService.minhash_signature(clip)
+        self.assertIs(IdentityService.minhash_signature(highlight(LONG, "900")), signature)
+
+        # An edited clipping keeps its uid but not its signature
+        clip.content = "Something else entirely."
+        self.assertNotEqual(IdentityService.minhash_signature(clip), signature)
+
+    def test_fuzzy_pass_merges_across_renamed_books(self):
+        original = highlight(LONG, "100-102", 0, tags=("a",))
+        renamed = highlight(LONG.replace("times,", "times;") + " Indeed.", "880-882", 1)
+        renamed.book_title = "A Tale of Two Cities (Penguin Classics)"
+        other = highlight("An entirely different passage about the sea and the sky.", "5", 2)
+
+        self.assertEqual(
+            [c.is_duplicate for c in SmartDeduplicator().deduplicate([original, renamed, other])],
+            [False, False, False],
+        )
+        result = SmartDeduplicator(fuzzy=True).deduplicate([original, renamed, other])
+        self.assertEqual([c.is_duplicate for c in result], [True, False, False])
+        self.assertEqual(renamed.tags, ("a",))
+
+    def test_fuzzy_pass_ignores_short_highlights(self):
+        first = highlight("It was the best.", "10", 0)
+        second = highlight("It was the best!", "900", 1)
+        second.book_title = "Another Book"
+        result = SmartDeduplicator(fuzzy=True).deduplicate([first, second])
+        self.assertEqual([c.is_duplicate for c in result], [False, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
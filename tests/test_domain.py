@@ -1,3 +1,4 @@
+import sys
 import unittest
 from datetime import datetime
 from domain.models import Clipping
@@ -30,6 +31,19 @@ class TestClippingModel(unittest.TestCase):
         # This is a placeholder for future logic if models get methods.
         pass
 
+    def test_compact_representation(self):
+        title = "".join(["Test ", "Book"])  # Not a compile-time constant
+        clip = Clipping("Text", title, "Author", datetime.now(), tags=["a", "b"])
+
+        self.assertFalse(hasattr(clip, "__dict__"))
+        self.assertIs(clip.book_title, sys.intern("Test Book"))
+        self.assertEqual(clip.tags, ("a", "b"))
+
+    def test_add_tags_keeps_order_without_duplicates(self):
+        clip = Clipping("Text", "Book", "Author", datetime.now(), tags=("a",))
+        clip.add_tags(["b", "a", "c", "b"])
+        self.assertEqual(clip.tags, ("a", "b", "c"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,7 +1,22 @@
 import unittest
-from datetime import datetime
-from exporters.joplin_exporter import JoplinEntityBuilder
+import gzip
+import io
+import lzma
+import os
+import tarfile
+import tempfile
+from datetime import datetime, timezone
+from unittest.mock import patch
+from exporters.base import reproducible_timestamp
+from exporters.csv_exporter import CsvExporter
+from exporters.joplin_exporter import JoplinEntityBuilder, JoplinExporter
+from exporters.json_exporter import JsonExporter
+from exporters.markdown_exporter import MarkdownExporter
+from exporters import jex_compression
+from exporters.jex_writer import JexTarWriter
+from exporters.joplin_serializer import render_entity_generic, serialize_entity
 from domain.joplin import JoplinEntityType
+from domain.models import Clipping
 
 
 class TestJoplinEntityBuilder(unittest.TestCase):
@@ -68,5 +83,287 @@ class TestJoplinEntityBuilder(unittest.TestCase):
         self.assertEqual(assoc.type_, JoplinEntityType.NOTE_TAG)
 
 
+class TestJexExport(unittest.TestCase):
+    def test_writer_matches_tarfile(self):
+        entries = [("a.md", b"x" * 700), ("b.md", b""), ("c.md", "ñ".encode("utf-8") * 512)]
+
+        expected = io.BytesIO()
+        with tarfile.open(fileobj=expected, mode="w:", format=tarfile.USTAR_FORMAT) as tar:
+            for name, payload in entries:
+                info = tarfile.TarInfo(name)
+                info.size = len(payload)
+                info.mtime = 1700000000
+                tar.addfile(info, io.BytesIO(payload))
+
+        result = io.BytesIO()
+        with JexTarWriter(result, mtime=1700000000) as writer:
+            for name, payload in entries:
+                writer.add(name, payload)
+
+        self.assertEqual(result.getvalue(), expected.getvalue())
+
+    def test_export_streams_all_entities(self):
+        clippings = [
+            Clipping("One", "Book", "Ann", datetime(2024, 1, 1), "10", tags=("Tag", "other")),
+            Clipping("Two", "Book", "Ann", datetime(2024, 1, 2), "20", tags=("tag",)),
+            Clipping("Dup", "Book", "Ann", datetime(2024, 1, 3), "30", is_duplicate=True),
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output = os.path.join(tmp_dir, "out")
+            exporter = JoplinExporter()
+            exporter.export(clippings, output, {"root_notebook": "Root"})
+
+            with tarfile.open(output + ".jex") as tar:
+                contents = [tar.extractfile(m).read().decode("utf-8") for m in tar.getmembers()]
+
+        # Root, author and book notebooks, 2 notes, 2 tags, 3 tag associations
+        self.assertEqual(exporter.entities_written, 10)
+        self.assertEqual(len(contents), 10)
+        types = [content.rsplit("type_: ", 1)[1] for content in contents]
+        self.assertEqual(types.count("2"), 3)
+        self.assertEqual(types.count("1"), 2)
+        self.assertEqual(types.count("5"), 2)
+        self.assertEqual(types.count("6"), 3)
+        self.assertTrue(contents[0].startswith("Root\n\nid: "))
+        self.assertIn("\n\nOne\n\n\n-----\n", contents[3])
+
+    @patch.object(JoplinEntityBuilder, "_now", staticmethod(lambda: "2024-01-01T00:00:00.000Z"))
+    @patch("exporters.jex_writer.datetime")
+    def test_parallel_export_matches_serial(self, mock_datetime):
+        mock_datetime.now.return_value = datetime(2024, 1, 1)
+        clippings = [
+            Clipping(
+                f"Text {i}",
+                f"Book {i % 4}",
+                f"Author {i % 3}",
+                datetime(2024, 1, 1, i % 24),
+                str(i),
+                tags=(f"t{i % 5}",) if i % 2 else (),
+                is_duplicate=i % 11 == 0,
+            )
+            for i in range(60)
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            serial_path = os.path.join(tmp_dir, "serial")
+            parallel_path = os.path.join(tmp_dir, "parallel")
+            JoplinExporter().export(clippings, serial_path)
+
+            parallel = JoplinExporter()
+            parallel.RENDER_BATCH_SIZE = 7
+            parallel.export(clippings, parallel_path, {"workers": 2})
+
+            with open(serial_path + ".jex", "rb") as f1, open(parallel_path + ".jex", "rb") as f2:
+                self.assertEqual(f1.read(), f2.read())
+
+
+class TestJoplinSerializer(unittest.TestCase):
+    def test_compiled_templates_match_generic_rendering(self):
+        note = JoplinEntityBuilder.create_note("{0} title", "Body {x}", "parent", author="Me")
+        empty_note = JoplinEntityBuilder.create_note("Title", "", "parent")
+        odd_note = JoplinEntityBuilder.create_note("Title", "Body", "parent")
+        odd_note.author = None
+        odd_note.type_ = JoplinEntityType.FOLDER
+
+        entities = [
+            JoplinEntityBuilder.create_notebook("Notebook", parent_id="root"),
+            note,
+            empty_note,
+            odd_note,
+            JoplinEntityBuilder.create_tag("tag"),
+            JoplinEntityBuilder.create_tag_association("tag1", "note1"),
+        ]
+        for entity in entities:
+            with self.subTest(entity=type(entity).__name__):
+                self.assertEqual(serialize_entity(entity), render_entity_generic(entity))
+
+        self.assertTrue(serialize_entity(note).startswith("{0} title\n\nBody {x}\n\nid: "))
+        self.assertTrue(serialize_entity(note).endswith("\nmarkup_language: 1\ntype_: 1"))
+        self.assertNotIn("author", serialize_entity(odd_note))
+
+
+class TestReproducibleExport(unittest.TestCase):
+    def setUp(self):
+        self.clippings = [
+            Clipping("One", "Book", "Ann", datetime(2024, 1, 1), "10", tags=("Tag",)),
+            Clipping("Two", "Other", "Bob", datetime(2024, 3, 5, 8), "20"),
+            Clipping("Undated note", "Book", "Ann", None, "12", entry_type="note"),
+        ]
+
+    def _export_twice(self, exporter, extension, workers=1):
+        """Exports the clippings, then the reversed list at another wall-clock time."""
+        context = {"reproducible": True, "workers": workers}
+        results = []
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output = os.path.join(tmp_dir, "out")
+            for clippings, now in ((self.clippings, 1), (self.clippings[::-1], 2)):
+                with patch.object(
+                    JoplinEntityBuilder, "_now", staticmethod(lambda: f"200{now}-01-01")
+                ):
+                    exporter.export(clippings, output, context)
+                with open(output + extension, "rb") as f:
+                    results.append(f.read())
+            with open(output + extension + ".sha256", encoding="utf-8") as f:
+                digest_line = f.read()
+        self.assertEqual(results[0], results[1])
+        self.assertTrue(exporter.unchanged)
+        self.assertEqual(digest_line, f"{exporter.last_digest}  out{extension}\n")
+        return results[0]
+
+    def test_all_formats_are_byte_identical(self):
+        for exporter, extension in (
+            (JoplinExporter(), ".jex"),
+            (MarkdownExporter(), ".zip"),
+            (JsonExporter(), ".json"),
+            (CsvExporter(), ".csv"),
+        ):
+            with self.subTest(extension=extension):
+                self._export_twice(exporter, extension)
+
+    def test_jex_times_come_from_clippings(self):
+        data = self._export_twice(JoplinExporter(), ".jex")
+        with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+            members = tar.getmembers()
+            contents = [tar.extractfile(m).read().decode("utf-8") for m in members]
+
+        newest = datetime(2024, 3, 5, 8, tzinfo=timezone.utc)
+        self.assertEqual({m.mtime for m in members}, {int(newest.timestamp())})
+        self.assertIn("created_time: 2024-03-05T08:00:00.000Z", contents[0])
+        undated = next(c for c in contents if c.startswith("[0001] Undated"))
+        self.assertIn("created_time: 2024-03-05T08:00:00.000Z", undated)
+
+    def test_parallel_jex_is_reproducible(self):
+        serial = self._export_twice(JoplinExporter(), ".jex")
+        self.assertEqual(self._export_twice(JoplinExporter(), ".jex", workers=2), serial)
+
+    def test_changed_export_is_reported(self):
+        exporter = JsonExporter()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output = os.path.join(tmp_dir, "out")
+            exporter.export(self.clippings, output, {"reproducible": True})
+            first = exporter.last_digest
+            exporter.export(self.clippings[:2], output, {"reproducible": True})
+        self.assertFalse(exporter.unchanged)
+        self.assertNotEqual(exporter.last_digest, first)
+
+    def test_timestamp_sources(self):
+        self.assertEqual(
+            reproducible_timestamp(self.clippings),
+            datetime(2024, 3, 5, 8, tzinfo=timezone.utc),
+        )
+        with patch.dict(os.environ, {"SOURCE_DATE_EPOCH": "1700000000"}):
+            self.assertEqual(reproducible_timestamp(self.clippings).timestamp(), 1700000000)
+            fixed = {"timestamp": datetime(2020, 1, 1, tzinfo=timezone.utc)}
+            self.assertEqual(reproducible_timestamp(self.clippings, fixed).year, 2020)
+        # Zip entries cannot be dated before 1980
+        self.assertEqual(reproducible_timestamp([]).year, 1980)
+
+
+class TestDeltaExport(unittest.TestCase):
+    def _export(self, exporter, clippings, output, workers=1):
+        exporter.export(clippings, output, {"since_last": True, "workers": workers})
+        with tarfile.open(output + ".jex") as tar:
+            return [tar.extractfile(m).read().decode("utf-8") for m in tar.getmembers()]
+
+    def test_only_new_or_changed_notes_are_exported(self):
+        clippings = [
+            Clipping("One", "Book", "Ann", datetime(2024, 1, 1), "10", tags=("Tag",)),
+            Clipping("Two", "Other", "Bob", datetime(2024, 1, 2), "20", tags=("Tag",)),
+        ]
+        exporter = JoplinExporter()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output = os.path.join(tmp_dir, "out")
+            first = self._export(exporter, clippings, output)
+            self.assertEqual(len(first), 10)
+            self.assertTrue(os.path.exists(output + ".jex.manifest.json"))
+
+            # Nothing changed: only the root notebook
+            self.assertEqual(len(self._export(exporter, clippings, output)), 1)
+            self.assertEqual(exporter.skipped_unchanged, 2)
+
+            # One edited and one new note, both in Bob's book: Ann's notebooks are left out
+            edited = Clipping("Two, edited", "Other", "Bob", datetime(2024, 1, 2), "20")
+            new = Clipping("Three", "Other", "Bob", datetime(2024, 1, 3), "30", tags=("New",))
+            contents = self._export(exporter, [clippings[0], edited, new], output, workers=2)
+
+        titles = [content.split("\n", 1)[0] for content in contents]
+        self.assertEqual(titles[:3], ["Kindle Imports", "BOB", "Other"])
+        self.assertEqual(len(contents), 7)  # 3 notebooks, 2 notes, 1 tag, 1 association
+        self.assertTrue(any("Two, edited" in content for content in contents))
+        self.assertFalse(any(content.startswith("ANN") for content in contents))
+        self.assertEqual(exporter.skipped_unchanged, 1)
+
+
+class TestJexCompression(unittest.TestCase):
+    def setUp(self):
+        self.clippings = [
+            Clipping(f"Text {i}", f"Book {i % 3}", "Ann", datetime(2024, 1, 1, i), str(i))
+            for i in range(20)
+        ]
+
+    def _export(self, tmp_dir, context):
+        exporter = JoplinExporter()
+        exporter.export(self.clippings, os.path.join(tmp_dir, "out"), context)
+        return exporter
+
+    def test_codecs_produce_valid_archives(self):
+        codecs = ["gzip", "xz"] + (["zstd"] if jex_compression.zstandard else [])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            plain = self._export(tmp_dir, {"reproducible": True})
+            with open(os.path.join(tmp_dir, "out.jex"), "rb") as f:
+                plain_bytes = f.read()
+
+            for codec, level in [(codec, level) for codec in codecs for level in (None, "fast")]:
+                with self.subTest(codec=codec, level=level):
+                    exporter = self._export(
+                        tmp_dir,
+                        {
+                            "compression": codec,
+                            "compression_level": level,
+                            "verify": True,
+                            "reproducible": True,
+                        },
+                    )
+                    path = jex_compression.archive_path(os.path.join(tmp_dir, "out"), codec)
+                    self.assertEqual(exporter.entities_written, plain.entities_written)
+                    self.assertEqual(exporter.archive_stats["raw_bytes"], len(plain_bytes))
+                    self.assertLess(exporter.archive_stats["archive_bytes"], len(plain_bytes))
+                    if codec != "zstd":
+                        with open(path, "rb") as f:
+                            opener = gzip.open if codec == "gzip" else lzma.open
+                            with opener(f) as stream:
+                                self.assertEqual(stream.read(), plain_bytes)
+
+    def test_levels_are_validated(self):
+        self.assertEqual(jex_compression.resolve_level("gzip", "5"), 5)
+        self.assertEqual(jex_compression.resolve_level("xz", "fast"), 0)
+        for codec, level in [("gzip", 12), ("xz", -1), ("zstd", 0), ("gzip", "high")]:
+            with self.subTest(codec=codec, level=level):
+                with self.assertRaises(ValueError):
+                    jex_compression.resolve_level(codec, level)
+
+    def test_gzip_keeps_importable_extension(self):
+        self.assertEqual(jex_compression.archive_path("out", "gzip"), "out.jex")
+        self.assertEqual(jex_compression.archive_path("out.jex", "xz"), "out.jex.xz")
+        self.assertEqual(jex_compression.archive_path("out.jex.zst", "zstd"), "out.jex.zst")
+
+    def test_invalid_codec(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with self.assertRaises(ValueError):
+                self._export(tmp_dir, {"compression": "bz3"})
+            with patch.object(jex_compression, "zstandard", None):
+                with self.assertRaises(ValueError):
+                    self._export(tmp_dir, {"compression": "zstd"})
+
+    def test_verify_detects_truncated_archive(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._export(tmp_dir, {"compression": "gzip"})
+            path = os.path.join(tmp_dir, "out.jex")
+            with open(path, "r+b") as f:
+                f.truncate(os.path.getsize(path) // 2)
+            with self.assertRaises((EOFError, tarfile.TarError)):
+                jex_compression.verify_archive(path, "gzip")
+
+
 if __name__ == "__main__":
     unittest.main()
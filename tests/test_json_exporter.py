@@ -1,9 +1,13 @@
 import unittest
 import os
 import json
+import shutil
+import tempfile
 from datetime import datetime
 from domain.models import Clipping
+from services.clippings_service import ClippingsService
 from exporters.json_exporter import JsonExporter
+from parsers.json_parser import JsonClippingsReader
 
 
 class TestJsonExporter(unittest.TestCase):
@@ -50,6 +54,91 @@ class TestJsonExporter(unittest.TestCase):
             self.assertEqual(item["book_title"], "Test Book")
             self.assertEqual(item["tags"], ["tag1"])
 
+    def test_streamed_document_matches_json_dumps(self):
+        clippings = self.clippings + [
+            Clipping('Multi\nline "quoted" ñ', "Other", "Ann", None, tags=("a", "b")),
+        ]
+        for items in ([], self.clippings, clippings):
+            expected = json.dumps(
+                {
+                    "meta": {
+                        "count": len(items),
+                        "generated_at": None,
+                        "creator": "Test User",
+                        "source": "KindleClippingsToJEX",
+                    },
+                    "clippings": [self.exporter.clipping_to_dict(clip) for clip in items],
+                },
+                indent=2,
+                ensure_ascii=False,
+            )
+            self.assertEqual(self.exporter.create_json_string(items, self.context), expected)
+
+
+class TestJsonLinesAndReader(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.clippings = [
+            Clipping(
+                f'Text {i} "quoted"\n{"x" * (i * 7)}',
+                f"Book {i % 3}",
+                "Ann",
+                datetime(2024, 1, 1, i % 24) if i % 5 else None,
+                str(i * 10),
+                page=str(i),
+                entry_type="note" if i % 4 == 0 else "highlight",
+                tags=("t1", "t2") if i % 2 else (),
+                is_duplicate=i % 9 == 0,
+            )
+            for i in range(40)
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_json_lines_export(self):
+        output = os.path.join(self.tmp_dir, "out")
+        JsonExporter(lines=True).export(self.clippings, output)
+
+        with open(output + ".jsonl", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 40)
+        self.assertEqual(json.loads(lines[1])["content"], self.clippings[1].content)
+
+    def test_reader_roundtrip_both_formats(self):
+        for lines, extension in ((False, ".json"), (True, ".jsonl")):
+            with self.subTest(extension=extension):
+                output = os.path.join(self.tmp_dir, "out")
+                JsonExporter(lines=lines).export(self.clippings, output, {"creator": "Me"})
+
+                # A tiny chunk size makes values straddle buffer boundaries
+                reader = JsonClippingsReader(output + extension, chunk_size=16)
+                restored = list(reader)
+                self.assertEqual(
+                    [(c.content, c.date_time, c.entry_type, c.tags) for c in restored],
+                    [(c.content, c.date_time, c.entry_type, c.tags) for c in self.clippings],
+                )
+                self.assertTrue(restored[9].is_duplicate)
+                if not lines:
+                    self.assertEqual(reader.meta["meta"]["creator"], "Me")
+
+    def test_reader_handles_key_order_and_empty_list(self):
+        path = os.path.join(self.tmp_dir, "manual.json")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"clippings": [], "meta": {"count": 0}}')
+        reader = JsonClippingsReader(path)
+        self.assertEqual(list(reader), [])
+        self.assertEqual(reader.meta, {"meta": {"count": 0}})
+
+    def test_service_loads_json_export(self):
+        output = os.path.join(self.tmp_dir, "out")
+        JsonExporter().export(self.clippings, output)
+
+        service = ClippingsService(language_code="en")
+        loaded = service.load_clippings(output + ".json")
+        self.assertEqual(len(loaded), 40)
+        self.assertEqual(service.parser.get_stats()["parsed"], 40)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,10 +1,17 @@
 import unittest
 import os
 import zipfile
+import io
+import shutil
+import tempfile
+from unittest.mock import patch
 from datetime import datetime
 from domain.models import Clipping
 from domain.constants import GENERATOR_STRING
 from exporters.markdown_exporter import MarkdownExporter
+from exporters import zip_writer
+from exporters.zip_writer import ZipStreamWriter, deflate_entry
+from services.identity_service import IdentityService
 
 
 class TestMarkdownExporter(unittest.TestCase):
@@ -26,8 +33,9 @@ class TestMarkdownExporter(unittest.TestCase):
         ]
 
     def tearDown(self):
-        if os.path.exists(self.test_file):
-            os.remove(self.test_file)
+        for path in (self.test_file, self.test_file + ".sha256"):
+            if os.path.exists(path):
+                os.remove(path)
 
     def test_export_structure_and_metadata(self):
         self.exporter.export_clippings(self.clippings, self.test_file, self.context)
@@ -62,6 +70,171 @@ class TestMarkdownExporter(unittest.TestCase):
             self.assertNotIn("geo_lat:", content)
             self.assertNotIn("geo_lon:", content)
 
+    def test_filenames_survive_content_edits(self):
+        clip = Clipping("Quote", "Book", "Ann", datetime(2024, 1, 2, 3, 4, 5), "10", page="7")
+        name = self.exporter._generate_filename(clip)
+        self.assertEqual(name, "Page 7 - 20240102030405_152b7641.md")
+
+        # Editing the content (which gives the clipping a new uid) keeps the file name
+        clip.content = "Quote, fixed typo"
+        clip.uid = IdentityService.generate_id(clip)
+        self.assertEqual(self.exporter._generate_filename(clip), name)
+
+        clip.location = "11"
+        self.assertNotEqual(self.exporter._generate_filename(clip), name)
+
+    def test_clashing_paths_get_a_suffix(self):
+        clip = Clipping("Same", "Book", "Ann", None, "10")
+        other_case = Clipping("Same", "BOOK", "Ann", None, "10")
+        paths = [path for path, _ in self.exporter._entry_paths([clip, clip, other_case])]
+        self.assertEqual(
+            paths,
+            [
+                "ANN/Book/Loc 10 - 000000_04a5407d.md",
+                "ANN/Book/Loc 10 - 000000_04a5407d (2).md",
+                "ANN/BOOK/Loc 10 - 000000_04a5407d (3).md",
+            ],
+        )
+
+    def test_reproducible_export_ignores_input_order(self):
+        # Same path, so the suffixes must not depend on which clipping comes first
+        clippings = [Clipping(f"Quote {i}", "Book", "Ann", None, "10") for i in range(3)]
+        archives = []
+        for order in (clippings, clippings[::-1]):
+            self.exporter.export(order, self.test_file, {"reproducible": True})
+            with open(self.test_file, "rb") as f:
+                archives.append(f.read())
+        self.assertEqual(archives[0], archives[1])
+
+    def test_parallel_export_matches_serial(self):
+        clippings = [
+            Clipping(f"Quote {i}", f"Book {i % 4}", f"Author {i % 3}", None, str(i), page=str(i))
+            for i in range(30)
+        ]
+        context = {"reproducible": True}
+        self.exporter.export(clippings, self.test_file, context)
+        with open(self.test_file, "rb") as f:
+            serial = f.read()
+
+        parallel = MarkdownExporter()
+        parallel.RENDER_BATCH_SIZE = 4
+        parallel.export(clippings, self.test_file, {**context, "workers": 2})
+        with open(self.test_file, "rb") as f:
+            self.assertEqual(f.read(), serial)
+
+        with zipfile.ZipFile(self.test_file) as zipf:
+            self.assertIsNone(zipf.testzip())
+            self.assertEqual(len(zipf.namelist()), 30)
+
+
+class TestDirectoryExport(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.vault = os.path.join(self.tmp_dir, "vault")
+        self.exporter = MarkdownExporter(directory=True)
+        self.clippings = [
+            Clipping("First", "Book A", "Ann", datetime(2024, 1, 1), "10", page="1"),
+            Clipping("Second", "Book A", "Ann", datetime(2024, 1, 2), "20", page="2"),
+            Clipping("Third", "Book B", "Bob", datetime(2024, 1, 3), "30", page="3"),
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _files(self):
+        return sorted(
+            os.path.relpath(os.path.join(root, name), self.vault).replace(os.sep, "/")
+            for root, _, names in os.walk(self.vault)
+            for name in names
+        )
+
+    def test_only_changed_files_are_written(self):
+        self.exporter.export(self.clippings, self.vault, {"fsync_batch": 2})
+        self.assertEqual(
+            self.exporter.sync_stats, {"written": 3, "unchanged": 0, "removed": 0, "kept": 0}
+        )
+        with open(os.path.join(self.vault, "notes.md"), "w", encoding="utf-8") as f:
+            f.write("My own note")
+        first_files = self._files()
+
+        self.exporter.export(self.clippings, self.vault)
+        self.assertEqual(
+            self.exporter.sync_stats, {"written": 0, "unchanged": 3, "removed": 0, "kept": 0}
+        )
+        self.assertEqual(self._files(), first_files)
+
+        # Edited content rewrites the same note file; Bob's note is gone along with his folders
+        edited = Clipping("First, edited", "Book A", "Ann", datetime(2024, 1, 1), "10", page="1")
+        self.exporter.export([edited, self.clippings[1]], self.vault)
+        self.assertEqual(
+            self.exporter.sync_stats, {"written": 1, "unchanged": 1, "removed": 1, "kept": 0}
+        )
+
+        files = self._files()
+        self.assertIn("notes.md", files)
+        self.assertFalse(os.path.exists(os.path.join(self.vault, "BOB")))
+        self.assertEqual(len([name for name in files if name.startswith("ANN/Book A/")]), 2)
+        page_1 = next(name for name in files if name.startswith("ANN/Book A/Page 1"))
+        with open(os.path.join(self.vault, *page_1.split("/")), encoding="utf-8") as f:
+            self.assertIn("First, edited", f.read())
+
+    def test_existing_identical_files_are_adopted(self):
+        self.exporter.export(self.clippings, self.vault)
+        os.remove(os.path.join(self.vault, ".kindle-export.json"))
+
+        self.exporter.export(self.clippings, self.vault)
+        self.assertEqual(self.exporter.sync_stats["unchanged"], 3)
+
+    def test_user_edited_files_are_kept(self):
+        self.exporter.export(self.clippings, self.vault)
+        notes = [name for name in self._files() if name.endswith(".md")]
+        book_a = [name for name in notes if name.startswith("ANN/")]
+        book_b = [name for name in notes if name.startswith("BOB/")]
+        for name in book_a[:1] + book_b:
+            with open(os.path.join(self.vault, *name.split("/")), "a", encoding="utf-8") as f:
+                f.write("\nMy own thoughts")
+
+        # The edited note of Book A changes and Bob's is no longer exported: both stay
+        edited = Clipping("First, edited", "Book A", "Ann", datetime(2024, 1, 1), "10", page="1")
+        with self.assertLogs("KindleToJex.DirectorySync", level="WARNING"):
+            self.exporter.export([edited, self.clippings[1]], self.vault)
+        self.assertEqual(self.exporter.sync_stats["kept"], 2)
+        for name in book_a[:1] + book_b:
+            with open(os.path.join(self.vault, *name.split("/")), encoding="utf-8") as f:
+                self.assertIn("My own thoughts", f.read())
+
+        # Until the export is forced
+        self.exporter.export([edited, self.clippings[1]], self.vault, {"force": True})
+        self.assertEqual(self.exporter.sync_stats["kept"], 0)
+        self.assertFalse(os.path.exists(os.path.join(self.vault, "BOB")))
+
+
+class TestZipStreamWriter(unittest.TestCase):
+    def test_matches_zipfile_writestr(self):
+        members = [(f"AUTORÍA/Libro {i}/nota {i}.md", b"text " * i) for i in range(8)]
+        date_time = (2024, 5, 6, 7, 8, 10)
+
+        # The second pass forces the ZIP64 end records used past 65535 members
+        for count_limit in (zipfile.ZIP_FILECOUNT_LIMIT, 5):
+            with (
+                patch.object(zipfile, "ZIP_FILECOUNT_LIMIT", count_limit),
+                patch.object(zip_writer, "ZIP_FILECOUNT_LIMIT", count_limit),
+            ):
+                expected = io.BytesIO()
+                with zipfile.ZipFile(expected, "w", zipfile.ZIP_DEFLATED) as zipf:
+                    for name, data in members:
+                        info = zipfile.ZipInfo(name, date_time=date_time)
+                        info.compress_type = zipfile.ZIP_DEFLATED
+                        info.external_attr = 0o600 << 16
+                        zipf.writestr(info, data)
+
+                result = io.BytesIO()
+                with ZipStreamWriter(result, date_time=date_time) as writer:
+                    for name, data in members:
+                        writer.add(name, *deflate_entry(data))
+
+            self.assertEqual(result.getvalue(), expected.getvalue())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,8 @@
+import hashlib
 import unittest
+from dataclasses import replace
 from datetime import datetime
+from unittest.mock import patch
 from services.identity_service import IdentityService
 from utils.title_cleaner import TitleCleaner
 from domain.models import Clipping
@@ -55,6 +58,56 @@ class TestNewFeatures(unittest.TestCase):
             "Similar content at same location should be duplicate",
         )
 
+    def test_identity_service_caches_ids(self):
+        """IDs are computed once per clipping and once per entity seed."""
+        IdentityService.clear_cache()
+        note = Clipping(content="A note", book_title="B", author="A", date_time=None, location="10")
+        note.entry_type = "note"
+        expected = IdentityService.generate_id(note)
+
+        self.assertEqual(IdentityService.clipping_id(note), expected)
+        self.assertEqual(IdentityService.clipping_id(note), expected)
+        self.assertEqual(note.uid, "", "Only highlights get a uid")
+        note.uid = "stored"
+        self.assertEqual(IdentityService.clipping_id(note), "stored")
+
+        seed_id = hashlib.md5(b"tag:kindle").hexdigest()
+        self.assertEqual(IdentityService.entity_id("tag:kindle"), seed_id)
+        self.assertEqual(IdentityService.entity_id("tag:kindle"), seed_id)
+        self.assertEqual(IdentityService.entity_id("tag:kindle", cache=False), seed_id)
+
+        self.assertEqual(IdentityService.stats["id_hits"], 2)
+        self.assertEqual(IdentityService.stats["id_misses"], 1)
+        self.assertEqual(IdentityService.stats["entity_id_hits"], 1)
+        self.assertAlmostEqual(IdentityService.hit_rates()["entity_id"], 0.5)
+
+        IdentityService.clear_cache()
+        self.assertEqual(IdentityService.stats["id_hits"], 0)
+
+    def test_identity_service_duplicates_use_current_fields(self):
+        """An edited clipping keeps its uid, but no longer strictly matches its old self."""
+        original = Clipping("Foo bar baz", "B", "A", None, location="10")
+        original.uid = IdentityService.generate_id(original)
+        edited = replace(original, content="Completely different words here")
+        edited.location = "20"
+
+        self.assertEqual(IdentityService.clipping_id(edited), original.uid)
+        self.assertFalse(IdentityService.is_duplicate(original, edited))
+
+    def test_identity_service_assign_ids(self):
+        """Bulk imports get the uids the parser would give, also from a process pool."""
+        clippings = [Clipping(f"Highlight {i}", "B", "A", None, location=str(i)) for i in range(30)]
+        clippings[0].entry_type = "note"
+        expected = [IdentityService.generate_id(c) for c in clippings]
+
+        with patch.object(IdentityService, "PARALLEL_MIN_CLIPPINGS", 0):
+            with patch.object(IdentityService, "BATCH_SIZE", 7):
+                self.assertEqual(IdentityService.assign_ids(clippings, workers=2), 29)
+
+        self.assertEqual(clippings[0].uid, "")
+        self.assertEqual([c.uid for c in clippings[1:]], expected[1:])
+        self.assertEqual(IdentityService.assign_ids(clippings), 0)
+
     def test_title_cleaner(self):
         """Test title cleaning logic."""
         cases = [
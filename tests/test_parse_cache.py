@@ -0,0 +1,104 @@
+import unittest
+import os
+import pickle
+import shutil
+import sqlite3
+import zlib
+from contextlib import closing
+import tempfile
+from datetime import datetime
+from unittest.mock import patch
+from domain.models import Clipping
+from services.clippings_service import ClippingsService
+from services.parse_cache import ParseCache
+
+CLIPPINGS = (
+    "Book (Author)\n"
+    "- Your Highlight on page 1 | Loc. 10-12 | Added on Monday, March 4, 2024 10:15:22 PM\n\n"
+    "Some text.\n"
+    "==========\n"
+)
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "My Clippings.txt")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(CLIPPINGS)
+        self.cache = ParseCache(os.path.join(self.tmp_dir, "cache"))
+        self.clippings = [Clipping("Text", "Book", "Author", datetime(2024, 1, 1), uid="abc")]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_roundtrip_and_invalidation(self):
+        self.assertIsNone(self.cache.get(self.path, "en", 1))
+        self.cache.put(self.path, "en", 1, self.clippings, {"parsed": 1})
+
+        self.assertEqual(self.cache.get(self.path, "en", 1), (self.clippings, {"parsed": 1}))
+        self.assertIsNone(self.cache.get(self.path, "es", 1))
+        self.assertIsNone(self.cache.get(self.path, "en", 2))
+
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(CLIPPINGS)
+        self.assertIsNone(self.cache.get(self.path, "en", 1))
+
+    def test_same_size_edit_is_detected(self):
+        self.cache.put(self.path, "en", 1, self.clippings, {})
+        with open(self.path, "r+b") as f:
+            f.write(b"Cook")
+        self.assertIsNone(self.cache.get(self.path, "en", 1))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        self.cache.max_entries = 2
+        paths = []
+        for i in range(3):
+            path = os.path.join(self.tmp_dir, f"clippings_{i}.txt")
+            shutil.copy(self.path, path)
+            paths.append(path)
+
+        self.cache.put(paths[0], "en", 1, self.clippings, {})
+        self.cache.put(paths[1], "en", 1, self.clippings, {})
+        self.assertIsNotNone(self.cache.get(paths[0], "en", 1))  # Now more recent than paths[1]
+        self.cache.put(paths[2], "en", 1, self.clippings, {})
+
+        self.assertIsNotNone(self.cache.get(paths[0], "en", 1))
+        self.assertIsNone(self.cache.get(paths[1], "en", 1))
+        self.assertIsNotNone(self.cache.get(paths[2], "en", 1))
+
+    def test_unreadable_entries_are_misses(self):
+        self.cache.put(self.path, "en", 1, self.clippings, {})
+        payloads = [
+            zlib.compress(pickle.dumps((self.clippings, {}))),  # Older pickle entries
+            zlib.compress(b'{"format": 1, "clippings": [["too", "short"]], "stats": {}}'),
+            b"not compressed",
+        ]
+        for payload in payloads:
+            with self.subTest(payload=payload[:20]):
+                with closing(sqlite3.connect(self.cache.db_path)) as conn, conn:
+                    conn.execute("UPDATE parse_results SET payload = ?", (payload,))
+                self.assertIsNone(self.cache.get(self.path, "en", 1))
+
+    def test_clear(self):
+        self.cache.put(self.path, "en", 1, self.clippings, {})
+        self.cache.clear()
+        self.assertIsNone(self.cache.get(self.path, "en", 1))
+
+    def test_service_skips_parsing_unchanged_file(self):
+        cache_dir = os.path.join(self.tmp_dir, "cache")
+        first = ClippingsService(language_code="en", cache_dir=cache_dir)
+        expected = first.load_clippings(self.path)
+        self.assertEqual(len(expected), 1)
+
+        second = ClippingsService(language_code="en", cache_dir=cache_dir)
+        with patch.object(second.parser, "parse_file") as parse_file:
+            result = second.load_clippings(self.path)
+
+        parse_file.assert_not_called()
+        self.assertEqual(result, expected)
+        self.assertEqual(second.parser.get_stats()["parsed"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,11 @@
 import unittest
 import os
+import random
 import tempfile
+from datetime import datetime
+from domain.models import Clipping
 from parsers.kindle_parser import KindleClippingsParser
+from parsers.patterns import CompiledPatterns
 
 
 class TestKindleClippingsParser(unittest.TestCase):
@@ -37,6 +41,181 @@ En un lugar de la mancha...
         self.assertEqual(clip.content.strip(), "En un lugar de la mancha...")
         self.assertEqual(clip.date_time.year, 2018)
 
+    def test_iter_clippings_streams_highlights_and_notes(self):
+        with open(self.temp_file.name, "a", encoding="utf-8") as f:
+            f.write(
+                "El Quijote (Cervantes, Miguel de)\n"
+                "- La nota en la página 12 | posición 110 | Añadid. el sábado 24 de agosto de 2018 10:01:00\n\n"
+                "Hidalgo\n"
+                "==========\n"
+            )
+
+        stream = self.parser.iter_clippings(self.temp_file.name)
+        first = next(stream)
+        self.assertEqual(first.entry_type, "highlight")
+        self.assertTrue(first.uid)
+
+        rest = list(stream)
+        self.assertEqual(len(rest), 1)
+        self.assertEqual(rest[0].entry_type, "note")
+        self.assertEqual(rest[0].content, "Hidalgo")
+
+    def test_small_chunks_match_full_parse(self):
+        """Separators split across chunk boundaries must not change the result."""
+        with open(self.temp_file.name, "a", encoding="utf-8") as f:
+            for i in range(5):
+                f.write(
+                    f"Libro {i} (Autor)\r\n"
+                    f"- La subrayado en la página {i} | posición {i}0 | Añadid. el 1 de enero de 2024\r\n\r\n"
+                    f"Texto número {i} con acentos: ñandú.\r\n"
+                    "==========\r\n"
+                )
+
+        expected = self.parser.parse_file(self.temp_file.name)
+
+        chunked = KindleClippingsParser(language_code="es")
+        chunked.CHUNK_SIZE = 7
+        result = chunked.parse_file(self.temp_file.name)
+
+        self.assertEqual(len(result), 6)
+        self.assertEqual([c.uid for c in result], [c.uid for c in expected])
+        self.assertEqual(result[-1].content, "Texto número 4 con acentos: ñandú.")
+        self.assertEqual(chunked.get_stats()["total"], 6)
+
+    def test_parallel_parse_matches_serial(self):
+        with open(self.temp_file.name, "a", encoding="utf-8") as f:
+            for i in range(40):
+                f.write(
+                    f"Libro {i % 3} (Spanish Edition) (Autor)\n"
+                    f"- La subrayado en la página {i} | posición {i}0-{i}5 | Añadid. el 1 de enero de 2024\n\n"
+                    f"Texto {i}.\n"
+                    "==========\n"
+                    f"Libro {i % 3} (Spanish Edition) (Autor)\n"
+                    f"- La nota en la página {i} | posición {i}2 | Añadid. el 1 de enero de 2024\n\n"
+                    f"etiqueta{i}\n"
+                    "==========\n"
+                )
+            f.write("Bloque roto\n==========\n")
+
+        serial = KindleClippingsParser(language_code="es")
+        expected = serial.parse_file(self.temp_file.name)
+
+        parallel = KindleClippingsParser(language_code="es")
+        parallel.BATCH_SIZE = 7
+        result = parallel.parse_file(self.temp_file.name, workers=2)
+
+        self.assertEqual(result, expected)
+        # Date caches are per process, so only the total number of dates is comparable
+        date_keys = ["dates_fast_path", "dates_cached", "dates_fallback", "dates_failed"]
+        stats, expected_stats = parallel.get_stats(), serial.get_stats()
+        self.assertEqual(
+            sum(stats.pop(k) for k in date_keys), sum(expected_stats.pop(k) for k in date_keys)
+        )
+        self.assertEqual(stats, expected_stats)
+        self.assertEqual(parallel.get_stats()["skipped"], 1)
+        self.assertEqual(len(parallel.get_stats()["title_changes"]), 3)
+
+    def test_date_stats(self):
+        self.parser.parse_file(self.temp_file.name)
+        stats = self.parser.get_stats()
+        self.assertEqual(stats["dates_fast_path"], 1)
+        self.assertEqual(stats["dates_fallback"], 0)
+
+
+class TestCompiledPatterns(unittest.TestCase):
+    def setUp(self):
+        parser = KindleClippingsParser(language_code="en")
+        self.compiled = CompiledPatterns(parser.available_languages["en"])
+
+    def test_single_pass_metadata(self):
+        meta = self.compiled.parse_metadata(
+            "- Your Highlight on page 10 | Loc. 100-120 | Added on Friday, October 27, 2023 12:00:00 PM"
+        )
+        self.assertEqual(meta["type"], "highlight")
+        self.assertEqual(meta["page"], "10")
+        self.assertEqual(meta["location"], "100-120")
+        self.assertEqual(meta["date_str"], "Friday, October 27, 2023 12:00:00 PM")
+
+    def test_missing_fields(self):
+        meta = self.compiled.parse_metadata("- Your Note on Loc. 15")
+        self.assertEqual(meta["type"], "note")
+        self.assertEqual(meta["page"], "")
+        self.assertEqual(meta["location"], "15")
+        self.assertIsNone(meta["date_str"])
+
+    def test_out_of_order_fields_fall_back_to_single_regexes(self):
+        meta = self.compiled.parse_metadata("- Your Highlight at Loc. 100-120 on page 10")
+        self.assertEqual(meta["page"], "10")
+        self.assertEqual(meta["location"], "100-120")
+
+    def test_non_metadata_line(self):
+        self.assertIsNone(self.compiled.parse_metadata("Just a title line"))
+
+
+class TestNoteLinking(unittest.TestCase):
+    def setUp(self):
+        self.parser = KindleClippingsParser(language_code="en")
+
+    @staticmethod
+    def make(book, location, content="Text", entry_type="highlight"):
+        return Clipping(
+            content=content,
+            book_title=book,
+            author="A",
+            date_time=datetime(2024, 1, 1),
+            location=location,
+            entry_type=entry_type,
+        )
+
+    def reference_link(self, highlights, notes):
+        """Straightforward scan: first highlight in file order covering the note wins."""
+        for note in notes:
+            note_start, _ = self.parser._parse_loc_range(note.location)
+            for h in highlights:
+                start, end = self.parser._parse_loc_range(h.location)
+                if h.book_title == note.book_title and start <= note_start <= end:
+                    h.add_tags(tag.strip() for tag in note.content.split(",") if tag.strip())
+                    break
+
+    def test_first_covering_highlight_wins(self):
+        wide = self.make("B", "100-200")
+        narrow = self.make("B", "140-160")
+        other_book = self.make("C", "100-200")
+        notes = [
+            self.make("B", "150", "first", "note"),
+            self.make("B", "150", "second", "note"),
+            self.make("B", "90", "orphan", "note"),
+        ]
+
+        self.parser._link_notes_to_highlights([wide, narrow, other_book], notes)
+
+        self.assertEqual(wide.tags, ("first", "second"))
+        self.assertEqual(narrow.tags, ())
+        self.assertEqual(other_book.tags, ())
+
+    def test_matches_linear_scan(self):
+        rng = random.Random(7)
+        locations = [""] + [f"{s}-{s + rng.randint(-3, 30)}" for s in range(0, 400, 3)]
+
+        def build():
+            rng.seed(11)
+            highlights = [self.make(rng.choice("XY"), rng.choice(locations)) for _ in range(300)]
+            notes = [
+                self.make(
+                    rng.choice("XYZ"), rng.choice(["", str(rng.randint(0, 420))]), f"t{i}", "note"
+                )
+                for i in range(200)
+            ]
+            return highlights, notes
+
+        expected, expected_notes = build()
+        self.reference_link(expected, expected_notes)
+        result, notes = build()
+        self.parser._link_notes_to_highlights(result, notes)
+
+        self.assertEqual([h.tags for h in result], [h.tags for h in expected])
+        self.assertTrue(any(h.tags for h in result))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,14 +2,18 @@ import unittest
 from unittest.mock import patch
 import sys
 import os
+import shutil
+import tempfile
 
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import Qt
+from ui.threads import LoadFileThread
 from ui.widgets import ClippingsTableWidget
 from domain.models import Clipping
+from services.identity_service import IdentityService
 from datetime import datetime
 
 # Graphical tests require a QApplication instance
@@ -77,6 +81,57 @@ class TestClippingsTableWidget(unittest.TestCase):
         self.assertEqual(item_row_2.text(), "New Title")
         self.assertEqual(item_row_2.data(Qt.UserRole), "New Title")
 
+    def test_edited_rows_get_a_new_uid(self):
+        for row, clip in enumerate(self.clippings):
+            clip.uid = f"uid-{row}"
+        self.widget.populate(self.clippings)
+        self.widget.item(0, 3).setData(Qt.UserRole, "Edited Content")
+
+        edited, unchanged = self.widget.get_clippings_from_rows([0, 1])
+        self.assertEqual(edited.content, "Edited Content")
+        self.assertEqual(edited.uid, IdentityService.generate_id(edited))
+        self.assertEqual(unchanged.uid, "uid-1")
+
 
 if __name__ == "__main__":
     unittest.main()
+
+
+ENTRY = """Test Book (Test Author)
+- Your {kind} on page 1 | Location {location} | Added on Monday, January 1, 2024 {hour}:00:00 AM
+
+{content}
+==========
+"""
+
+
+class TestLoadFileThread(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "My Clippings.txt")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def append(self, kind, location, hour, content):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(ENTRY.format(kind=kind, location=location, hour=hour, content=content))
+
+    def load(self, dedup_state=None):
+        results = []
+        thread = LoadFileThread(self.path, "en", dedup_state=dedup_state)
+        thread.finished.connect(lambda clippings, stats: results.append(clippings))
+        thread.run()
+        return results[-1], thread.dedup_state
+
+    def test_note_appended_to_an_old_highlight_is_kept_on_reload(self):
+        self.append("Highlight", "100-104", 1, "It was the best of times, the worst of times.")
+        self.append("Highlight", "200-204", 2, "It was the age of wisdom, the age of foolishness.")
+        clippings, state = self.load()
+        self.assertEqual([clip.tags for clip in clippings], [(), ()])
+
+        self.append("Note", "102", 3, "Favourite")
+        self.append("Highlight", "300-304", 4, "It was the epoch of belief, the epoch of doubt.")
+        clippings, state = self.load(state)
+        self.assertEqual([clip.tags for clip in clippings], [("Favourite",), (), ()])
+        self.assertEqual([clip.tags for clip in state.clippings], [("Favourite",), (), ()])
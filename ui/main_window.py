@@ -43,6 +43,9 @@ class MainWindow(QMainWindow):
         self.setAcceptDrops(True)  # Enable Drag and Drop
 
         self.clippings = []
+        # Deduplication of the last load, reused when the same file is loaded again
+        self.dedup_state = None
+        self.dedup_source = None
 
         # Set Window Icon
         from PyQt5.QtGui import QIcon
@@ -349,7 +352,7 @@ class MainWindow(QMainWindow):
         start_dir = os.path.dirname(current_input) if current_input else ""
 
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "Select File", start_dir, "Text Files (*.txt)"
+            self, "Select File", start_dir, "Text Files (*.txt);;JSON Exports (*.json *.jsonl)"
         )
         if file_path:
             self.load_file(file_path)
@@ -364,8 +367,23 @@ class MainWindow(QMainWindow):
 
         self.config.set("input_file", file_path)
         lang = self.config.get("language", "auto")
-
-        self.loader_thread = LoadFileThread(file_path, lang)
+        workers = self.config.get("workers", 1)
+        cache_dir = self.config.get_cache_dir()
+        checkpoint_dir = cache_dir if self.config.get("incremental_parse", False) else None
+        parse_cache_dir = cache_dir if self.config.get("parse_cache", True) else None
+
+        fuzzy = self.config.get("fuzzy_deduplication", False)
+        source = (os.path.abspath(file_path), lang, fuzzy)
+        self.loader_thread = LoadFileThread(
+            file_path,
+            lang,
+            workers,
+            checkpoint_dir,
+            parse_cache_dir,
+            fuzzy_deduplication=fuzzy,
+            dedup_state=self.dedup_state if source == self.dedup_source else None,
+        )
+        self.dedup_source = source
         self.loader_thread.finished.connect(self.on_load_finished)
         self.loader_thread.error.connect(self.on_load_error)
         self.loader_thread.start()
@@ -373,6 +391,7 @@ class MainWindow(QMainWindow):
     def on_load_finished(self, clippings, stats):
         self.progress.close()
         self.clippings = clippings
+        self.dedup_state = self.loader_thread.dedup_state
         self.table.populate(self.clippings)
         self.stack.setCurrentWidget(self.data_page)
         self.btn_export.setEnabled(True)
@@ -558,7 +577,8 @@ class MainWindow(QMainWindow):
             self,
             title,
             default_output,
-            "Joplin Export (*.jex);;CSV File (*.csv);;Markdown ZIP (*.zip);;JSON Data (*.json)",
+            "Joplin Export (*.jex);;CSV File (*.csv);;Markdown ZIP (*.zip);;JSON Data (*.json);;"
+            "JSON Lines (*.jsonl)",
         )
         if not file_path:
             return
@@ -588,6 +608,8 @@ class MainWindow(QMainWindow):
             fmt = "md"
         elif ext.endswith(".json"):
             fmt = "json"
+        elif ext.endswith(".jsonl"):
+            fmt = "jsonl"
 
         self.export_thread = ExportThread(
             service=service,
@@ -597,6 +619,8 @@ class MainWindow(QMainWindow):
             location=tuple(self.config.get("location", [0, 0, 0])),
             creator=self.config.get("creator", "System"),
             export_format=fmt,
+            workers=self.config.get("workers", 1),
+            reproducible=self.config.get("reproducible_export", False),
         )
         self.export_thread.finished.connect(self.on_export_finished)
         self.export_thread.error.connect(self.on_export_error)
@@ -1,8 +1,8 @@
 from PyQt5.QtCore import QThread, pyqtSignal
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from domain.models import Clipping
-from parsers.kindle_parser import KindleClippingsParser
 from services.clippings_service import ClippingsService
+from services.deduplication_service import DeduplicationState, SmartDeduplicator
 import logging
 
 
@@ -10,22 +10,52 @@ class LoadFileThread(QThread):
     finished = pyqtSignal(list, dict)
     error = pyqtSignal(str)
 
-    def __init__(self, file_path: str, language: str):
+    def __init__(
+        self,
+        file_path: str,
+        language: str,
+        workers: int = 1,
+        checkpoint_dir: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        fuzzy_deduplication: bool = False,
+        dedup_state: Optional[DeduplicationState] = None,
+    ):
         super().__init__()
         self.file_path = file_path
         self.language = language
+        self.workers = workers
+        self.checkpoint_dir = checkpoint_dir
+        self.cache_dir = cache_dir
+        self.fuzzy_deduplication = fuzzy_deduplication
+        # In: the state of the previous load of the same file. Out: the state of this one.
+        self.dedup_state = dedup_state
 
     def run(self):
         try:
-            parser = KindleClippingsParser(language_code=self.language)
-            clippings = parser.parse_file(self.file_path)
-            stats = parser.get_stats()
+            service = ClippingsService(
+                language_code=self.language,
+                checkpoint_dir=self.checkpoint_dir,
+                cache_dir=self.cache_dir,
+            )
+            clippings = service.load_clippings(self.file_path, workers=self.workers)
+            stats = service.parser.get_stats()
 
             # Apply Smart Deduplication on Load
-            from services.deduplication_service import SmartDeduplicator
-
-            deduplicator = SmartDeduplicator()
-            cleaned_clippings = deduplicator.deduplicate(clippings)
+            deduplicator = SmartDeduplicator(fuzzy=self.fuzzy_deduplication, workers=self.workers)
+            if self.dedup_state and self.dedup_state.is_prefix_of(clippings):
+                # The Kindle only appended: deduplicate what is new against the last load
+                new_clippings = clippings[len(self.dedup_state.inputs) :]
+                self.dedup_state = deduplicator.deduplicate_incremental(
+                    self.dedup_state, new_clippings
+                )
+                cleaned_clippings = self.dedup_state.clippings
+            elif deduplicator.workers > 1 and len(clippings) >= deduplicator.PARALLEL_MIN_CLIPPINGS:
+                # Faster in a process pool, but without a state to reuse next time
+                self.dedup_state = None
+                cleaned_clippings = deduplicator.deduplicate(clippings)
+            else:
+                self.dedup_state = deduplicator.deduplicate_incremental(None, clippings)
+                cleaned_clippings = self.dedup_state.clippings
 
             self.finished.emit(cleaned_clippings, stats)
         except Exception as e:
@@ -46,6 +76,8 @@ class ExportThread(QThread):
         location: Tuple[float, float, int],
         creator: str,
         export_format: str = "jex",
+        workers: int = 1,
+        reproducible: bool = False,
     ):
         super().__init__()
         self.service = service
@@ -55,6 +87,8 @@ class ExportThread(QThread):
         self.location = location
         self.creator = creator
         self.export_format = export_format
+        self.workers = workers
+        self.reproducible = reproducible
 
     def run(self):
         try:
@@ -65,6 +99,8 @@ class ExportThread(QThread):
                 location=self.location,
                 creator_name=self.creator,
                 export_format=self.export_format,
+                workers=self.workers,
+                reproducible=self.reproducible,
             )
             self.finished.emit(len(self.clippings))
         except Exception as e:
@@ -14,6 +14,7 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt, pyqtSignal
 import os
+from services.identity_service import IdentityService
 
 
 class EmptyStateWidget(QWidget):
@@ -593,6 +594,13 @@ class ClippingsTableWidget(QTableWidget):
                 content=new_content,
                 tags=new_tags,
             )
+            # The uid identifies the parsed fields: give an edited clipping a new one
+            if original_clip.uid and (
+                new_book != original_clip.book_title
+                or new_author != original_clip.author
+                or new_content != original_clip.content
+            ):
+                final_clip.uid = IdentityService.generate_id(final_clip)
 
             clippings.append(final_clip)
 
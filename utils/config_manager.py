@@ -20,6 +20,14 @@ class ConfigManager:
         "output_file": "import_clippings",
         "language": "auto",
         "theme": "light",
+        "workers": 1,
+        "incremental_parse": False,
+        "parse_cache": True,
+        "cache_dir": "",
+        "reproducible_export": False,
+        "jex_compression": "none",
+        "jex_compression_level": None,
+        "fuzzy_deduplication": False,
     }
 
     def __init__(self, config_dir: str = "config", config_filename: str = "config.json"):
@@ -37,6 +45,10 @@ class ConfigManager:
         """Returns the absolute path to a resource file."""
         return os.path.join(self.project_root, "resources", filename)
 
+    def get_cache_dir(self) -> str:
+        """Returns the directory for parse checkpoints and cached results (<config_dir>/cache)."""
+        return self.get("cache_dir") or os.path.join(self.config_dir, "cache")
+
     def _ensure_dir(self):
         """Ensures the configuration directory exists."""
         if not os.path.exists(self.config_dir):